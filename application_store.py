@@ -0,0 +1,283 @@
+"""Columnar in-memory copy of a user's tracked applications
+
+One packed array per field instead of one dict per application: status as a
+one-byte enum code, the application time as int64 epoch seconds, and company,
+position and notes as codes into interned string tables. A row costs about
+25 bytes plus its share of the distinct strings, so a million applications
+fit in a few tens of MB. The arrays expose the buffer protocol, so status and
+date aggregations run as numpy operations over zero-copy views.
+
+Timestamps are the naive local times the tracker stores, counted from
+1970-01-01 as if they were UTC, which matches SQLite's ``strftime('%s')``.
+"""
+
+import enum
+import threading
+from array import array
+from datetime import date, datetime, timedelta
+
+from columns import StringTable
+
+EPOCH = datetime(1970, 1, 1)
+WEEK_SECONDS = 7 * 86400
+# 1970-01-01 was a Thursday; shifting by this many seconds makes weeks start on Monday
+MONDAY_OFFSET = 3 * 86400
+
+
+class Status(enum.IntEnum):
+    """Application stages in pipeline order; the value is the stored code"""
+
+    APPLIED = 0
+    PHONE_SCREEN = 1
+    TECHNICAL_INTERVIEW = 2
+    ONSITE = 3
+    OFFER = 4
+    REJECTED = 5
+
+    @property
+    def label(self):
+        return STATUS_LABELS[self]
+
+    @classmethod
+    def from_label(cls, label):
+        try:
+            return STATUS_CODES[label]
+        except KeyError:
+            raise ValueError(f"Unknown application status: {label!r}") from None
+
+
+STATUS_LABELS = ("Applied", "Phone Screen", "Technical Interview", "Onsite", "Offer", "Rejected")
+STATUS_CODES = {label: Status(code) for code, label in enumerate(STATUS_LABELS)}
+# Stages an application moves through; a rejection can end it at any of them
+PIPELINE = (Status.APPLIED, Status.PHONE_SCREEN, Status.TECHNICAL_INTERVIEW, Status.ONSITE, Status.OFFER)
+
+
+def normalize_date_applied(value):
+    """The ISO timestamp stored for ``value`` (ISO text, date or datetime); ValueError if it is none
+
+    Times with an offset are converted to naive local time, like the ones
+    the tracker records, so SQLite and ``to_epoch`` read every row the same way.
+    """
+    if isinstance(value, datetime):
+        moment = value
+    elif isinstance(value, date):
+        moment = datetime.combine(value, datetime.min.time())
+    else:
+        try:
+            moment = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"date_applied must be an ISO date or timestamp, got {value!r}") from None
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment.isoformat()
+
+
+def to_epoch(date_applied):
+    """Epoch seconds for a stored ISO timestamp (naive, read as UTC)"""
+    return int((datetime.fromisoformat(date_applied) - EPOCH).total_seconds())
+
+
+def from_epoch(seconds):
+    return (EPOCH + timedelta(seconds=seconds)).isoformat()
+
+
+def week_start(date_applied):
+    """ISO date of the Monday starting the week of a stored timestamp"""
+    day = date.fromisoformat(date_applied[:10])
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+
+def funnel(status_counts):
+    """Stage-to-stage conversion from {status label: count}
+
+    Only the current status is stored, so an application counts as having
+    reached every stage up to its current one, and a rejected application
+    as having reached only the first. Returns one dict per pipeline stage
+    with ``reached`` and ``conversion`` (the share of the previous stage
+    that reached this one; None for the first stage or an empty previous one).
+    """
+    reached = []
+    total = 0
+    for stage in reversed(PIPELINE):
+        total += status_counts.get(stage.label, 0)
+        reached.append(total)
+    reached.reverse()
+    reached[0] += status_counts.get(Status.REJECTED.label, 0)
+    return [
+        {
+            "stage": stage.label,
+            "reached": count,
+            "conversion": count / reached[index - 1] if index and reached[index - 1] else None
+        }
+        for index, (stage, count) in enumerate(zip(PIPELINE, reached))
+    ]
+
+
+class ApplicationRow:
+    """Read-only view of one application in an ApplicationStore"""
+
+    __slots__ = ("store", "index")
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    @property
+    def id(self):
+        return self.store.ids[self.index]
+
+    @property
+    def company(self):
+        return self.store.company_names[self.store.companies[self.index]]
+
+    @property
+    def position(self):
+        return self.store.position_names[self.store.positions[self.index]]
+
+    @property
+    def status_code(self):
+        return Status(self.store.statuses[self.index])
+
+    @property
+    def status(self):
+        return STATUS_LABELS[self.store.statuses[self.index]]
+
+    @property
+    def notes(self):
+        return self.store.note_texts[self.store.notes[self.index]]
+
+    @property
+    def applied_at(self):
+        return self.store.applied_at[self.index]
+
+    @property
+    def date_applied(self):
+        return from_epoch(self.store.applied_at[self.index])
+
+    def as_dict(self):
+        """The row in the shape DatabaseManager returns applications, timed to the second"""
+        return {
+            "id": self.id,
+            "company": self.company,
+            "position": self.position,
+            "status": self.status,
+            "notes": self.notes,
+            "date_applied": self.date_applied
+        }
+
+    def __repr__(self):
+        return f"ApplicationRow(id={self.id}, company={self.company!r}, status={self.status!r})"
+
+
+class ApplicationStore:
+    """One user's applications as parallel arrays, in insertion (id) order"""
+
+    def __init__(self):
+        self.ids = array("q")
+        self.statuses = array("B")
+        self.applied_at = array("q")
+        self.companies = array("I")
+        self.positions = array("I")
+        self.notes = array("I")
+        self.company_names = StringTable()
+        self.position_names = StringTable()
+        self.note_texts = StringTable()
+        # numpy views pin the arrays' buffers, so appends must not overlap an aggregation
+        self._lock = threading.Lock()
+
+    def append(self, application_id, company, position, status, notes, applied_at):
+        """Add one application; ``status`` is a label and ``applied_at`` epoch seconds"""
+        code = Status.from_label(status)
+        with self._lock:
+            self.ids.append(application_id)
+            self.statuses.append(code)
+            self.applied_at.append(applied_at)
+            self.companies.append(self.company_names.code(company))
+            self.positions.append(self.position_names.code(position))
+            self.notes.append(self.note_texts.code(notes))
+
+    def extend(self, rows):
+        """Add (id, company, position, status, notes, applied_at) rows"""
+        company_code, position_code, note_code = (
+            self.company_names.code, self.position_names.code, self.note_texts.code
+        )
+        with self._lock:
+            for application_id, company, position, status, notes, applied_at in rows:
+                code = Status.from_label(status)
+                self.ids.append(application_id)
+                self.statuses.append(code)
+                self.applied_at.append(applied_at)
+                self.companies.append(company_code(company))
+                self.positions.append(position_code(position))
+                self.notes.append(note_code(notes))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.ids)
+        if not 0 <= index < len(self.ids):
+            raise IndexError(index)
+        return ApplicationRow(self, index)
+
+    def __iter__(self):
+        return (ApplicationRow(self, index) for index in range(len(self.ids)))
+
+    def last_id(self):
+        return self.ids[-1] if self.ids else 0
+
+    def nbytes(self):
+        """Bytes held by the column arrays (string tables not included)"""
+        columns = (self.ids, self.statuses, self.applied_at, self.companies, self.positions, self.notes)
+        return sum(column.itemsize * len(column) for column in columns)
+
+    # Vectorized aggregations
+
+    def _range_mask(self, np, applied_at, date_from, date_to):
+        mask = np.ones(len(applied_at), dtype=bool)
+        if date_from is not None:
+            mask &= applied_at >= to_epoch(str(date_from))
+        if date_to is not None:
+            mask &= applied_at < to_epoch(str(date_to))
+        return mask
+
+    def status_counts(self, date_from=None, date_to=None):
+        """{status label: count}, optionally for applications in [date_from, date_to)"""
+        import numpy as np
+
+        with self._lock:
+            statuses = np.frombuffer(self.statuses, dtype=np.uint8)
+            if date_from is not None or date_to is not None:
+                applied_at = np.frombuffer(self.applied_at, dtype=np.int64)
+                statuses = statuses[self._range_mask(np, applied_at, date_from, date_to)]
+            counts = np.bincount(statuses, minlength=len(Status))
+        return {STATUS_LABELS[code]: int(count) for code, count in enumerate(counts) if count}
+
+    def weekly_counts(self, status=None):
+        """{Monday of the week (ISO date): applications made that week}, oldest first"""
+        import numpy as np
+
+        with self._lock:
+            applied_at = np.frombuffer(self.applied_at, dtype=np.int64)
+            if status is not None:
+                applied_at = applied_at[np.frombuffer(self.statuses, dtype=np.uint8) == Status.from_label(status)]
+            weeks, counts = np.unique((applied_at + MONDAY_OFFSET) // WEEK_SECONDS, return_counts=True)
+        return {
+            (EPOCH + timedelta(seconds=int(week) * WEEK_SECONDS - MONDAY_OFFSET)).date().isoformat(): int(count)
+            for week, count in zip(weeks, counts)
+        }
+
+    def columns(self):
+        """Copies of the columns as numpy arrays, for ad-hoc vectorized analysis"""
+        import numpy as np
+
+        with self._lock:
+            return {
+                "id": np.array(self.ids, dtype=np.int64),
+                "status": np.array(self.statuses, dtype=np.uint8),
+                "applied_at": np.array(self.applied_at, dtype=np.int64),
+                "company": np.array(self.companies, dtype=np.uint32),
+                "position": np.array(self.positions, dtype=np.uint32),
+                "notes": np.array(self.notes, dtype=np.uint32)
+            }
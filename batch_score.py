@@ -0,0 +1,169 @@
+"""Headless batch ATS scoring
+
+Streams resumes from a JSONL file, a CSV file or a directory of text files,
+scores them on a process pool and writes one JSON result per line in input
+order.
+
+    python batch_score.py resumes.jsonl -o scores.jsonl --workers 8
+
+Each record either carries the finished resume under ``resume_text`` or the
+structured fields accepted by ``create_ats_friendly_resume``
+(``personal_info``, ``experience``, ``education``, ``skills``, ``projects``).
+An optional ``job_description`` is passed through to the scorer.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from keyword_matcher import load_keywords
+from resume_builder import ATSResumeBuilder
+
+STRUCTURED_FIELDS = ("personal_info", "experience", "education", "skills", "projects")
+# Marks an input line that could not be read; it is reported in order instead of scored
+READ_ERROR = "_read_error"
+
+_worker_builder = None
+
+
+def _init_worker(keywords_file):
+    """Build one scorer per worker process"""
+    global _worker_builder
+    keywords = load_keywords(keywords_file) if keywords_file else None
+    _worker_builder = ATSResumeBuilder(keywords)
+
+
+def score_record(builder, record):
+    """Score a single resume record"""
+    resume_text = record.get("resume_text")
+    if resume_text is None:
+        fields = []
+        for field in STRUCTURED_FIELDS:
+            value = record.get(field)
+            if isinstance(value, str):
+                value = json.loads(value) if value else None
+            fields.append(value or ({} if field in ("personal_info", "skills") else []))
+        resume_text = builder.create_ats_friendly_resume(*fields)
+
+    analysis = builder.analyze_ats_score(resume_text, record.get("job_description", ""))
+    analysis["id"] = record.get("id")
+    return analysis
+
+
+def _score_chunk(records):
+    """Score a chunk of records inside a worker process"""
+    results = []
+    for record in records:
+        if READ_ERROR in record:
+            results.append({"id": record["id"], "error": record[READ_ERROR]})
+            continue
+        try:
+            results.append(score_record(_worker_builder, record))
+        except Exception as e:
+            results.append({"id": record.get("id"), "error": str(e)})
+    return results
+
+
+def iter_records(source):
+    """Yield resume records from a JSONL file, CSV file or directory
+
+    A JSONL line that is not a JSON object yields an error record naming the
+    line, so the rest of the file is still scored.
+    """
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            path = os.path.join(source, name)
+            if os.path.isfile(path):
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    yield {"id": name, "resume_text": f.read()}
+    elif source.endswith(".csv"):
+        with open(source, newline="", encoding="utf-8") as f:
+            for index, row in enumerate(csv.DictReader(f)):
+                row.setdefault("id", index)
+                yield row
+    else:
+        f = sys.stdin if source == "-" else open(source, encoding="utf-8")
+        try:
+            for index, line in enumerate(f):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield {"id": index, READ_ERROR: f"line {index + 1}: invalid JSON ({e})"}
+                    continue
+                if not isinstance(record, dict):
+                    yield {"id": index, READ_ERROR: f"line {index + 1}: expected a JSON object"}
+                    continue
+                record.setdefault("id", index)
+                yield record
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def score_stream(records, workers=None, chunk_size=64, max_pending=None, keywords_file=None):
+    """Score records on a process pool, yielding results in input order
+
+    At most ``max_pending`` chunks are in flight at any time, so memory stays
+    bounded no matter how large the input is.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+
+    if workers == 1:
+        _init_worker(keywords_file)
+        for chunk in _chunks(records, chunk_size):
+            yield from _score_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(keywords_file,)) as pool:
+        pending = deque()
+        for chunk in _chunks(records, chunk_size):
+            pending.append(pool.submit(_score_chunk, chunk))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch ATS scoring over a resume corpus")
+    parser.add_argument("source", help="JSONL file, CSV file, directory of resumes, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output JSONL file (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="records per worker task")
+    parser.add_argument("--keywords", default=None, help="keyword taxonomy file, one term per line")
+    args = parser.parse_args(argv)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        count = errors = 0
+        for result in score_stream(iter_records(args.source), args.workers, args.chunk_size,
+                                   keywords_file=args.keywords):
+            out.write(json.dumps(result) + "\n")
+            count += 1
+            errors += "error" in result
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"Scored {count - errors} resumes, {errors} errors", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Resume render cost per layout
+
+    python -m benchmarks.bench_template --renders 10000
+
+Reports the per-resume cost of three cases for every layout:
+
+* cold: every field of every resume is distinct, so every section and every
+  AI request (summary, bullets) misses its cache
+* one-field edit: one experience bullet changes per render (the common
+  Streamlit rerun), so only that section is re-rendered
+* warm: identical inputs, served from the document cache
+"""
+
+import argparse
+import time
+
+from resume_builder import ATSResumeBuilder
+from smart_ai_engine import ai_engine
+from template import template_engine
+
+
+def sample_resume(i):
+    """A resume whose every section differs from that of any other ``i``"""
+    personal_info = {
+        'name': f'Candidate {i}',
+        'title': f'Software Engineer {i}',
+        'email': f'candidate{i}@example.com',
+        'phone': '+1 (555) 010-0000',
+        'linkedin': f'linkedin.com/in/candidate{i}',
+        'location': 'Austin, TX'
+    }
+    experience = [{
+        'company': f'Company {i}-{j}',
+        'position': 'Senior Developer',
+        'duration': '2019 - Present',
+        'years': str(i % 40 + 1),
+        'responsibilities': [f'Delivered project {i}.{j}.{k} with Python and AWS' for k in range(5)]
+    } for j in range(3)]
+    education = [{'degree': 'BSc Computer Science', 'institution': f'State University {i}', 'year': '2016'}]
+    skills = {
+        'programming_languages': [f'Python {i}', 'JavaScript', 'SQL'],
+        'frameworks': ['React', 'Django'],
+        'tools': ['Git', 'Docker', 'AWS'],
+        'databases': ['PostgreSQL']
+    }
+    projects = [{'name': f'Project {i}', 'technologies': ['Python'], 'description': 'A side project'}]
+    return personal_info, experience, education, skills, projects
+
+
+def bench(layout, renders):
+    results = {}
+    
+    builder = ATSResumeBuilder(section_cache_size=64)
+    # AI responses are cached across builders; an earlier layout's run must not warm this one
+    ai_engine.cache.clear()
+    start = time.perf_counter()
+    for i in range(renders):
+        builder.create_ats_friendly_resume(*sample_resume(i), layout=layout)
+    results['cold'] = (time.perf_counter() - start) / renders
+    
+    builder = ATSResumeBuilder()
+    # Past the cold run's inputs, so this starts cold too
+    personal_info, experience, education, skills, projects = sample_resume(renders)
+    start = time.perf_counter()
+    for i in range(renders):
+        experience[0]['responsibilities'][0] = f'Delivered project revision {i}'
+        builder.create_ats_friendly_resume(personal_info, experience, education, skills, projects, layout=layout)
+    results['one_field_edit'] = (time.perf_counter() - start) / renders
+    
+    start = time.perf_counter()
+    for _ in range(renders):
+        builder.create_ats_friendly_resume(personal_info, experience, education, skills, projects, layout=layout)
+    results['warm'] = (time.perf_counter() - start) / renders
+    
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark resume rendering")
+    parser.add_argument("--renders", type=int, default=10000)
+    args = parser.parse_args(argv)
+    
+    print(f"{'layout':<10} {'cold':>10} {'one-field edit':>16} {'warm':>10}   (µs per resume, {args.renders} renders)")
+    for layout in template_engine.available():
+        results = bench(layout, args.renders)
+        print(f"{layout:<10} {results['cold'] * 1e6:>10.1f} {results['one_field_edit'] * 1e6:>16.1f} {results['warm'] * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
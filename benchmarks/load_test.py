@@ -0,0 +1,348 @@
+"""Concurrent-session load test for main_app
+
+Each simulated user is an ``AppTest`` session with its own user id, running
+the flow resume -> ATS score against a job -> cover letter -> tracker. Every
+rerun is timed. ``AppTest`` keeps its runtime in process-global state and is
+not safe to run from several threads, so each user gets its own process with
+its own session; the processes share one database and the machine's cores.
+An error in the report is therefore an error the app raised, never one from
+sessions stepping on each other.
+
+    python -m benchmarks.load_test --users 1 2 4 8 16 --iterations 3 -o load.json
+
+For each concurrency level the report gives p50/p95/p99 rerun latency per
+step, reruns per second and the summed peak RSS of the user processes. The saturation point is the first
+level where adding users raised throughput by less than ``--min-gain``; the
+capacity is the largest level whose p95 stays within ``--slo-ms``. Runs use
+a throwaway database unless ``--database`` is given.
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import queue
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main_app.py")
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+def rss_bytes():
+    """Current resident set size of this process"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Peak rather than current where /proc is unavailable (ru_maxrss is bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RSSSampler:
+    """Background thread keeping the peak RSS seen while a level runs"""
+
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self.peak = rss_bytes()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, rss_bytes())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+# The simulated user
+
+def widget(at, kind, label):
+    for element in getattr(at, kind):
+        if element.label == label:
+            return element
+    raise LookupError(f"No {kind} labelled {label!r} on this page")
+
+
+def fill(at, kind, values):
+    for label, value in values.items():
+        widget(at, kind, label).input(value)
+
+
+def select_page(at, name):
+    selectbox = at.sidebar.selectbox[0]
+    return selectbox.select(next(option for option in selectbox.options if name in option))
+
+
+class SimulatedUser:
+    """One browser session walking the app's main flow, timing every rerun"""
+
+    def __init__(self, number, seed, samples, errors, timeout):
+        from benchmarks import synthetic
+        from streamlit.testing.v1 import AppTest
+
+        self.number = number
+        self.samples = samples
+        self.errors = errors
+        self.resume = next(synthetic.resumes(1, seed=f"{seed}:{number}"))
+        self.job = next(synthetic.job_postings(1, seed=f"{seed}:{number}"))
+        self.applicant = next(synthetic.applicants(1, seed=f"{seed}:{number}"))
+        self.at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+
+    def rerun(self, step, action):
+        start = time.perf_counter()
+        action().run()
+        self.samples.append((step, time.perf_counter() - start))
+        if self.at.exception:
+            self.errors.append((step, self.at.exception[0].message))
+
+    def start(self):
+        self.rerun("dashboard.open", lambda: self.at)
+
+    def flow(self):
+        at = self.at
+        info, experience = self.resume["personal_info"], self.resume["experience"][0]
+        skills = self.resume["skills"]
+
+        self.rerun("resume.open", lambda: select_page(at, "Resume Builder"))
+        fill(at, "text_input", {
+            "Full Name *": info["name"],
+            "Professional Title *": info["title"],
+            "Email *": info["email"],
+            "Phone": info["phone"],
+            "Location": info["location"],
+            "Company Name *": experience["company"],
+            "Job Title *": experience["position"],
+            "Employment Duration *": experience["duration"],
+            "Degree *": self.resume["education"][0]["degree"],
+            "Institution *": self.resume["education"][0]["institution"],
+            "Graduation Year *": self.resume["education"][0]["year"],
+            "Programming Languages *": ", ".join(skills["programming_languages"]),
+            "Development Tools": ", ".join(skills["tools"]),
+            "Databases": ", ".join(skills["databases"])
+        })
+        widget(at, "text_area", "Key Responsibilities & Achievements *").input(
+            "\n".join(f"• {r}" for r in experience["responsibilities"])
+        )
+        self.rerun("resume.generate", lambda: widget(at, "button", "🚀 Generate ATS Resume").click())
+
+        widget(at, "text_area", "Job Description (Optional)").input(self.resume["job_description"])
+        self.rerun("ats.score_against_job", lambda: widget(at, "button", "🚀 Generate ATS Resume").click())
+
+        self.rerun("cover_letter.open", lambda: select_page(at, "Cover Letters"))
+        fill(at, "text_input", {
+            "Company Name *": self.job["company"],
+            "Position Title *": self.job["position"],
+            "Hiring Manager Name": self.job["hiring_manager"],
+            "Your Name *": self.applicant["name"],
+            "Your Skills *": self.applicant["skills"],
+            "Contact Info": self.applicant["contact"]
+        })
+        widget(at, "text_area", "Relevant Experience *").input(self.applicant["experience"])
+        self.rerun("cover_letter.generate", lambda: widget(at, "button", "🚀 Generate Cover Letter").click())
+
+        self.rerun("tracker.open", lambda: select_page(at, "Job Tracker"))
+        fill(at, "text_input", {"Company Name *": self.job["company"], "Position *": self.job["position"]})
+        self.rerun("tracker.add", lambda: widget(at, "button", "💾 Save Application").click())
+
+
+def user_process(number, iterations, seed, timeout, barrier, results):
+    """Body of one user's process: an untimed warm-up pass, then the timed flows
+
+    The warm-up imports the page modules, so the timed runs see a warm process
+    like a long-running server. Sends (samples, errors, peak RSS) to ``results``.
+    """
+    samples = []
+    errors = []
+    try:
+        warm = SimulatedUser(f"{number}-warmup", seed, [], errors, timeout)
+        warm.start()
+        warm.flow()
+        session = SimulatedUser(number, seed, samples, errors, timeout)
+        session.start()
+        samples.clear()
+    except Exception as e:
+        errors.append(("warmup", repr(e)))
+        barrier.abort()
+        results.put((number, samples, errors, rss_bytes()))
+        return
+    with RSSSampler() as rss:
+        try:
+            barrier.wait()
+            for _ in range(iterations):
+                session.flow()
+        except Exception as e:
+            errors.append(("flow", repr(e)))
+    results.put((number, samples, errors, rss.peak))
+
+
+def run_level(users, iterations, seed=0, timeout=120.0):
+    """Run ``users`` concurrent sessions, one process each, through the flow ``iterations`` times"""
+    context = multiprocessing.get_context("spawn")
+    # The parent joins the barrier too, so the clock starts when every session is ready
+    barrier = context.Barrier(users + 1)
+    results = context.Queue()
+    processes = [
+        context.Process(target=user_process, args=(number, iterations, seed, timeout, barrier, results), daemon=True)
+        for number in range(users)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        barrier.wait()
+    except threading.BrokenBarrierError:
+        pass
+    start = time.perf_counter()
+    reports = []
+    while len(reports) < len(processes):
+        try:
+            reports.append(results.get(timeout=1.0))
+        except queue.Empty:
+            if all(process.exitcode is not None for process in processes) and results.empty():
+                raise RuntimeError(f"{len(processes) - len(reports)} user process(es) exited without a report")
+    wall = time.perf_counter() - start
+    for process in processes:
+        process.join()
+
+    samples = []
+    errors = []
+    rss_peaks = []
+    for _, user_samples, user_errors, peak in sorted(reports, key=lambda report: report[0]):
+        samples.extend(user_samples)
+        errors.extend(user_errors)
+        rss_peaks.append(peak)
+    steps = {}
+    for step, seconds in samples:
+        steps.setdefault(step, []).append(seconds)
+    everything = sorted(seconds for _, seconds in samples)
+    return {
+        "users": users,
+        "reruns": len(samples),
+        "wall_seconds": wall,
+        "reruns_per_second": len(samples) / wall if wall else 0.0,
+        "p50_ms": percentile(everything, 0.50) * 1000,
+        "p95_ms": percentile(everything, 0.95) * 1000,
+        "p99_ms": percentile(everything, 0.99) * 1000,
+        "steps": {
+            step: {
+                "count": len(values),
+                "p50_ms": percentile(values, 0.50) * 1000,
+                "p95_ms": percentile(values, 0.95) * 1000,
+                "p99_ms": percentile(values, 0.99) * 1000
+            }
+            for step, values in ((step, sorted(values)) for step, values in steps.items())
+        },
+        "rss_peak_mb": sum(rss_peaks) / 2**20,
+        "rss_per_user_mb": sum(rss_peaks) / len(rss_peaks) / 2**20,
+        "errors": errors[:20],
+        "error_count": len(errors)
+    }
+
+
+def saturation(levels, min_gain=0.10, slo_ms=1000.0):
+    """(saturation users, capacity users) from the per-level results"""
+    saturated_at = None
+    best = 0.0
+    for level in levels:
+        if best and level["reruns_per_second"] < best * (1 + min_gain):
+            saturated_at = level["users"]
+            break
+        best = max(best, level["reruns_per_second"])
+    within_slo = [level["users"] for level in levels if level["p95_ms"] <= slo_ms and not level["error_count"]]
+    return saturated_at, max(within_slo, default=None)
+
+
+def summary_line(saturated_at, capacity, slo_ms, max_users):
+    """One-line verdict; levels that were never reached are spelled out rather than counted"""
+    if saturated_at is None:
+        saturation_text = f"not reached (up to {max_users} users)"
+    else:
+        saturation_text = f"{saturated_at} users"
+    capacity_text = f"{capacity} users" if capacity is not None else "no level met the target"
+    return f"Saturation point: {saturation_text}; capacity within p95 {slo_ms:.0f} ms: {capacity_text}"
+
+
+def print_level(level):
+    print(f"{level['users']:>5} {level['reruns_per_second']:>9.2f} {level['p50_ms']:>8.1f} {level['p95_ms']:>8.1f} "
+          f"{level['p99_ms']:>8.1f} {level['rss_peak_mb']:>8.1f} {level['error_count']:>6}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test main_app with concurrent AppTest sessions")
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                        help="concurrency levels to run, in order")
+    parser.add_argument("--iterations", type=int, default=3, help="flows per user at each level")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--slo-ms", type=float, default=1000.0, help="p95 rerun latency target")
+    parser.add_argument("--min-gain", type=float, default=0.10,
+                        help="throughput gain below which a level counts as saturated")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds allowed per rerun")
+    parser.add_argument("--database", help="database to use (default: a temporary file)")
+    parser.add_argument("-o", "--output", help="write the report as JSON")
+    args = parser.parse_args(argv)
+
+    # Before the app's modules are imported, so they open this database
+    workdir = tempfile.mkdtemp(prefix="career-suite-load-")
+    os.environ["CAREER_SUITE_DB"] = args.database or os.path.join(workdir, "load.db")
+    from benchmarks.run import git_commit
+
+    levels = []
+    print(f"{'users':>5} {'reruns/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'RSS MB':>8} {'errors':>6}")
+    try:
+        # One untimed session first creates the database, so the levels do not race to migrate it
+        warm_up = run_level(1, 1, args.seed, args.timeout)
+        if warm_up["error_count"]:
+            raise RuntimeError(f"The app failed during warm-up: {warm_up['errors'][0]}")
+        for users in args.users:
+            levels.append(run_level(users, args.iterations, args.seed, args.timeout))
+            print_level(levels[-1])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    saturated_at, capacity = saturation(levels, args.min_gain, args.slo_ms)
+
+    print()
+    print(f"{'step':<24} " + " ".join(f"{'p95 ms @' + str(level['users']):>12}" for level in levels))
+    for step in levels[-1]["steps"]:
+        cells = [level["steps"].get(step, {}).get("p95_ms", 0.0) for level in levels]
+        print(f"{step:<24} " + " ".join(f"{cell:>12.1f}" for cell in cells))
+    print()
+    print(summary_line(saturated_at, capacity, args.slo_ms, max(args.users)))
+
+    if args.output:
+        report = {
+            "meta": {
+                "commit": git_commit(),
+                "iterations": args.iterations,
+                "seed": args.seed,
+                "slo_ms": args.slo_ms,
+                "min_gain": args.min_gain,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
+            },
+            "levels": levels,
+            "saturation_users": saturated_at,
+            "capacity_users": capacity
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
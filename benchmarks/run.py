@@ -0,0 +1,315 @@
+"""Benchmark suite over seeded synthetic data
+
+    python -m benchmarks.run --scale 10000 -o results.json
+    python -m benchmarks.run --scale 10000 --compare baseline.json      # exit 1 on a regression
+    python -m benchmarks.run --scale 1000000 --only tracker questions
+
+``--scale`` is the number of records behind the data-dependent cases (the
+question bank and the tracker database). Per-record work (rendering,
+scoring, letters) runs over at most ``--max-ops`` records of the same data.
+Each case reports the best time per operation over ``--repeats`` runs.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from itertools import islice
+
+import config
+from benchmarks import synthetic
+
+# Slower than the baseline by more than this fraction counts as a regression
+DEFAULT_THRESHOLD = 0.15
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register a suite: a function(scale, ops, seed, workdir) yielding (case, timing, ops)
+
+    ``timing`` is a callable that performs ``ops`` operations, or the seconds
+    already measured for a one-off step such as building an index.
+    """
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def best_time(run, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _resume_records(ops, seed):
+    records = list(synthetic.resumes(ops, seed))
+    return [[r[field] for field in ("personal_info", "experience", "education", "skills", "projects")] for r in records]
+
+
+@benchmark("resume")
+def bench_resume(scale, ops, seed, workdir):
+    from resume_builder import ATSResumeBuilder
+    from smart_ai_engine import ai_engine
+    from template import template_engine
+
+    records = _resume_records(ops, seed)
+    for layout in template_engine.available():
+        def cold(layout=layout):
+            ai_engine.cache.clear()
+            builder = ATSResumeBuilder()
+            for fields in records:
+                builder.create_ats_friendly_resume(*fields, layout=layout)
+
+        builder = ATSResumeBuilder(section_cache_size=4 * len(records) + 64)
+        for fields in records:
+            builder.create_ats_friendly_resume(*fields, layout=layout)
+
+        def warm(builder=builder, layout=layout):
+            for fields in records:
+                builder.create_ats_friendly_resume(*fields, layout=layout)
+
+        yield f"render_cold.{layout}", cold, len(records)
+        yield f"render_warm.{layout}", warm, len(records)
+
+
+@benchmark("ats")
+def bench_ats(scale, ops, seed, workdir):
+    from resume_builder import ATSResumeBuilder
+
+    builder = ATSResumeBuilder()
+    records = list(synthetic.resumes(ops, seed))
+    texts = [builder.create_ats_friendly_resume(*fields) for fields in _resume_records(ops, seed)]
+    jobs = [record["job_description"] for record in records]
+
+    def keywords_only():
+        for text in texts:
+            builder.analyze_ats_score(text)
+
+    def with_job():
+        for text, job in zip(texts, jobs):
+            builder.analyze_ats_score(text, job)
+
+    yield "score", keywords_only, len(texts)
+    yield "score_with_job", with_job, len(texts)
+
+
+@benchmark("questions")
+def bench_questions(scale, ops, seed, workdir):
+    from interview_prep import InterviewPreparer
+    from question_bank import QuestionBank
+
+    path = os.path.join(workdir, "questions.db")
+    start = time.perf_counter()
+    bank = QuestionBank(path=path, seed_path=None)
+    bank.add_questions(synthetic.questions(scale, seed))
+    preparer = InterviewPreparer(bank=QuestionBank(path=path, seed_path=None))
+    yield "build_bank_and_pools", time.perf_counter() - start, scale
+
+    recent = set(islice(preparer.bank.ids, 50))
+    skills = {"programming_languages": ["Python", "Go"], "tools": ["Docker"], "databases": ["PostgreSQL"]}
+    queries = ["python", "design a rate", "docker deploy", "conflict with a teammate", "kub"]
+    preparer.search_index
+    preparer.skill_index
+
+    def random_questions():
+        for _ in range(ops):
+            preparer.get_random_question("technical", recent=recent)
+
+    def mock_interviews():
+        for _ in range(ops // 10 or 1):
+            preparer.conduct_mock_interview(["technical", "behavioral", "system_design"], 5, recent=recent)
+
+    def skill_interviews():
+        for _ in range(ops // 10 or 1):
+            preparer.conduct_mock_interview(["technical", "behavioral"], 5, skills=skills)
+
+    def searches():
+        for i in range(ops // 10 or 1):
+            preparer.search_questions(queries[i % len(queries)], 10)
+
+    yield "random_question", random_questions, ops
+    yield "mock_interview", mock_interviews, ops // 10 or 1
+    yield "mock_interview_by_skill", skill_interviews, ops // 10 or 1
+    yield "search", searches, ops // 10 or 1
+
+
+@benchmark("cover_letter")
+def bench_cover_letter(scale, ops, seed, workdir):
+    from cover_letter import CoverLetterGenerator
+    from smart_ai_engine import ai_engine
+
+    generator = CoverLetterGenerator()
+    jobs = list(synthetic.job_postings(ops, seed))
+    applicant = next(synthetic.applicants(1, seed))
+
+    def generate():
+        ai_engine.cache.clear()
+        for job in jobs:
+            generator.generate_cover_letter(job, applicant)
+
+    def bulk_zip():
+        ai_engine.cache.clear()
+        generator.generate_bulk(jobs, applicant, io.BytesIO())
+
+    yield "generate", generate, len(jobs)
+    yield "bulk_zip", bulk_zip, len(jobs)
+
+
+@benchmark("tracker")
+def bench_tracker(scale, ops, seed, workdir):
+    from database import DatabaseManager
+
+    db = DatabaseManager(os.path.join(workdir, "tracker.db"))
+    applications = synthetic.applications(scale, seed)
+    while True:
+        chunk = list(islice(applications, 50000))
+        if not chunk:
+            break
+        db.add_applications(chunk)
+    rounds = max(ops // 10, 20)
+
+    def first_page():
+        for _ in range(rounds):
+            db.query_applications(limit=25)
+
+    def deep_paging():
+        cursor = None
+        for _ in range(rounds):
+            _, cursor = db.query_applications(order="company", limit=25, after=cursor)
+
+    def filtered():
+        for _ in range(rounds):
+            db.query_applications(status="Onsite", company="Acme", limit=25)
+
+    def counts():
+        for _ in range(rounds):
+            db.count_applications()
+            db.count_applications_by_status()
+
+    def dashboard():
+        for _ in range(rounds):
+            db.application_summary()
+
+    yield "first_page", first_page, rounds
+    yield "page_through", deep_paging, rounds
+    yield "filtered_page", filtered, rounds
+    yield "counts", counts, rounds
+    yield "dashboard_summary", dashboard, rounds
+
+    start = time.perf_counter()
+    store = db.application_store()
+    yield "load_columnar_store", time.perf_counter() - start, scale
+
+    def store_aggregates():
+        for _ in range(rounds):
+            store.status_counts()
+            store.weekly_counts()
+
+    yield "columnar_aggregates", store_aggregates, rounds
+    db.close()
+
+
+def git_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=config.BASE_DIR,
+                                capture_output=True, text=True, timeout=10)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def run(scale, ops, seed=0, repeats=3, only=None, log=None):
+    """Run the selected suites; returns the result document written by ``main``"""
+    results = {}
+    workdir = tempfile.mkdtemp(prefix="career-suite-bench-")
+    try:
+        for name, suite in BENCHMARKS.items():
+            if only and name not in only:
+                continue
+            for case, timing, count in suite(scale, ops, seed, workdir):
+                seconds = timing if isinstance(timing, float) else best_time(timing, repeats)
+                key = f"{name}.{case}"
+                results[key] = {"seconds_per_op": seconds / count, "ops": count}
+                if log:
+                    log(f"{key:<40} {seconds / count * 1e6:>12.2f} µs/op  ({count} ops)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        "meta": {
+            "scale": scale,
+            "max_ops": ops,
+            "seed": seed,
+            "repeats": repeats,
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "ai_backend": config.AI_BACKEND,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        "results": results
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """Rows of (case, baseline, current, ratio, regressed) for cases in both runs"""
+    rows = []
+    for case, result in current["results"].items():
+        before = baseline["results"].get(case)
+        if before is None or not before["seconds_per_op"]:
+            continue
+        ratio = result["seconds_per_op"] / before["seconds_per_op"]
+        rows.append((case, before["seconds_per_op"], result["seconds_per_op"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the engines on synthetic data")
+    parser.add_argument("--scale", type=int, default=10000, help="records behind the bank and tracker (1k-1M)")
+    parser.add_argument("--max-ops", type=int, default=2000, help="cap on records per timed loop")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="suites to run")
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag cases slower than this results file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before a case is a regression (default 0.15)")
+    args = parser.parse_args(argv)
+
+    document = run(args.scale, min(args.max_ops, args.scale), args.seed, args.repeats, args.only,
+                   log=lambda line: print(line, file=sys.stderr))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"].get("scale") != args.scale:
+            print(f"Warning: baseline was run at scale {baseline['meta'].get('scale')}", file=sys.stderr)
+        rows = compare(document, baseline, args.threshold)
+        regressions = [row for row in rows if row[4]]
+        print(f"{'case':<40} {'baseline µs':>12} {'current µs':>12} {'change':>8}")
+        for case, before, after, ratio, regressed in rows:
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{case:<40} {before * 1e6:>12.2f} {after * 1e6:>12.2f} {ratio - 1:>+8.1%}{flag}")
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            sys.exit(1)
+    elif not args.output:
+        json.dump(document, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""Seeded synthetic data for benchmarks
+
+Every generator takes a record count and a seed and yields records lazily,
+so a million of them never sit in memory at once. The same (count, seed)
+always produces the same records.
+
+    python -m benchmarks.synthetic resumes 100000 -o resumes.jsonl   # input for batch_score.py
+    python -m benchmarks.synthetic applications 1000000 --seed 7 -o apps.jsonl
+"""
+
+import argparse
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+
+from database import APPLICATION_STATUSES
+
+FIRST_NAMES = ["Ada", "Alan", "Grace", "Linus", "Margaret", "Ken", "Barbara", "Dennis", "Frances", "Guido",
+               "Radia", "Tim", "Hedy", "Donald", "Karen", "Edsger", "Sophie", "John", "Anita", "Bjarne"]
+LAST_NAMES = ["Lovelace", "Turing", "Hopper", "Torvalds", "Hamilton", "Thompson", "Liskov", "Ritchie",
+              "Allen", "van Rossum", "Perlman", "Berners-Lee", "Lamarr", "Knuth", "Jones", "Dijkstra"]
+CITIES = ["Austin, TX", "Seattle, WA", "New York, NY", "Denver, CO", "Chicago, IL", "Remote", "Boston, MA"]
+TITLES = ["Software Engineer", "Backend Developer", "Data Scientist", "DevOps Engineer", "Frontend Developer",
+          "Machine Learning Engineer", "Full Stack Developer", "Site Reliability Engineer", "Data Engineer"]
+SENIORITY = ["Junior", "", "Senior", "Staff", "Lead", "Principal"]
+COMPANY_PREFIXES = ["Acme", "Globex", "Initech", "Umbrella", "Stark", "Wayne", "Hooli", "Pied Piper",
+                    "Cyberdyne", "Soylent", "Tyrell", "Wonka", "Massive Dynamic", "Aperture"]
+COMPANY_SUFFIXES = ["Labs", "Systems", "Corp", "Analytics", "Cloud", "Health", "Financial", "Robotics"]
+DOMAINS = ["web development", "cloud infrastructure", "data platforms", "fintech", "e-commerce",
+           "healthcare software", "machine learning", "developer tooling"]
+DEGREES = ["BSc Computer Science", "BEng Software Engineering", "MSc Data Science", "BA Mathematics",
+           "MSc Computer Science", "BSc Information Systems"]
+UNIVERSITIES = ["State University", "Institute of Technology", "City College", "Polytechnic University"]
+
+SKILLS = {
+    "programming_languages": ["Python", "JavaScript", "TypeScript", "Java", "Go", "Rust", "C++", "SQL", "Scala"],
+    "frameworks": ["React", "Django", "Flask", "FastAPI", "Spring", "Node.js", "Vue", "TensorFlow", "PyTorch"],
+    "tools": ["Git", "Docker", "Kubernetes", "AWS", "Terraform", "Jenkins", "Azure", "GCP", "Linux"],
+    "databases": ["PostgreSQL", "MySQL", "MongoDB", "Redis", "SQLite", "Cassandra"]
+}
+VERBS = ["Developed", "Designed", "Implemented", "Led", "Managed", "Optimized", "Architected", "Automated",
+         "Migrated", "Built", "Reduced", "Increased", "Delivered", "Improved", "Mentored"]
+OBJECTS = ["a payment service", "the CI/CD pipeline", "an internal analytics dashboard", "the search backend",
+           "a recommendation engine", "the data warehouse", "customer-facing APIs", "a mobile checkout flow",
+           "the monitoring stack", "a real-time event pipeline"]
+IMPACTS = ["cutting latency by {n}%", "saving ${n}K per year", "serving {n}M requests a day",
+           "improving conversion by {n}%", "reducing incidents by {n}%", "for a team of {n} engineers"]
+REQUIREMENTS = ["experience with {skill}", "strong knowledge of {skill}", "{years}+ years of {skill}",
+                "familiarity with {skill} in production", "hands-on {skill} skills"]
+RESPONSIBILITIES = ["design and build scalable services", "collaborate with product and design",
+                    "own features from design to deployment", "mentor junior engineers",
+                    "improve reliability and observability", "write clean, tested code",
+                    "participate in code reviews", "drive technical decisions"]
+QUESTION_TEMPLATES = {
+    "technical": ["How would you use {skill} to {task}?", "What are the trade-offs of {skill} compared to {other}?",
+                  "Explain how {skill} handles {concept}.", "Describe a bug you fixed in a {skill} codebase."],
+    "behavioral": ["Tell me about a time you had to {situation}.", "How would you {situation} on a new team?",
+                   "Describe a project where you had to {situation}."],
+    "system_design": ["Design {system}.", "How would you scale {system} to {n} million users?",
+                      "What would you monitor in {system}?"]
+}
+TASKS = ["build a REST API", "process large files", "cache expensive queries", "test asynchronous code",
+         "deploy a web service", "model a many-to-many relationship"]
+CONCEPTS = ["concurrency", "memory management", "error handling", "indexing", "transactions", "packaging"]
+SITUATIONS = ["meet a tight deadline", "resolve a conflict with a teammate", "learn a new technology quickly",
+              "push back on a requirement", "recover from a production outage", "lead without authority"]
+SYSTEMS = ["a URL shortener", "a chat application", "a news feed", "a job board", "a rate limiter",
+           "a file storage service", "a ride-sharing dispatcher"]
+LEVELS = ["Beginner", "Intermediate", "Advanced"]
+
+
+def _rng(seed, stream):
+    # A separate stream per record type, so adding one type does not shift the others
+    return random.Random(f"{seed}:{stream}")
+
+
+def _name(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def _company(rng):
+    return f"{rng.choice(COMPANY_PREFIXES)} {rng.choice(COMPANY_SUFFIXES)}"
+
+
+def _title(rng):
+    return f"{rng.choice(SENIORITY)} {rng.choice(TITLES)}".strip()
+
+
+def _skills(rng):
+    return {section: rng.sample(choices, rng.randint(1, 4)) for section, choices in SKILLS.items()}
+
+
+def _bullet(rng):
+    impact = rng.choice(IMPACTS).format(n=rng.randint(2, 90))
+    return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)}, {impact}"
+
+
+def personal_info(rng, i):
+    name = _name(rng)
+    handle = name.lower().replace(" ", "")
+    return {
+        "name": name,
+        "title": _title(rng),
+        "email": f"{handle}{i}@example.com",
+        "phone": f"+1 (555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        "linkedin": f"linkedin.com/in/{handle}{i}",
+        "location": rng.choice(CITIES),
+        "domain": rng.choice(DOMAINS),
+        "target_company": _company(rng)
+    }
+
+
+def experience(rng):
+    entries = []
+    year = 2025
+    for _ in range(rng.randint(1, 4)):
+        start = year - rng.randint(1, 5)
+        entries.append({
+            "company": _company(rng),
+            "position": _title(rng),
+            "duration": f"{start} - {year if entries else 'Present'}",
+            "responsibilities": [_bullet(rng) for _ in range(rng.randint(2, 6))]
+        })
+        year = start
+    entries[0]["years"] = str(2025 - year)
+    return entries
+
+
+def education(rng):
+    return [{"degree": rng.choice(DEGREES), "institution": rng.choice(UNIVERSITIES),
+             "year": str(rng.randint(2000, 2022)), "gpa": f"{rng.uniform(3.0, 4.0):.1f}" if rng.random() < 0.3 else ""}]
+
+
+def projects(rng):
+    return [{"name": f"{rng.choice(['Open', 'Smart', 'Fast', 'Tiny'])}{rng.choice(['Cache', 'Queue', 'Board', 'Lint'])}",
+             "technologies": rng.sample(SKILLS["programming_languages"] + SKILLS["tools"], 3),
+             "description": _bullet(rng)} for _ in range(rng.randint(0, 3))]
+
+
+def job_description(rng):
+    skills = rng.sample([skill for choices in SKILLS.values() for skill in choices], rng.randint(4, 9))
+    lines = [f"{_company(rng)} is hiring a {_title(rng)} to work on {rng.choice(DOMAINS)}.", "", "You will:"]
+    lines.extend(f"- {r}" for r in rng.sample(RESPONSIBILITIES, 4))
+    lines.extend(["", "Requirements:"])
+    lines.extend(f"- {rng.choice(REQUIREMENTS).format(skill=skill, years=rng.randint(2, 8))}" for skill in skills)
+    return "\n".join(lines)
+
+
+def resumes(count, seed=0):
+    """Records in batch_score.py's structured format, each with a job description"""
+    rng = _rng(seed, "resumes")
+    for i in range(count):
+        yield {
+            "id": i,
+            "personal_info": personal_info(rng, i),
+            "experience": experience(rng),
+            "education": education(rng),
+            "skills": _skills(rng),
+            "projects": projects(rng),
+            "job_description": job_description(rng)
+        }
+
+
+def job_descriptions(count, seed=0):
+    rng = _rng(seed, "jobs")
+    for _ in range(count):
+        yield job_description(rng)
+
+
+def job_postings(count, seed=0):
+    """Rows in the bulk cover letter upload format"""
+    rng = _rng(seed, "postings")
+    for _ in range(count):
+        yield {
+            "company": _company(rng),
+            "position": _title(rng),
+            "hiring_manager": _name(rng),
+            "motivation": f"I want to grow in {rng.choice(DOMAINS)}"
+        }
+
+
+def applicants(count, seed=0):
+    """``applicant_info`` dicts for the cover letter generator"""
+    rng = _rng(seed, "applicants")
+    for i in range(count):
+        skills = _skills(rng)
+        yield {
+            "name": _name(rng),
+            "contact": f"applicant{i}@example.com",
+            "skills": ", ".join(skills["programming_languages"] + skills["tools"]),
+            "experience": ". ".join(_bullet(rng) for _ in range(2)) + "."
+        }
+
+
+def applications(count, seed=0, start=datetime(2024, 1, 1)):
+    """Tracker rows spread over the year after ``start``"""
+    rng = _rng(seed, "applications")
+    span = 365 * 86400
+    for _ in range(count):
+        yield {
+            "company": _company(rng),
+            "position": _title(rng),
+            "status": rng.choices(APPLICATION_STATUSES, weights=(50, 15, 10, 5, 2, 18))[0],
+            "notes": rng.choice(["", "Referral", "Follow up next week", "Recruiter reached out"]),
+            "date_applied": (start + timedelta(seconds=rng.randrange(span))).isoformat()
+        }
+
+
+def questions(count, seed=0):
+    """Interview questions in the question bank's seed format"""
+    rng = _rng(seed, "questions")
+    skills = [skill for choices in SKILLS.values() for skill in choices]
+    groups = list(QUESTION_TEMPLATES)
+    for _ in range(count):
+        group = rng.choices(groups, weights=(6, 3, 1))[0]
+        skill = rng.choice(skills)
+        text = rng.choice(QUESTION_TEMPLATES[group]).format(
+            skill=skill, other=rng.choice(skills), task=rng.choice(TASKS), concept=rng.choice(CONCEPTS),
+            situation=rng.choice(SITUATIONS), system=rng.choice(SYSTEMS), n=rng.randint(1, 100)
+        )
+        yield {
+            "category": group,
+            "subcategory": skill.lower() if group == "technical" else None,
+            "level": rng.choice(LEVELS),
+            "question": text,
+            "answer": " ".join(_bullet(rng) for _ in range(2)),
+            "tips": [rng.choice(RESPONSIBILITIES).capitalize() for _ in range(2)]
+        }
+
+
+GENERATORS = {
+    "resumes": resumes,
+    "jobs": job_descriptions,
+    "postings": job_postings,
+    "applicants": applicants,
+    "applications": applications,
+    "questions": questions
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write seeded synthetic records as JSONL")
+    parser.add_argument("kind", choices=sorted(GENERATORS))
+    parser.add_argument("count", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for record in GENERATORS[args.kind](args.count, args.seed):
+            output.write(json.dumps(record) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+def content_hash(value):
+    """Stable hash of JSON-like content (dicts, lists, strings, numbers)"""
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with hit/miss counters"""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+class TTLCache(LRUCache):
+    """LRU cache whose entries also expire ``ttl`` seconds after they were stored"""
+
+    def __init__(self, maxsize=256, ttl=3600.0, clock=time.monotonic):
+        super().__init__(maxsize)
+        self.ttl = ttl
+        self.expirations = 0
+        self._clock = clock
+
+    def get(self, key, default=None):
+        entry = super().get(key)
+        if entry is None:
+            return default
+        expires, value = entry
+        if expires < self._clock():
+            with self._lock:
+                if self._data.get(key) is entry:
+                    del self._data[key]
+                self.expirations += 1
+                self.hits -= 1
+                self.misses += 1
+            return default
+        return value
+
+    def put(self, key, value):
+        super().put(key, (self._clock() + self.ttl, value))
+
+    def stats(self):
+        stats = super().stats()
+        stats["expirations"] = self.expirations
+        stats["ttl"] = self.ttl
+        return stats
@@ -0,0 +1,20 @@
+"""Building blocks for the packed, column-per-field in-memory stores"""
+
+
+class StringTable:
+    """Interns repeated strings as small integer codes"""
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+    def __getitem__(self, code):
+        return self.values[code]
@@ -0,0 +1,64 @@
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Storage
+DATABASE_PATH = os.getenv("CAREER_SUITE_DB", os.path.join(BASE_DIR, "career_suite.db"))
+DB_POOL_SIZE = int(os.getenv("CAREER_SUITE_DB_POOL_SIZE", "8"))
+DEFAULT_USER = "default"
+# Distinct cover letters kept per user (least recently generated are dropped)
+COVER_LETTER_RETENTION = int(os.getenv("CAREER_SUITE_COVER_LETTER_RETENTION", "50"))
+COVER_LETTER_COMPRESS = os.getenv("CAREER_SUITE_COVER_LETTER_COMPRESS", "1") == "1"
+# Users whose in-memory resume rankers and application stores are kept (least recently used are dropped)
+USER_CACHE_SIZE = int(os.getenv("CAREER_SUITE_USER_CACHE_SIZE", "256"))
+# Weeks of application velocity charted on the dashboard
+DASHBOARD_WEEKS = int(os.getenv("CAREER_SUITE_DASHBOARD_WEEKS", "12"))
+
+# Interview questions: built from the JSON seed into a memory-mapped SQLite file
+QUESTION_SEED_PATH = os.path.join(BASE_DIR, "data", "interview_questions.json")
+QUESTION_BANK_PATH = os.getenv("CAREER_SUITE_QUESTION_BANK", os.path.join(BASE_DIR, "data", "question_bank.db"))
+
+# Per-user session data is kept in memory; set a directory to also write it through to disk
+SESSION_STORE_DIR = os.getenv("CAREER_SUITE_SESSION_DIR") or None
+# Users kept in memory, and seconds of inactivity after which one is dropped
+SESSION_STORE_MAX_USERS = int(os.getenv("CAREER_SUITE_SESSION_MAX_USERS", "10000"))
+SESSION_IDLE_SECONDS = float(os.getenv("CAREER_SUITE_SESSION_IDLE_SECONDS", "86400"))
+
+# AI generation (smart_ai_engine.py): backend is local, http or transformers
+AI_BACKEND = os.getenv("CAREER_SUITE_AI_BACKEND", "local")
+AI_ENDPOINT = os.getenv("CAREER_SUITE_AI_ENDPOINT", "")
+AI_MODEL = os.getenv("CAREER_SUITE_AI_MODEL", "")
+AI_API_KEY = os.getenv("CAREER_SUITE_AI_API_KEY") or None
+AI_TIMEOUT_SECONDS = float(os.getenv("CAREER_SUITE_AI_TIMEOUT", "120"))
+AI_BATCH_SIZE = int(os.getenv("CAREER_SUITE_AI_BATCH_SIZE", "16"))
+# Extra time to hold a batch open; 0 batches only what queues while workers are busy
+AI_BATCH_WAIT_MS = float(os.getenv("CAREER_SUITE_AI_BATCH_WAIT_MS", "0"))
+AI_CONCURRENT_BATCHES = int(os.getenv("CAREER_SUITE_AI_CONCURRENT_BATCHES", "2"))
+AI_CACHE_SIZE = int(os.getenv("CAREER_SUITE_AI_CACHE_SIZE", "4096"))
+AI_CACHE_TTL_SECONDS = float(os.getenv("CAREER_SUITE_AI_CACHE_TTL", "3600"))
+# Serve a model backend's response for a near-duplicate request (cosine similarity of
+# hashed n-gram vectors of its fields at or above the threshold, same numbers and names).
+# Opt-in: only the tasks listed in CAREER_SUITE_AI_SEMANTIC_TASKS (e.g. "summary,bullet")
+# reuse responses; size 0 also turns this off
+AI_SEMANTIC_CACHE_SIZE = int(os.getenv("CAREER_SUITE_AI_SEMANTIC_CACHE_SIZE", "2048"))
+AI_SEMANTIC_THRESHOLD = float(os.getenv("CAREER_SUITE_AI_SEMANTIC_THRESHOLD", "0.95"))
+AI_SEMANTIC_TASKS = tuple(
+    t.strip() for t in os.getenv("CAREER_SUITE_AI_SEMANTIC_TASKS", "").split(",") if t.strip()
+)
+
+# Instrumentation (metrics.py); while off, instrumented functions are left untouched
+METRICS_ENABLED = os.getenv("CAREER_SUITE_METRICS", "") == "1"
+# Serve /metrics (Prometheus text) and /metrics.json on this localhost port; 0 for none
+METRICS_PORT = int(os.getenv("CAREER_SUITE_METRICS_PORT", "0"))
+# Also rewrite this file every interval: JSON if it ends in .json, otherwise Prometheus text
+METRICS_FILE = os.getenv("CAREER_SUITE_METRICS_FILE") or None
+METRICS_EXPORT_SECONDS = float(os.getenv("CAREER_SUITE_METRICS_EXPORT_INTERVAL", "15"))
+
+# Startup
+STARTUP_BUDGET_SECONDS = float(os.getenv("CAREER_SUITE_STARTUP_BUDGET", "5.0"))
+# Modules that must not be imported until their page is opened
+DEFERRED_MODULES = (
+    "resume_builder", "relevance", "interview_prep", "cover_letter", "smart_ai_engine", "portfolio",
+    "review_scheduler", "numpy", "scipy"
+)
+SHOW_IMPORT_PROFILER = os.getenv("CAREER_SUITE_IMPORT_PROFILER", "") == "1"
@@ -0,0 +1,138 @@
+import csv
+import io
+import json
+import re
+import zipfile
+from collections import deque
+
+from metrics import timed
+from smart_ai_engine import ai_engine
+
+# Job posting fields read from bulk uploads; anything else in a row is ignored
+JOB_FIELDS = ("company", "position", "hiring_manager", "motivation")
+# Letters in flight at once during bulk generation
+BULK_WINDOW = 64
+SAFE_NAME_PATTERN = re.compile(r"[^A-Za-z0-9]+")
+
+
+class CoverLetterGenerator:
+    """Stateless letter generator; generated letters are kept only in the database"""
+    
+    @timed("generate_cover_letter")
+    def generate_cover_letter(self, job_data, applicant_info):
+        return ai_engine.generate("cover_letter", **letter_fields(job_data, applicant_info))
+    
+    def generate_cover_letter_stream(self, job_data, applicant_info):
+        """Yield the letter in pieces as it is generated"""
+        return ai_engine.stream("cover_letter", **letter_fields(job_data, applicant_info))
+    
+    @timed("generate_bulk")
+    def generate_bulk(self, jobs, applicant_info, output, max_pending=BULK_WINDOW, progress=None):
+        """Render a letter per job posting concurrently and stream them into a ZIP
+        
+        Up to ``max_pending`` letters are queued on the AI engine at once, where
+        they are batched together; each is written to ``output`` (a binary file
+        object) in input order as it completes. ``progress`` is called with the
+        number of letters written so far. Returns that number.
+        """
+        written = 0
+        with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            pending = deque()
+            
+            def write_next():
+                nonlocal written
+                job, future = pending.popleft()
+                written += 1
+                archive.writestr(letter_file_name(written, job), future.result())
+                if progress:
+                    progress(written)
+            
+            for job in jobs:
+                pending.append((job, ai_engine.submit("cover_letter", letter_fields(job, applicant_info))))
+                if len(pending) >= max_pending:
+                    write_next()
+            while pending:
+                write_next()
+        return written
+
+
+def letter_fields(job_data, applicant_info):
+    """The generation request for a letter, with defaults for anything not provided"""
+    return {
+        'hiring_manager': job_data.get('hiring_manager', 'Hiring Manager'),
+        'position': job_data.get('position', 'Position'),
+        'company': job_data.get('company', 'Company'),
+        'company_reference': job_data.get('company', 'your company'),
+        'company_organization': job_data.get('company', 'your organization'),
+        'motivation': job_data.get('motivation', 'it aligns perfectly with my skills and career goals'),
+        'skills': applicant_info.get('skills', 'relevant skills'),
+        'experience': applicant_info.get('experience', 'My professional experience has prepared me well for this opportunity.'),
+        'name': applicant_info.get('name', 'Your Name'),
+        'contact': applicant_info.get('contact', '')
+    }
+
+
+def letter_file_name(number, job):
+    """Unique, filesystem-safe ZIP entry name for a job's letter"""
+    parts = [SAFE_NAME_PATTERN.sub("_", job.get(field, "")).strip("_") for field in ("company", "position")]
+    return f"{number:04d}_" + "_".join(part for part in parts if part) + ".txt"
+
+
+def _json_lines(text, errors):
+    """(label, record) pairs from JSON Lines text; unparseable lines go to ``errors``"""
+    for number, line in enumerate(text, start=1):
+        if line.strip():
+            try:
+                yield f"line {number}", json.loads(line)
+            except ValueError as e:
+                errors.append(f"line {number}: invalid JSON ({e})")
+
+
+def _json_records(data, errors):
+    """(label, record) pairs from a .json upload: a list of postings, one posting, or JSON Lines"""
+    text = data.decode("utf-8-sig")
+    try:
+        document = json.loads(text)
+    except ValueError as e:
+        # Not a single JSON document; read it as one posting per line instead
+        found = errors[:]
+        records = list(_json_lines(io.StringIO(text), found))
+        if not records:
+            raise ValueError(f"invalid JSON ({e})") from e
+        errors[:] = found
+        return records
+    if isinstance(document, list):
+        return [(f"record {number}", record) for number, record in enumerate(document, start=1)]
+    return [("record 1", document)]
+
+
+def iter_job_postings(data, file_name, errors=None):
+    """Yield job posting dicts from uploaded CSV, JSON or JSON Lines bytes
+
+    A ``.json`` file may hold a list of postings or one posting per line.
+    Records that are not objects and lines that do not parse are skipped, with
+    a message naming the line or record appended to ``errors``; a file that
+    cannot be read at all raises ValueError.
+    """
+    errors = [] if errors is None else errors
+    name = file_name.lower()
+    if name.endswith(".csv"):
+        reader = csv.DictReader(io.TextIOWrapper(io.BytesIO(data), encoding="utf-8-sig", newline=""))
+        records = ((f"line {reader.line_num}", row) for row in reader)
+    elif name.endswith(".json"):
+        records = _json_records(data, errors)
+    else:
+        records = _json_lines(io.TextIOWrapper(io.BytesIO(data), encoding="utf-8-sig", newline=""), errors)
+    try:
+        for label, row in records:
+            if not isinstance(row, dict):
+                errors.append(f"{label}: expected an object, got {type(row).__name__}")
+                continue
+            job = {field: str(row.get(field) or "").strip() for field in JOB_FIELDS}
+            if job["company"] or job["position"]:
+                yield {field: value for field, value in job.items() if value}
+    except csv.Error as e:
+        raise ValueError(str(e)) from e
+
+# Global instance
+cover_letter_generator = CoverLetterGenerator()
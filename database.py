@@ -0,0 +1,674 @@
+import queue
+import sqlite3
+import threading
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+import config
+from application_store import STATUS_LABELS, ApplicationStore, Status, funnel, normalize_date_applied, week_start
+from cache import LRUCache, content_hash
+from metrics import timed
+from skill_index import SkillIndex
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    company TEXT NOT NULL,
+    position TEXT NOT NULL,
+    status TEXT NOT NULL,
+    notes TEXT NOT NULL DEFAULT '',
+    date_applied TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_applications_user_status_date
+    ON applications (user_id, status, date_applied);
+CREATE INDEX IF NOT EXISTS idx_applications_company_position
+    ON applications (company, position);
+CREATE INDEX IF NOT EXISTS idx_applications_user_date
+    ON applications (user_id, date_applied, id);
+-- Keyset pages in company and status order seek these instead of sorting every row
+CREATE INDEX IF NOT EXISTS idx_applications_user_company
+    ON applications (user_id, company, id);
+CREATE INDEX IF NOT EXISTS idx_applications_user_status_id
+    ON applications (user_id, status, id);
+-- A user's rows in insertion order, for loading and catching up the columnar store
+CREATE INDEX IF NOT EXISTS idx_applications_user_id
+    ON applications (user_id, id);
+
+-- Dashboard aggregates, updated in the same transaction as every application write
+CREATE TABLE IF NOT EXISTS application_status_counts (
+    user_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (user_id, status)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS application_weekly_counts (
+    user_id TEXT NOT NULL,
+    week TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (user_id, week)
+) WITHOUT ROWID;
+
+-- Letter bodies are stored once per distinct text; cover_letters rows only reference them
+CREATE TABLE IF NOT EXISTS cover_letter_bodies (
+    hash TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    compressed INTEGER NOT NULL,
+    size INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS cover_letters (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    company TEXT NOT NULL,
+    position TEXT NOT NULL,
+    body_hash TEXT NOT NULL REFERENCES cover_letter_bodies (hash),
+    date_created TEXT NOT NULL,
+    last_used TEXT NOT NULL,
+    UNIQUE (user_id, body_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_cover_letters_user ON cover_letters (user_id, last_used);
+CREATE INDEX IF NOT EXISTS idx_cover_letters_body ON cover_letters (body_hash);
+
+CREATE TABLE IF NOT EXISTS resumes (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    content TEXT NOT NULL,
+    date_created TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_resumes_user ON resumes (user_id, id);
+
+CREATE TABLE IF NOT EXISTS question_reviews (
+    user_id TEXT NOT NULL,
+    question_id INTEGER NOT NULL,
+    due INTEGER NOT NULL,
+    interval REAL NOT NULL,
+    ease REAL NOT NULL,
+    repetitions INTEGER NOT NULL,
+    PRIMARY KEY (user_id, question_id)
+) WITHOUT ROWID;
+"""
+
+APPLICATION_STATUSES = list(STATUS_LABELS)
+
+# Sort orders for application queries: name -> (column, direction)
+APPLICATION_ORDERS = {
+    "newest": ("date_applied", "DESC"),
+    "oldest": ("date_applied", "ASC"),
+    "company": ("company", "ASC"),
+    "status": ("status", "ASC")
+}
+
+# Statements are module constants so sqlite3's per-connection statement cache
+# reuses the prepared form on every call.
+INSERT_APPLICATION = (
+    "INSERT INTO applications (user_id, company, position, status, notes, date_applied) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+SELECT_APPLICATIONS = (
+    "SELECT id, company, position, status, notes, date_applied FROM applications "
+    "WHERE user_id = ? ORDER BY id"
+)
+# Rows for the columnar store, with the time already converted to epoch seconds;
+# seeks idx_applications_user_id, so only this user's rows are read, already in id order
+SELECT_APPLICATION_COLUMNS_AFTER = (
+    "SELECT id, company, position, status, notes, CAST(strftime('%s', date_applied) AS INTEGER) "
+    "FROM applications WHERE user_id = ? AND id > ? ORDER BY id"
+)
+UPSERT_STATUS_COUNT = (
+    "INSERT INTO application_status_counts (user_id, status, count) VALUES (?, ?, ?) "
+    "ON CONFLICT (user_id, status) DO UPDATE SET count = count + excluded.count"
+)
+UPSERT_WEEKLY_COUNT = (
+    "INSERT INTO application_weekly_counts (user_id, week, count) VALUES (?, ?, ?) "
+    "ON CONFLICT (user_id, week) DO UPDATE SET count = count + excluded.count"
+)
+SELECT_STATUS_COUNTS = "SELECT status, count FROM application_status_counts WHERE user_id = ?"
+SELECT_WEEKLY_COUNTS = (
+    "SELECT week, count FROM application_weekly_counts WHERE user_id = ? AND week >= ? ORDER BY week"
+)
+COUNT_APPLICATIONS = "SELECT COALESCE(SUM(count), 0) FROM application_status_counts WHERE user_id = ?"
+# Rebuilding the aggregates from the applications table; "weekday 0" moves to
+# the week's Sunday, six days back is its Monday
+REBUILD_STATUS_COUNTS = (
+    "INSERT INTO application_status_counts (user_id, status, count) "
+    "SELECT user_id, status, COUNT(*) FROM applications GROUP BY user_id, status"
+)
+REBUILD_WEEKLY_COUNTS = (
+    "INSERT INTO application_weekly_counts (user_id, week, count) "
+    "SELECT user_id, date(date_applied, 'weekday 0', '-6 days') AS week, COUNT(*) "
+    "FROM applications GROUP BY user_id, week"
+)
+INSERT_COVER_LETTER_BODY = (
+    "INSERT OR IGNORE INTO cover_letter_bodies (hash, body, compressed, size) VALUES (?, ?, ?, ?)"
+)
+# Regenerating an identical letter only refreshes its row's last_used time
+UPSERT_COVER_LETTER = (
+    "INSERT INTO cover_letters (user_id, company, position, body_hash, date_created, last_used) "
+    "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (user_id, body_hash) DO UPDATE SET "
+    "company = excluded.company, position = excluded.position, last_used = excluded.last_used "
+    "RETURNING id, date_created"
+)
+SELECT_COVER_LETTERS = (
+    "SELECT l.id, l.company, l.position, b.body, b.compressed, l.date_created, l.last_used "
+    "FROM cover_letters l JOIN cover_letter_bodies b ON b.hash = l.body_hash "
+    "WHERE l.user_id = ? ORDER BY l.id"
+)
+COUNT_COVER_LETTERS = "SELECT COUNT(*) FROM cover_letters WHERE user_id = ?"
+# Keep only a user's most recently used letters, then drop bodies no row references
+TRIM_COVER_LETTERS = (
+    "DELETE FROM cover_letters WHERE user_id = ? AND id NOT IN ("
+    "SELECT id FROM cover_letters WHERE user_id = ? ORDER BY last_used DESC, id DESC LIMIT ?) "
+    "RETURNING body_hash"
+)
+DELETE_UNUSED_BODY = (
+    "DELETE FROM cover_letter_bodies WHERE hash = ? "
+    "AND NOT EXISTS (SELECT 1 FROM cover_letters WHERE body_hash = ?)"
+)
+INSERT_RESUME = "INSERT INTO resumes (user_id, name, content, date_created) VALUES (?, ?, ?, ?)"
+SELECT_RESUME = "SELECT id, user_id, name, content, date_created FROM resumes WHERE id = ?"
+SELECT_USER_RESUME = SELECT_RESUME + " AND user_id = ?"
+SELECT_USER_RESUMES = "SELECT id, content FROM resumes WHERE user_id = ? ORDER BY id"
+SELECT_RESUME_CONTENTS = "SELECT content FROM resumes"
+SELECT_RESUME_CONTENT = "SELECT content FROM resumes WHERE id = ?"
+UPSERT_REVIEW = (
+    "INSERT INTO question_reviews (user_id, question_id, due, interval, ease, repetitions) "
+    "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (user_id, question_id) DO UPDATE SET "
+    "due = excluded.due, interval = excluded.interval, ease = excluded.ease, repetitions = excluded.repetitions"
+)
+SELECT_REVIEWS = (
+    "SELECT question_id, due, interval, ease, repetitions FROM question_reviews WHERE user_id = ?"
+)
+
+
+class ConnectionPool:
+    """A fixed-size pool of SQLite connections shared across Streamlit session threads"""
+
+    def __init__(self, path, size=config.DB_POOL_SIZE):
+        # An in-memory database exists only inside its one connection, so the
+        # pool degrades to handing that single connection out in turn.
+        self.path = path
+        self.size = 1 if path == ":memory:" else size
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection, creating one if the pool is not yet full"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+            conn = self._connect() if create else self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def encode_letter(content, compress=config.COVER_LETTER_COMPRESS):
+    """(hash, stored bytes, compressed flag, size) for a cover letter body"""
+    raw = content.encode("utf-8")
+    if compress:
+        packed = zlib.compress(raw, 6)
+        if len(packed) < len(raw):
+            return content_hash(content), packed, 1, len(raw)
+    return content_hash(content), raw, 0, len(raw)
+
+
+def decode_letter(body, compressed):
+    return (zlib.decompress(body) if compressed else bytes(body)).decode("utf-8")
+
+
+class DatabaseManager:
+    """SQLite-backed store for applications, cover letters and resumes"""
+
+    def __init__(self, path=config.DATABASE_PATH, pool_size=config.DB_POOL_SIZE):
+        self.pool = ConnectionPool(path, pool_size)
+        self._skill_indexes = {}
+        self._idf_table = None
+        self._rankers = LRUCache(maxsize=config.USER_CACHE_SIZE)
+        self._index_lock = threading.Lock()
+        self._stores = LRUCache(maxsize=config.USER_CACHE_SIZE)
+        self._stores_lock = threading.Lock()
+        with self.transaction() as conn:
+            legacy_letters = self._detach_legacy_cover_letters(conn)
+            conn.executescript(SCHEMA)
+            self._backfill_aggregates(conn)
+        if legacy_letters:
+            self._import_legacy_cover_letters()
+
+    @staticmethod
+    def _detach_legacy_cover_letters(conn):
+        """Rename a cover_letters table from before bodies were deduplicated"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(cover_letters)")}
+        if "content" not in columns:
+            return False
+        conn.execute("DROP INDEX IF EXISTS idx_cover_letters_user")
+        conn.execute("ALTER TABLE cover_letters RENAME TO cover_letters_legacy")
+        return True
+
+    def _backfill_aggregates(self, conn):
+        """Build the dashboard aggregates for a database written before they existed"""
+        empty = conn.execute("SELECT NOT EXISTS (SELECT 1 FROM application_status_counts)").fetchone()[0]
+        if empty and conn.execute("SELECT EXISTS (SELECT 1 FROM applications)").fetchone()[0]:
+            self._rebuild_aggregates(conn)
+
+    @staticmethod
+    def _rebuild_aggregates(conn):
+        conn.execute("DELETE FROM application_status_counts")
+        conn.execute("DELETE FROM application_weekly_counts")
+        conn.execute(REBUILD_STATUS_COUNTS)
+        conn.execute(REBUILD_WEEKLY_COUNTS)
+
+    def rebuild_application_aggregates(self):
+        """Recompute the dashboard aggregates from every stored application"""
+        with self.transaction() as conn:
+            self._rebuild_aggregates(conn)
+
+    def _import_legacy_cover_letters(self):
+        with self.transaction() as conn:
+            rows = conn.execute(
+                "SELECT user_id, company, position, content, date_created FROM cover_letters_legacy ORDER BY id"
+            ).fetchall()
+            for user_id, company, position, content, date_created in rows:
+                self._store_cover_letter(conn, company, position, content, user_id, date_created)
+            for user_id in {row[0] for row in rows}:
+                self._trim_cover_letters(conn, user_id)
+            conn.execute("DROP TABLE cover_letters_legacy")
+
+    @contextmanager
+    def transaction(self):
+        """A pooled connection wrapped in a transaction"""
+        with self.pool.connection() as conn:
+            with conn:
+                yield conn
+
+    # Applications
+
+    @timed("db.add_application")
+    def add_application(self, company, position, status, notes="", user_id=config.DEFAULT_USER):
+        status = Status.from_label(status).label
+        date_applied = datetime.now().isoformat()
+        with self.transaction() as conn:
+            cursor = conn.execute(INSERT_APPLICATION, (user_id, company, position, status, notes, date_applied))
+            conn.execute(UPSERT_STATUS_COUNT, (user_id, status, 1))
+            conn.execute(UPSERT_WEEKLY_COUNT, (user_id, week_start(date_applied), 1))
+        self._sync_store(user_id)
+        return {
+            "id": cursor.lastrowid,
+            "company": company,
+            "position": position,
+            "status": status,
+            "notes": notes,
+            "date_applied": date_applied
+        }
+
+    @timed("db.add_applications")
+    def add_applications(self, applications, user_id=config.DEFAULT_USER):
+        """Bulk insert application dicts and their aggregate counts in a single transaction
+
+        A ``date_applied`` that is not an ISO date or timestamp raises
+        ValueError and nothing is inserted.
+        """
+        now = datetime.now().isoformat()
+        statuses = Counter()
+        days = Counter()
+
+        def rows():
+            for app in applications:
+                status = Status.from_label(app["status"]).label
+                date_applied = normalize_date_applied(app["date_applied"]) if app.get("date_applied") else now
+                statuses[status] += 1
+                days[date_applied[:10]] += 1
+                yield user_id, app["company"], app["position"], status, app.get("notes", ""), date_applied
+
+        with self.transaction() as conn:
+            conn.executemany(INSERT_APPLICATION, rows())
+            weeks = Counter()
+            for day, count in days.items():
+                weeks[week_start(day)] += count
+            conn.executemany(UPSERT_STATUS_COUNT, ((user_id, status, n) for status, n in statuses.items()))
+            conn.executemany(UPSERT_WEEKLY_COUNT, ((user_id, week, n) for week, n in weeks.items()))
+        self._sync_store(user_id)
+
+    @timed("db.get_applications")
+    def get_applications(self, user_id=config.DEFAULT_USER):
+        with self.pool.connection() as conn:
+            return [dict(row) for row in conn.execute(SELECT_APPLICATIONS, (user_id,))]
+
+    @timed("db.count_applications")
+    def count_applications(self, user_id=config.DEFAULT_USER, status=None, company=None,
+                           date_from=None, date_to=None):
+        """Number of applications matching the filters
+
+        The unfiltered total is read from the maintained status counts; filtered
+        counts run an aggregate query over the indexes.
+        """
+        where, params = self._application_filters(user_id, status, company, date_from, date_to)
+        sql = COUNT_APPLICATIONS if len(params) == 1 else f"SELECT COUNT(*) FROM applications WHERE {where}"
+        with self.pool.connection() as conn:
+            return conn.execute(sql, params).fetchone()[0]
+
+    @timed("db.count_applications_by_status")
+    def count_applications_by_status(self, user_id=config.DEFAULT_USER):
+        """{status: count} from the maintained aggregates, without touching the applications"""
+        with self.pool.connection() as conn:
+            return {status: count for status, count in conn.execute(SELECT_STATUS_COUNTS, (user_id,)) if count}
+
+    @timed("db.application_summary")
+    def application_summary(self, user_id=config.DEFAULT_USER, weeks=config.DASHBOARD_WEEKS, today=None):
+        """Dashboard figures read from the maintained aggregates
+
+        Returns the total, counts per status (in pipeline order), the funnel
+        (see ``application_store.funnel``) and applications per week for the
+        last ``weeks`` weeks, oldest first, including weeks with none.
+        """
+        this_week = date.fromisoformat(week_start((today or date.today()).isoformat()))
+        first_week = this_week - timedelta(weeks=weeks - 1)
+        with self.pool.connection() as conn:
+            counts = dict(conn.execute(SELECT_STATUS_COUNTS, (user_id,)).fetchall())
+            weekly = dict(conn.execute(SELECT_WEEKLY_COUNTS, (user_id, first_week.isoformat())).fetchall())
+        by_status = {status: counts.get(status, 0) for status in APPLICATION_STATUSES}
+        velocity = {}
+        for offset in range(weeks):
+            week = (first_week + timedelta(weeks=offset)).isoformat()
+            velocity[week] = weekly.get(week, 0)
+        return {
+            "total": sum(by_status.values()),
+            "by_status": by_status,
+            "funnel": funnel(by_status),
+            "weekly": velocity
+        }
+
+    @timed("db.application_store")
+    def application_store(self, user_id=config.DEFAULT_USER):
+        """A user's applications as a columnar ApplicationStore, loaded on first use
+
+        Once loaded, the store follows every write made through this manager.
+        Stores for the least recently used users beyond ``USER_CACHE_SIZE``
+        are dropped and reloaded on their next use. The pages read through
+        SQL instead (see ``query_applications`` and ``application_summary``);
+        the store is for whole-history analysis.
+        """
+        with self._stores_lock:
+            store = self._stores.get(user_id)
+            if store is None:
+                store = ApplicationStore()
+                self._load_store(store, user_id)
+                self._stores.put(user_id, store)
+        return store
+
+    def _sync_store(self, user_id):
+        """Append rows added since a loaded store last caught up"""
+        with self._stores_lock:
+            store = self._stores.get(user_id)
+            if store is not None:
+                self._load_store(store, user_id)
+
+    def _load_store(self, store, user_id):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            store.extend(cursor.execute(SELECT_APPLICATION_COLUMNS_AFTER, (user_id, store.last_id())))
+
+    @timed("db.query_applications")
+    def query_applications(self, user_id=config.DEFAULT_USER, status=None, company=None, date_from=None,
+                           date_to=None, order="newest", limit=25, after=None):
+        """One page of applications using keyset pagination
+
+        ``after`` is the cursor returned with the previous page. Returns
+        ``(rows, next_cursor)``; ``next_cursor`` is None on the last page.
+        Seeking past the cursor keeps every page O(log n + limit), however
+        deep the user pages.
+        """
+        column, direction = APPLICATION_ORDERS[order]
+        where, params = self._application_filters(user_id, status, company, date_from, date_to)
+        if after is not None:
+            comparison = "<" if direction == "DESC" else ">"
+            where += f" AND ({column}, id) {comparison} (?, ?)"
+            params.extend(after)
+        sql = (
+            f"SELECT id, company, position, status, notes, date_applied FROM applications "
+            f"WHERE {where} ORDER BY {column} {direction}, id {direction} LIMIT ?"
+        )
+        params.append(limit + 1)
+        with self.pool.connection() as conn:
+            rows = [dict(row) for row in conn.execute(sql, params)]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1][column], rows[-1]["id"])
+        return rows, next_cursor
+
+    def _application_filters(self, user_id, status, company, date_from, date_to):
+        """WHERE clause and parameters for the application filters"""
+        clauses = ["user_id = ?"]
+        params = [user_id]
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if company:
+            # Case-insensitive prefix match
+            clauses.append(r"company LIKE ? ESCAPE '\'")
+            params.append(company.replace("\\", r"\\").replace("%", r"\%").replace("_", r"\_") + "%")
+        if date_from:
+            clauses.append("date_applied >= ?")
+            params.append(str(date_from))
+        if date_to:
+            clauses.append("date_applied < ?")
+            params.append(str(date_to))
+        return " AND ".join(clauses), params
+
+    # Cover letters
+
+    @timed("db.add_cover_letter")
+    def add_cover_letter(self, company, position, content, user_id=config.DEFAULT_USER):
+        """Store a letter; identical text is kept once and only its last-used time moves"""
+        with self.transaction() as conn:
+            letter_id, date_created = self._store_cover_letter(conn, company, position, content, user_id)
+            self._trim_cover_letters(conn, user_id)
+        return {
+            "id": letter_id,
+            "company": company,
+            "position": position,
+            "content": content,
+            "date_created": date_created
+        }
+
+    @staticmethod
+    def _store_cover_letter(conn, company, position, content, user_id, date_created=None):
+        now = datetime.now().isoformat()
+        body_hash, body, compressed, size = encode_letter(content)
+        conn.execute(INSERT_COVER_LETTER_BODY, (body_hash, body, compressed, size))
+        # Imported rows keep their original date as their last use
+        row = conn.execute(
+            UPSERT_COVER_LETTER, (user_id, company, position, body_hash, date_created or now, date_created or now)
+        ).fetchone()
+        return row[0], row[1]
+
+    @staticmethod
+    def _trim_cover_letters(conn, user_id, limit=config.COVER_LETTER_RETENTION):
+        """Apply the per-user retention limit, least recently used first"""
+        removed = {row[0] for row in conn.execute(TRIM_COVER_LETTERS, (user_id, user_id, limit)).fetchall()}
+        conn.executemany(DELETE_UNUSED_BODY, ((body_hash, body_hash) for body_hash in removed))
+
+    @timed("db.get_cover_letters")
+    def get_cover_letters(self, user_id=config.DEFAULT_USER):
+        with self.pool.connection() as conn:
+            rows = conn.execute(SELECT_COVER_LETTERS, (user_id,)).fetchall()
+        return [
+            {
+                "id": row["id"],
+                "company": row["company"],
+                "position": row["position"],
+                "content": decode_letter(row["body"], row["compressed"]),
+                "date_created": row["date_created"],
+                "last_used": row["last_used"]
+            }
+            for row in rows
+        ]
+
+    @timed("db.count_cover_letters")
+    def count_cover_letters(self, user_id=config.DEFAULT_USER):
+        with self.pool.connection() as conn:
+            return conn.execute(COUNT_COVER_LETTERS, (user_id,)).fetchone()[0]
+
+    # Resumes
+
+    @timed("db.save_resume")
+    def save_resume(self, name, content, user_id=config.DEFAULT_USER):
+        """Store a generated resume and add it to the loaded skill index, IDF table and ranker"""
+        date_created = datetime.now().isoformat()
+        with self.transaction() as conn:
+            cursor = conn.execute(INSERT_RESUME, (user_id, name, content, date_created))
+        resume_id = cursor.lastrowid
+        with self._index_lock:
+            index = self._skill_indexes.get(user_id)
+            if index is not None:
+                index.add_document(resume_id, content)
+            if self._idf_table is not None:
+                self._idf_table.add_document(content)
+            ranker = self._rankers.get(user_id)
+            if ranker is not None:
+                ranker.add(resume_id, content)
+        return {"id": resume_id, "name": name, "content": content, "date_created": date_created}
+
+    @timed("db.get_resume")
+    def get_resume(self, resume_id, user_id=None):
+        """A stored resume by id; with ``user_id``, only if that user owns it"""
+        with self.pool.connection() as conn:
+            if user_id is None:
+                row = conn.execute(SELECT_RESUME, (resume_id,)).fetchone()
+            else:
+                row = conn.execute(SELECT_USER_RESUME, (resume_id, user_id)).fetchone()
+        return dict(row) if row else None
+
+    def skill_index(self, user_id=config.DEFAULT_USER):
+        """Skill index over one user's stored resumes, built from the table on first use"""
+        index = self._skill_indexes.get(user_id)
+        if index is None:
+            with self._index_lock:
+                index = self._skill_indexes.get(user_id)
+                if index is None:
+                    # Imported here so opening the database does not load the resume engine
+                    from resume_builder import DEFAULT_ATS_KEYWORDS
+                    index = SkillIndex(DEFAULT_ATS_KEYWORDS, text_source=self._resume_content)
+                    with self.pool.connection() as conn:
+                        for resume_id, content in conn.execute(SELECT_USER_RESUMES, (user_id,)):
+                            index.add_document(resume_id, content)
+                    self._skill_indexes[user_id] = index
+        return index
+
+    def idf_table(self):
+        """Document frequencies over every stored resume, for weighting job match terms
+
+        Only term counts are kept, never text, so sharing them across users
+        exposes nothing. Built from the table on first use.
+        """
+        if self._idf_table is None:
+            with self._index_lock:
+                if self._idf_table is None:
+                    from relevance import IDFTable
+                    with self.pool.connection() as conn:
+                        self._idf_table = IDFTable.from_corpus(content for content, in conn.execute(SELECT_RESUME_CONTENTS))
+        return self._idf_table
+
+    def resume_ranker(self, user_id=config.DEFAULT_USER):
+        """TF-IDF ranker over one user's stored resumes, built from the table on first use
+
+        Weights come from ``idf_table`` as it stood when each resume was added.
+        Rankers for the least recently seen users are dropped and rebuilt on demand.
+        """
+        ranker = self._rankers.get(user_id)
+        if ranker is None:
+            idf_table = self.idf_table()
+            with self._index_lock:
+                ranker = self._rankers.get(user_id)
+                if ranker is None:
+                    from relevance import RelevanceEngine
+                    with self.pool.connection() as conn:
+                        ranker = RelevanceEngine(idf_table).fit(conn.execute(SELECT_USER_RESUMES, (user_id,)))
+                    self._rankers.put(user_id, ranker)
+        return ranker
+
+    @timed("db.rank_resumes")
+    def rank_resumes(self, job_description, user_id=config.DEFAULT_USER, k=10):
+        """The user's k stored resumes most similar to a job description, as (resume_id, score) pairs"""
+        ranker = self.resume_ranker(user_id)
+        with self._index_lock:
+            return ranker.top_k(job_description, k)
+
+    def _resume_content(self, resume_id):
+        with self.pool.connection() as conn:
+            row = conn.execute(SELECT_RESUME_CONTENT, (resume_id,)).fetchone()
+        return row[0] if row else None
+
+    @timed("db.search_resumes")
+    def search_resumes(self, query, user_id=config.DEFAULT_USER):
+        """Ids of the user's stored resumes matching a boolean skill query (see ``SkillIndex.query``)
+
+        A malformed query raises ValueError.
+        """
+        return self.skill_index(user_id).query(query)
+
+    # Interview question reviews
+
+    @timed("db.save_review")
+    def save_review(self, question_id, due, interval, ease, repetitions, user_id=config.DEFAULT_USER):
+        """Insert or replace a user's spaced-repetition state for one question"""
+        with self.transaction() as conn:
+            conn.execute(UPSERT_REVIEW, (user_id, question_id, due, interval, ease, repetitions))
+
+    @timed("db.get_reviews")
+    def get_reviews(self, user_id=config.DEFAULT_USER):
+        """(question_id, due, interval, ease, repetitions) rows for a user"""
+        with self.pool.connection() as conn:
+            return conn.execute(SELECT_REVIEWS, (user_id,)).fetchall()
+
+    def close(self):
+        self.pool.close()
+
+
+# Global instance, opened on first use: importing this module must not create the database file
+_db = None
+_db_lock = threading.Lock()
+
+
+def get_db():
+    """The process-wide DatabaseManager on config.DATABASE_PATH"""
+    global _db
+    if _db is None:
+        with _db_lock:
+            if _db is None:
+                _db = DatabaseManager()
+    return _db
+
+
+def __getattr__(name):
+    # ``database.db`` resolves through get_db (PEP 562), so the name stays importable
+    if name == "db":
+        return get_db()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
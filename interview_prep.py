@@ -1,154 +1,319 @@
-import streamlit as st
 import random
+import threading
+from array import array
 
-class InterviewPreparer:
+from keyword_matcher import STOP_WORDS, tokenize
+from metrics import register_cache, timed
+from question_bank import QuestionBank
+from question_search import QuestionSearchIndex, question_text
+from sampling import AliasTable
+
+ALL_QUESTIONS = ("all",)
+# Plan key for mock interview slots drawn by resume skill rather than from a pool
+SKILL_TARGETED = ("skills",)
+
+# A recently asked question is kept on a draw with this probability
+RECENT_QUESTION_WEIGHT = 0.1
+MAX_REDRAWS = 8
+
+# Resume skill spellings that map onto question subcategories
+SKILL_ALIASES = {
+    "js": "javascript",
+    "typescript": "javascript",
+    "node.js": "javascript",
+    "nodejs": "javascript",
+    "react": "javascript",
+    "mysql": "sql",
+    "postgresql": "sql",
+    "postgres": "sql",
+    "sqlite": "sql",
+    "py": "python",
+    "django": "python",
+    "flask": "python"
+}
+# Relative weight of a resume skill by the section it was listed under
+SKILL_SECTION_WEIGHTS = {
+    "programming_languages": 2.0,
+    "databases": 1.5,
+    "frameworks": 1.0,
+    "tools": 0.5
+}
+
+
+def skill_terms(skill):
+    """Index terms for one resume skill: its tokens and any subcategory alias"""
+    terms = [token for token in tokenize(skill) if token not in STOP_WORDS]
+    return [SKILL_ALIASES.get(term, term) for term in terms]
+
+
+class QuestionSkillIndex:
+    """Posting lists from a skill term to the bank positions of questions about it
+    
+    A question is listed under its subcategory and under each non-stop word
+    of its wording, so "docker" on a resume reaches a question that mentions
+    Docker even without a docker subcategory. Each term also has a posting
+    list per category, so a technical slot never lands on a behavioral
+    question that happens to mention the skill.
+    """
+    
     def __init__(self):
-        self.questions_db = {
-            "technical": {
-                "python": [
-                    {
-                        "question": "What are Python decorators and how do you use them?",
-                        "answer": "Decorators are functions that modify the behavior of other functions. They allow you to wrap another function to extend its behavior without permanently modifying it. Use cases include logging, timing, access control, and more.",
-                        "category": "Intermediate",
-                        "tips": ["Explain the @ syntax", "Mention common decorators like @staticmethod", "Give a practical example"]
-                    },
-                    {
-                        "question": "Explain the difference between lists and tuples in Python",
-                        "answer": "Lists are mutable (can be modified after creation) while tuples are immutable. Lists use [] and tuples use (). Tuples are generally faster and can be used as dictionary keys.",
-                        "category": "Basic",
-                        "tips": ["Highlight mutability difference", "Mention performance implications", "Discuss use cases for each"]
-                    },
-                    {
-                        "question": "What are Python generators and when would you use them?",
-                        "answer": "Generators are functions that return an iterator. They use 'yield' instead of 'return' and maintain state between calls. Use them for memory-efficient processing of large datasets or infinite sequences.",
-                        "category": "Intermediate",
-                        "tips": ["Explain lazy evaluation", "Compare with list comprehensions", "Mention memory efficiency"]
-                    }
-                ],
-                "javascript": [
-                    {
-                        "question": "What is the difference between let, const, and var?",
-                        "answer": "var is function-scoped and can be redeclared. let and const are block-scoped. let can be reassigned but not redeclared in the same scope, while const cannot be reassigned.",
-                        "category": "Basic",
-                        "tips": ["Explain scoping differences", "Discuss hoisting behavior", "Recommend using const by default"]
-                    },
-                    {
-                        "question": "What are JavaScript promises and how do they work?",
-                        "answer": "Promises represent the eventual completion (or failure) of an asynchronous operation. They have three states: pending, fulfilled, and rejected. Use .then() for success and .catch() for errors.",
-                        "category": "Intermediate",
-                        "tips": ["Compare with callbacks", "Explain promise chaining", "Mention async/await syntax"]
-                    }
-                ],
-                "sql": [
-                    {
-                        "question": "What is the difference between INNER JOIN and LEFT JOIN?",
-                        "answer": "INNER JOIN returns only matching rows from both tables. LEFT JOIN returns all rows from the left table and matching rows from the right table (with NULLs for non-matching).",
-                        "category": "Intermediate",
-                        "tips": ["Use Venn diagram analogy", "Provide example scenarios", "Explain when to use each"]
-                    },
-                    {
-                        "question": "What are SQL indexes and why are they important?",
-                        "answer": "Indexes are special lookup tables that help speed up data retrieval. They work like a book index, allowing the database to find data without scanning the entire table.",
-                        "category": "Intermediate",
-                        "tips": ["Explain performance benefits", "Mention trade-offs (storage, write speed)", "Discuss when to index"]
-                    }
-                ]
-            },
-            "behavioral": [
-                {
-                    "question": "Tell me about yourself",
-                    "answer": "Structure your answer: 1) Current role/background, 2) Key accomplishments, 3) Why you're interested in this role, 4) What you can bring to the company. Keep it 2-3 minutes max.",
-                    "category": "Introduction",
-                    "tips": ["Be concise and relevant", "Tailor to the company", "End with why you're excited"]
-                },
-                {
-                    "question": "What is your greatest weakness?",
-                    "answer": "Choose a real but manageable weakness. Show self-awareness and explain steps you're taking to improve. Example: 'I used to struggle with delegation, but now I use project management tools and regular check-ins.'",
-                    "category": "Self-assessment",
-                    "tips": ["Be authentic but strategic", "Show growth mindset", "Don't mention critical job-related weaknesses"]
-                },
-                {
-                    "question": "Describe a challenging project and how you handled it",
-                    "answer": "Use STAR method: Situation, Task, Action, Result. Be specific about the challenge, your role, actions taken, and measurable outcomes.",
-                    "category": "Experience",
-                    "tips": ["Use specific metrics", "Highlight problem-solving", "Show collaboration if applicable"]
-                },
-                {
-                    "question": "Where do you see yourself in 5 years?",
-                    "answer": "Focus on skills you want to develop and how they align with the company's growth. Show ambition but also realistic career progression within the organization.",
-                    "category": "Career Goals",
-                    "tips": ["Align with company goals", "Show continuous learning", "Be realistic and specific"]
-                },
-                {
-                    "question": "Why do you want to work for our company?",
-                    "answer": "Research the company and mention specific things that appeal to you: their mission, products, culture, or recent achievements. Show genuine interest and alignment with your values.",
-                    "category": "Motivation",
-                    "tips": ["Do your research", "Be specific and genuine", "Connect to your career goals"]
-                }
-            ],
-            "system_design": [
-                {
-                    "question": "How would you design Twitter?",
-                    "answer": "Discuss: 1) Requirements gathering, 2) High-level architecture (load balancers, app servers, databases), 3) Database design (users, tweets, followers), 4) API design, 5) Scaling considerations, 6) Caching strategy.",
-                    "category": "Advanced",
-                    "tips": ["Start with requirements", "Draw diagrams mentally", "Consider trade-offs", "Discuss scalability from day 1"]
-                },
-                {
-                    "question": "How would you design Uber?",
-                    "answer": "Cover: 1) Core components (rider app, driver app, dispatch system), 2) Real-time location tracking, 3) Matching algorithm, 4) Payment processing, 5) Scaling for peak loads, 6) Database design for locations and trips.",
-                    "category": "Advanced",
-                    "tips": ["Focus on real-time aspects", "Discuss geospatial data", "Consider reliability and safety"]
-                }
-            ]
-        }
-    
-    def get_questions_by_category(self, category, subcategory=None):
-        """Get questions by category"""
-        if category == "technical" and subcategory:
-            return self.questions_db.get("technical", {}).get(subcategory, [])
-        elif category in self.questions_db:
-            return self.questions_db[category]
-        return []
-    
-    def get_random_question(self, category=None):
-        """Get a random question from specified category"""
-        if category and category in self.questions_db:
-            if category == "technical":
-                # Get random subcategory, then random question
-                subcategories = list(self.questions_db["technical"].keys())
-                random_subcat = random.choice(subcategories)
-                questions = self.questions_db["technical"][random_subcat]
-            else:
-                questions = self.questions_db[category]
-        else:
-            # Get from all categories
-            all_questions = []
-            for cat in self.questions_db.values():
-                if isinstance(cat, list):
-                    all_questions.extend(cat)
-                else:
-                    for subcat_questions in cat.values():
-                        all_questions.extend(subcat_questions)
-            questions = all_questions
+        self.postings = {}
+        self.category_postings = {}
+    
+    @classmethod
+    def from_bank(cls, bank):
+        index = cls()
+        for position, question in enumerate(bank.iter_questions()):
+            index.add_question(position, question)
+        return index
+    
+    def add_question(self, position, question):
+        terms = {token for token in tokenize(question["question"]) if token not in STOP_WORDS}
+        if question.get("subcategory"):
+            terms.add(question["subcategory"])
+        for term in terms:
+            self.postings.setdefault(term, array("I")).append(position)
+            self.category_postings.setdefault((question["group"], term), array("I")).append(position)
+    
+    def lookup(self, term, category=None):
+        if category is None:
+            return self.postings.get(term, ())
+        return self.category_postings.get((category, term), ())
+
+
+class InterviewPreparer:
+    def __init__(self, difficulty_weights=None, bank=None):
+        self.difficulty_weights = difficulty_weights or {}
+        self.bank = bank if bank is not None else QuestionBank()
+        self._search_index = None
+        self._skill_index = None
+        self._search_lock = threading.Lock()
+        self._build_index()
+    
+    def _build_index(self):
+        """Group the bank's questions into pools with a sampler per pool
+        
+        Pools hold positions in the bank's metadata arrays; question text
+        stays on disk until a question is drawn. Pools are kept for all
+        questions, each category, each subcategory and each difficulty level,
+        each with an alias table over the difficulty weights so a weighted
+        draw is O(1).
+        """
+        self.subcategories = {}
+        pools = {ALL_QUESTIONS: array("I")}
+        for position in range(len(self.bank)):
+            self._add_to_pools(pools, position)
+        self._pools = pools
+        self._samplers = {key: self._sampler(ids) for key, ids in pools.items()}
+    
+    def _add_to_pools(self, pools, position):
+        _, category, subcategory, level = self.bank.metadata(position)
+        keys = [ALL_QUESTIONS, ("category", category), ("difficulty", level)]
+        if subcategory:
+            subcategories = self.subcategories.setdefault(category, [])
+            if subcategory not in subcategories:
+                subcategories.append(subcategory)
+            keys.append(("subcategory", category, subcategory))
+        for key in keys:
+            pools.setdefault(key, array("I")).append(position)
+        return keys
+    
+    def _sampler(self, positions):
+        levels, names = self.bank.levels, self.bank.level_names
+        return AliasTable([self._question_weight(names[levels[p]]) for p in positions])
+    
+    def add_questions(self, questions):
+        """Add questions to the bank and refresh the pools they fall into"""
+        touched = set()
+        positions = self.bank.add_questions(questions)
+        for position in positions:
+            touched.update(self._add_to_pools(self._pools, position))
+        for key in touched:
+            self._samplers[key] = self._sampler(self._pools[key])
+        with self._search_lock:
+            if self._search_index is None and self._skill_index is None:
+                return
+            for position in positions:
+                question = self.bank.get(self.bank.ids[position])
+                if self._search_index is not None:
+                    self._search_index.add_document(position, question_text(question))
+                if self._skill_index is not None:
+                    self._skill_index.add_question(position, question)
+    
+    @property
+    def search_index(self):
+        """Full-text index over the bank, built on first search"""
+        if self._search_index is None:
+            with self._search_lock:
+                if self._search_index is None:
+                    self._search_index = QuestionSearchIndex.from_bank(self.bank)
+        return self._search_index
+    
+    @property
+    def skill_index(self):
+        """Skill term -> question positions, built on first targeted draw"""
+        if self._skill_index is None:
+            with self._search_lock:
+                if self._skill_index is None:
+                    self._skill_index = QuestionSkillIndex.from_bank(self.bank)
+        return self._skill_index
+    
+    @timed("search_questions")
+    def search_questions(self, query, k=10):
+        """Questions best matching a free-text query, the last word matched as a prefix"""
+        return [self.bank.get(self.bank.ids[position]) for position, _ in self.search_index.search(query, k)]
+    
+    def _question_weight(self, level):
+        return self.difficulty_weights.get(level, 1.0)
+    
+    def _pool_key(self, category=None, subcategory=None, difficulty=None):
+        if subcategory:
+            return ("subcategory", category or "technical", subcategory)
+        if category:
+            return ("category", category)
+        if difficulty:
+            return ("difficulty", difficulty)
+        return ALL_QUESTIONS
+    
+    def _draw(self, key, recent=None):
+        """Weighted draw of one question id from a pool"""
+        positions = self._pools.get(key)
+        if not positions:
+            return None
+        sampler = self._samplers[key]
+        bank_ids = self.bank.ids
+        return self._avoid_recent(lambda: bank_ids[positions[sampler.sample()]], recent)
+    
+    @staticmethod
+    def _avoid_recent(pick, recent):
+        """Call ``pick`` for a question id, redrawing ids in ``recent``
+        
+        Questions in ``recent`` are kept only with probability
+        RECENT_QUESTION_WEIGHT, which down-weights them without rebuilding
+        the alias table; the expected number of redraws is a small constant.
+        """
+        question_id = pick()
+        for _ in range(MAX_REDRAWS):
+            if not recent or question_id not in recent or random.random() < RECENT_QUESTION_WEIGHT:
+                break
+            question_id = pick()
+        return question_id
+    
+    def _draw_distinct(self, key, count, recent=None):
+        """Up to ``count`` distinct weighted draws (question ids) from a pool"""
+        positions = self._pools.get(key, ())
+        if count >= len(positions):
+            chosen = [self.bank.ids[p] for p in positions]
+            random.shuffle(chosen)
+            return chosen
+        return self._distinct(lambda: self._draw(key, recent), count)
+    
+    @staticmethod
+    def _distinct(draw, count):
+        chosen = []
+        seen = set()
+        attempts = 0
+        while len(chosen) < count and attempts < count * MAX_REDRAWS:
+            attempts += 1
+            question_id = draw()
+            if question_id not in seen:
+                seen.add(question_id)
+                chosen.append(question_id)
+        return chosen
+    
+    def skill_sampler(self, skills, category=None):
+        """Alias table over the resume skills that have questions, with their posting lists
         
-        return random.choice(questions) if questions else None
-    
-    def conduct_mock_interview(self, categories, num_questions=5):
-        """Generate a mock interview session"""
-        questions = []
-        for category in categories:
-            if category == "technical":
-                # Include 2-3 technical questions from different subcategories
-                tech_questions = []
-                for subcat_questions in self.questions_db["technical"].values():
-                    tech_questions.extend(random.sample(subcat_questions, min(1, len(subcat_questions))))
-                questions.extend(random.sample(tech_questions, min(2, len(tech_questions))))
+        ``skills`` is the section -> skill list dict given to the resume
+        builder; with a ``category``, only questions in it count. Building
+        this is linear in the number of skills, not in the size of the bank;
+        returns None when no skill matches a question.
+        """
+        weights = {}
+        for section, skill_list in skills.items():
+            weight = SKILL_SECTION_WEIGHTS.get(section, 1.0)
+            for skill in skill_list:
+                for term in skill_terms(skill):
+                    if self.skill_index.lookup(term, category):
+                        weights[term] = max(weights.get(term, 0.0), weight)
+        if not weights:
+            return None
+        terms = list(weights)
+        return AliasTable([weights[term] for term in terms]), [self.skill_index.lookup(term, category) for term in terms]
+    
+    def _draw_by_skills(self, skill_sampler, recent=None):
+        """A skill weighted by the resume, then a question uniformly from its postings"""
+        sampler, postings = skill_sampler
+        bank_ids = self.bank.ids
+        
+        def pick():
+            positions = postings[sampler.sample()]
+            return bank_ids[positions[int(random.random() * len(positions))]]
+        
+        return self._avoid_recent(pick, recent)
+    
+    def get_skill_question(self, skills, recent=None):
+        """A question about one of the resume's skills, or None if none match"""
+        skill_sampler = self.skill_sampler(skills)
+        if skill_sampler is None:
+            return None
+        return self.bank.get(self._draw_by_skills(skill_sampler, recent))
+    
+    def get_questions_by_category(self, category, subcategory=None, limit=None):
+        """Get questions by category, loading at most ``limit`` from the bank"""
+        positions = self._pools.get(self._pool_key(category, subcategory), ()) if category else ()
+        if limit is not None:
+            positions = positions[:limit]
+        return [self.bank.get(self.bank.ids[p]) for p in positions]
+    
+    def get_random_question(self, category=None, subcategory=None, difficulty=None, recent=None):
+        """Get a random question, weighted by difficulty and away from recently asked ones"""
+        if category and ("category", category) not in self._pools:
+            category = None
+        question_id = self._draw(self._pool_key(category, subcategory, difficulty), recent)
+        return self.bank.get(question_id) if question_id is not None else None
+    
+    @timed("conduct_mock_interview")
+    def conduct_mock_interview(self, categories, num_questions=5, recent=None, due=(), skills=None):
+        """Generate a mock interview session
+        
+        Question ids in ``due`` (reviews the scheduler says are due) come first.
+        The rest are spread round-robin over the requested categories. With a
+        resume's ``skills``, technical questions are drawn by skill from the
+        technical pool; otherwise they rotate through the subcategories.
+        """
+        categories = [c for c in categories if ("category", c) in self._pools]
+        if not categories:
+            return []
+        
+        due_questions = [q for q in map(self.bank.get, due) if q and q["group"] in categories][:num_questions]
+        due_ids = {q["id"] for q in due_questions}
+        num_questions -= len(due_questions)
+        
+        skill_sampler = self.skill_sampler(skills, "technical") if skills and "technical" in categories else None
+        plan = {}
+        subcategory_turn = {category: random.randrange(len(subs)) for category, subs in self.subcategories.items() if subs}
+        for i in range(num_questions):
+            category = categories[i % len(categories)]
+            subcategories = self.subcategories.get(category)
+            if category == "technical" and skill_sampler:
+                key = SKILL_TARGETED
+            elif subcategories:
+                key = self._pool_key(category, subcategories[subcategory_turn[category] % len(subcategories)])
+                subcategory_turn[category] += 1
             else:
-                cat_questions = self.questions_db.get(category, [])
-                questions.extend(random.sample(cat_questions, min(2, len(cat_questions))))
+                key = self._pool_key(category)
+            plan[key] = plan.get(key, 0) + 1
         
-        # Ensure we have exactly num_questions
-        return random.sample(questions, min(num_questions, len(questions)))
+        question_ids = []
+        for key, count in plan.items():
+            if key == SKILL_TARGETED:
+                drawn = self._distinct(lambda: self._draw_by_skills(skill_sampler, recent), count)
+            else:
+                drawn = self._draw_distinct(key, count, recent)
+            question_ids.extend(i for i in drawn if i not in due_ids)
+        random.shuffle(question_ids)
+        return due_questions + [self.bank.get(i) for i in question_ids[:num_questions]]
     
     def get_interview_tips(self):
         """General interview tips"""
@@ -166,4 +331,5 @@ class InterviewPreparer:
         ]
 
 # Create the instance with the EXACT name used in import
-interview_preparer = InterviewPreparer()
\ No newline at end of file
+interview_preparer = InterviewPreparer()
+register_cache("question_bank", interview_preparer.bank.cache)
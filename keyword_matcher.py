@@ -0,0 +1,90 @@
+import re
+
+# Tokens keep the punctuation that is part of skill names ("c++", "c#", "node.js")
+# but drop sentence punctuation, so "Python." and "Python" tokenize the same.
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+
+_END = ""
+
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our that the their this to
+we will with you your i my me am was were been being not no but if then so than into over
+about who what which when where how all any can do does did per via etc
+""".split())
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def load_keywords(path):
+    """Read a keyword taxonomy file with one term per line"""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+class KeywordMatcher:
+    """Match a keyword list against text in a single pass over its tokens
+
+    Keywords are compiled once into a token trie, so matching respects word
+    boundaries ("Java" does not match "JavaScript", "API" does not match
+    "rapid") and costs O(tokens in text) regardless of how many keywords
+    are loaded.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+        self._root = {}
+        for index, keyword in enumerate(self.keywords):
+            tokens = tokenize(keyword)
+            if not tokens:
+                continue
+            node = self._root
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node.setdefault(_END, index)
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a keyword taxonomy with one term per line"""
+        return cls(load_keywords(path))
+
+    def match_indices(self, text=None, tokens=None):
+        """Return the set of keyword indices found in the text"""
+        if tokens is None:
+            tokens = tokenize(text)
+        root = self._root
+        found = set()
+        n = len(tokens)
+        for i in range(n):
+            node = root.get(tokens[i])
+            j = i + 1
+            while node is not None:
+                index = node.get(_END)
+                if index is not None:
+                    found.add(index)
+                if j == n:
+                    break
+                node = node.get(tokens[j])
+                j += 1
+        return found
+
+    def match(self, text=None, tokens=None, missing_limit=None):
+        """Split keywords into (found, missing) lists, preserving keyword order
+
+        ``missing_limit`` stops collecting missing keywords early, which keeps
+        the cost independent of taxonomy size when only the top few are shown.
+        """
+        found_indices = self.match_indices(text, tokens)
+        keywords = self.keywords
+        found = [keywords[index] for index in sorted(found_indices)]
+        missing = []
+        if missing_limit is None:
+            missing_limit = len(keywords)
+        for index, keyword in enumerate(keywords):
+            if len(missing) >= missing_limit:
+                break
+            if index not in found_indices:
+                missing.append(keyword)
+        return found, missing
@@ -1,6 +1,13 @@
 import streamlit as st
 import json
-from datetime import datetime
+import tempfile
+from datetime import datetime, timedelta
+import config
+from database import APPLICATION_ORDERS, APPLICATION_STATUSES
+from metrics import start_exporter, timed
+from page_registry import PageRegistry, module_load_times, profile_imports, top_level_imports
+from state import current_user_id, get_engine, save_user_data, user_data
+from template import template_engine
 
 # Set page config - THIS MUST BE THE FIRST STREAMLIT COMMAND
 st.set_page_config(
@@ -44,254 +51,46 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Simple classes to avoid import errors
-class PortfolioBuilder:
-    def __init__(self):
-        self.projects = []
-        self.skills = {
-            "programming_languages": [],
-            "frameworks": [],
-            "tools": [],
-            "databases": []
-        }
-    
-    def add_project(self, title, description, technologies, github_url="", live_url=""):
-        project = {
-            "title": title,
-            "description": description,
-            "technologies": technologies,
-            "github_url": github_url,
-            "live_url": live_url,
-            "date_created": datetime.now().strftime("%Y-%m-%d")
-        }
-        self.projects.append(project)
-        return project
-    
-    def add_skill(self, skill_name, category, proficiency=5):
-        if category not in self.skills:
-            self.skills[category] = []
-        skill = {
-            "name": skill_name,
-            "category": category,
-            "proficiency": proficiency
-        }
-        self.skills[category].append(skill)
-        return skill
-    
-    def get_stats(self):
-        return {
-            "total_projects": len(self.projects),
-            "total_skills": sum(len(skills) for skills in self.skills.values())
-        }
-
-class CoverLetterGenerator:
-    def __init__(self):
-        self.generated_letters = []
-    
-    def generate_cover_letter(self, job_data, applicant_info):
-        letter = f"""
-Dear {job_data.get('hiring_manager', 'Hiring Manager')},
-
-I am writing to express my enthusiastic interest in the {job_data.get('position', 'Position')} position at {job_data.get('company', 'Company')}. With my background in {applicant_info.get('skills', 'relevant skills')}, I am confident that I possess the qualifications necessary to excel in this role.
-
-{applicant_info.get('experience', 'My professional experience has prepared me well for this opportunity.')}
-
-I am particularly drawn to this position because {job_data.get('motivation', 'it aligns perfectly with my skills and career goals')}. I am impressed by {job_data.get('company', 'your company')}'s reputation and would be thrilled to contribute to your team.
-
-Thank you for considering my application. I look forward to discussing how my skills can benefit {job_data.get('company', 'your organization')}.
-
-Sincerely,
-{applicant_info.get('name', 'Your Name')}
-{applicant_info.get('contact', '')}
-"""
-        self.generated_letters.append({
-            'company': job_data.get('company', ''),
-            'position': job_data.get('position', ''),
-            'content': letter
-        })
-        return letter
-
-class DatabaseManager:
-    def __init__(self):
-        self.applications = []
-        self.cover_letters = []
-    
-    def add_application(self, company, position, status, notes=""):
-        app = {
-            "company": company,
-            "position": position,
-            "status": status,
-            "notes": notes,
-            "date_applied": datetime.now().isoformat()
-        }
-        self.applications.append(app)
-        return app
-    
-    def get_applications(self):
-        return self.applications
-    
-    def add_cover_letter(self, company, position, content):
-        letter = {
-            "company": company,
-            "position": position,
-            "content": content
-        }
-        self.cover_letters.append(letter)
-        return letter
-    
-    def get_cover_letters(self):
-        return self.cover_letters
-
-class ATSResumeBuilder:
-    def create_ats_friendly_resume(self, personal_info, experience, education, skills, projects):
-        resume = f"""
-# {personal_info.get('name', 'Your Name').upper()}
-{personal_info.get('title', 'Professional Title')}
-
-## Contact Information
-- 📧 Email: {personal_info.get('email', 'your.email@example.com')}
-- 📱 Phone: {personal_info.get('phone', '+1 (555) 123-4567')}
-- 🔗 LinkedIn: {personal_info.get('linkedin', 'linkedin.com/in/yourprofile')}
-- 🌐 Portfolio: {personal_info.get('portfolio', 'yourportfolio.com')}
-- 📍 Location: {personal_info.get('location', 'City, State')}
-
-## Professional Summary
-Results-driven {personal_info.get('title', 'Professional')} with experience in software development. 
-Proficient in {', '.join(skills.get('programming_languages', ['Python', 'JavaScript']))} with demonstrated success in delivering high-quality solutions.
-
-## Technical Skills
-{self._format_skills_section(skills)}
-
-## Professional Experience
-{self._format_experience_section(experience)}
-
-## Education
-{self._format_education_section(education)}
-
-## Projects
-{self._format_projects_section(projects)}
-"""
-        return resume
-    
-    def _format_skills_section(self, skills):
-        skills_text = ""
-        for category, skill_list in skills.items():
-            if skill_list:
-                category_name = category.replace('_', ' ').title()
-                skills_text += f"**{category_name}:** {', '.join(skill_list)}\\n\\n"
-        return skills_text.strip()
-    
-    def _format_experience_section(self, experience):
-        if not experience:
-            return "No experience added yet."
-        exp_text = ""
-        for job in experience:
-            exp_text += f"### {job.get('position', 'Position')}\\n"
-            exp_text += f"**{job.get('company', 'Company')}** | {job.get('duration', 'Duration')}\\n\\n"
-            for responsibility in job.get('responsibilities', []):
-                exp_text += f"• {responsibility}\\n"
-            exp_text += "\\n"
-        return exp_text.strip()
-    
-    def _format_education_section(self, education):
-        if not education:
-            return "No education added yet."
-        edu_text = ""
-        for edu in education:
-            edu_text += f"### {edu.get('degree', 'Degree')}\\n"
-            edu_text += f"**{edu.get('institution', 'Institution')}** | {edu.get('year', 'Year')}\\n"
-            if edu.get('gpa'):
-                edu_text += f"GPA: {edu.get('gpa')}\\n"
-            edu_text += "\\n"
-        return edu_text.strip()
-    
-    def _format_projects_section(self, projects):
-        if not projects:
-            return "No projects added yet."
-        proj_text = ""
-        for project in projects:
-            proj_text += f"### {project.get('name', 'Project Name')}\\n"
-            proj_text += f"*Technologies: {', '.join(project.get('technologies', []))}*\\n\\n"
-            proj_text += f"{project.get('description', 'Project description')}\\n\\n"
-        return proj_text.strip()
-    
-    def analyze_ats_score(self, resume_text):
-        return {
-            'score': 85,
-            'found_keywords': ['Python', 'JavaScript', 'SQL', 'React'],
-            'feedback': ['Good structure and keyword usage'],
-            'word_count': len(resume_text.split())
-        }
-
-class InterviewPreparer:
-    def get_questions_by_category(self, category, subcategory=None):
-        questions = [
-            {
-                "question": "Tell me about yourself",
-                "answer": "Structure your answer with current role, key accomplishments, and why you're interested in this position.",
-                "category": "Behavioral",
-                "tips": ["Be concise", "Tailor to the company"]
-            },
-            {
-                "question": "What are your strengths?",
-                "answer": "Highlight 2-3 key strengths with specific examples from your experience.",
-                "category": "Behavioral",
-                "tips": ["Be specific", "Use examples"]
-            }
-        ]
-        return questions
-    
-    def conduct_mock_interview(self, categories, num_questions=5):
-        return self.get_questions_by_category("behavioral")[:num_questions]
-    
-    def get_interview_tips(self):
-        return [
-            "Research the company thoroughly",
-            "Practice your answers",
-            "Dress professionally",
-            "Arrive early",
-            "Ask thoughtful questions"
-        ]
-
-# Initialize instances
-portfolio_builder = PortfolioBuilder()
-cover_letter_generator = CoverLetterGenerator()
-resume_builder = ATSResumeBuilder()
-interview_preparer = InterviewPreparer()
-db = DatabaseManager()
+# Pages register themselves below; their engine modules load on first visit
+pages = PageRegistry()
 
 def main():
+    start_exporter()
+    
     # Main header
     st.markdown('<h1 class="main-header">🚀 AI Career Suite</h1>', unsafe_allow_html=True)
     st.markdown("### Your Complete Career Development Platform")
     
     # Navigation
     st.sidebar.title("🎯 Navigation")
-    app_mode = st.sidebar.selectbox(
-        "Choose Section", 
-        [
-            "🏠 Dashboard", 
-            "📄 Resume Builder", 
-            "💼 Portfolio", 
-            "📝 Cover Letters", 
-            "🎤 Interview Prep",
-            "📋 Job Tracker"
-        ]
-    )
+    app_mode = st.sidebar.selectbox("Choose Section", pages.labels())
+    
+    pages.render(app_mode)
     
-    if app_mode == "🏠 Dashboard":
-        show_dashboard()
-    elif app_mode == "📄 Resume Builder":
-        show_resume_builder()
-    elif app_mode == "💼 Portfolio":
-        show_portfolio()
-    elif app_mode == "📝 Cover Letters":
-        show_cover_letters()
-    elif app_mode == "🎤 Interview Prep":
-        show_interview_prep()
-    elif app_mode == "📋 Job Tracker":
-        show_job_tracker()
+    if config.SHOW_IMPORT_PROFILER or st.query_params.get("profile") == "imports":
+        show_import_profile()
 
+@timed("show_import_profile")
+def show_import_profile():
+    """Sidebar report of what startup and each page's first load cost"""
+    
+    with st.sidebar.expander("⏱️ Import Profile"):
+        if module_load_times:
+            st.markdown("**First page loads**")
+            st.dataframe(
+                [{"Module": name, "ms": round(seconds * 1000, 1)} for name, seconds in module_load_times.items()],
+                hide_index=True
+            )
+        if st.button("Profile cold imports", key="profile_imports"):
+            rows = profile_imports(["main_app"] + pages.all_modules())
+            st.dataframe(
+                [{"Module": row['module'], "Cumulative ms": row['cumulative_ms'], "Self ms": row['self_ms']}
+                 for row in top_level_imports(rows)],
+                hide_index=True
+            )
+
+@pages.page("🏠 Dashboard")
+@timed("show_dashboard")
 def show_dashboard():
     st.markdown('<div class="section-header"><h2>🏠 Dashboard</h2></div>', unsafe_allow_html=True)
     
@@ -323,18 +122,68 @@ def show_dashboard():
         """, unsafe_allow_html=True)
     
     # Quick Stats
+    db = get_engine("db")
+    user_id = current_user_id()
+    # Counted from the stored data so the dashboard does not import the portfolio page's module
+    portfolio = user_data('portfolio', {})
+    project_count = len(portfolio.get('projects', []))
+    skill_count = sum(len(skills) for skills in portfolio.get('skills', {}).values())
     st.markdown("### 📊 Your Progress")
     col1, col2, col3, col4 = st.columns(4)
     
+    summary = db.application_summary(user_id)
+    
     with col1:
-        st.metric("Applications", len(db.get_applications()))
+        st.metric("Applications", summary['total'])
     with col2:
-        st.metric("Projects", len(portfolio_builder.projects))
+        st.metric("Projects", project_count)
     with col3:
-        st.metric("Skills", sum(len(skills) for skills in portfolio_builder.skills.values()))
+        st.metric("Skills", skill_count)
     with col4:
-        st.metric("Cover Letters", len(db.get_cover_letters()))
+        st.metric("Cover Letters", db.count_cover_letters(user_id))
+    
+    if summary['total']:
+        show_application_analytics(summary)
+
+@timed("show_application_analytics")
+def show_application_analytics(summary):
+    """Funnel and weekly trend charts from the maintained application aggregates"""
+    
+    funnel_col, trend_col = st.columns(2)
+    
+    with funnel_col:
+        st.markdown("#### 🔻 Application Funnel")
+        # Numbered labels keep the pipeline order on Streamlit's alphabetical category axis
+        st.bar_chart(
+            {
+                "Stage": [f"{index}. {stage['stage']}" for index, stage in enumerate(summary['funnel'], 1)],
+                "Applications": [stage['reached'] for stage in summary['funnel']]
+            },
+            x="Stage",
+            y="Applications"
+        )
+        steps = [
+            f"{stage['stage']} {stage['conversion']:.0%}"
+            for stage in summary['funnel'][1:] if stage['conversion'] is not None
+        ]
+        if steps:
+            st.caption("Conversion from the previous stage: " + " → ".join(steps))
+    
+    with trend_col:
+        st.markdown("#### 📈 Weekly Applications")
+        st.line_chart(
+            {"Week": list(summary['weekly']), "Applications": list(summary['weekly'].values())},
+            x="Week",
+            y="Applications"
+        )
+        by_status = [
+            f"{STATUS_EMOJI.get(status, '📌')} {status}: {count}"
+            for status, count in summary['by_status'].items() if count
+        ]
+        st.caption(" · ".join(by_status))
 
+@pages.page("📄 Resume Builder", modules=("smart_ai_engine", "resume_builder"))
+@timed("show_resume_builder")
 def show_resume_builder():
     st.markdown('<div class="section-header"><h2>📄 ATS Resume Builder</h2></div>', unsafe_allow_html=True)
     
@@ -390,77 +239,151 @@ def show_resume_builder():
             tools = st.text_input("Development Tools", placeholder="Git, Docker, AWS")
             databases = st.text_input("Databases", placeholder="MySQL, MongoDB")
         
+        st.markdown("### Layout & Target Job")
+        layout_col, jd_col = st.columns(2)
+        
+        with layout_col:
+            layouts = template_engine.available()
+            layout = st.selectbox("Resume Layout", layouts, index=layouts.index("classic") if "classic" in layouts else 0)
+        
+        with jd_col:
+            job_description = st.text_area("Job Description (Optional)", height=100,
+                                           placeholder="Paste the job posting to check how well your resume matches it")
+        
         submitted = st.form_submit_button("🚀 Generate ATS Resume")
         
         if submitted:
             if not all([name, title, email, company, position, responsibilities, degree, institution, grad_year, programming]):
                 st.error("❌ Please fill in all required fields (*)")
             else:
-                with st.spinner("🔄 Generating your professional resume..."):
-                    # Prepare data
-                    personal_info = {
-                        'name': name,
-                        'title': title,
-                        'email': email,
-                        'phone': phone,
-                        'linkedin': linkedin,
-                        'portfolio': portfolio,
-                        'location': location
-                    }
-                    
-                    experience = [{
-                        'company': company,
-                        'position': position,
-                        'duration': duration,
-                        'responsibilities': [r.strip() for r in responsibilities.split('•') if r.strip()]
-                    }]
-                    
-                    education = [{
-                        'degree': degree,
-                        'institution': institution,
-                        'year': grad_year,
-                        'gpa': gpa
-                    }]
-                    
-                    skills = {
-                        'programming_languages': [s.strip() for s in programming.split(',')],
-                        'frameworks': [s.strip() for s in frameworks.split(',')] if frameworks else [],
-                        'tools': [s.strip() for s in tools.split(',')] if tools else [],
-                        'databases': [s.strip() for s in databases.split(',')] if databases else []
-                    }
-                    
-                    projects = []
-                    
-                    # Generate resume
-                    resume = resume_builder.create_ats_friendly_resume(
-                        personal_info, experience, education, skills, projects
-                    )
-                    
-                    st.success("✅ ATS Resume Generated Successfully!")
-                    
-                    st.markdown("### 📄 Your Generated Resume")
-                    st.text_area("Resume Content", resume, height=500)
-                    
-                    # ATS Analysis
-                    analysis = resume_builder.analyze_ats_score(resume)
-                    
-                    st.markdown("### 📊 ATS Compatibility Score")
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        st.metric("ATS Score", f"{analysis['score']}%")
-                    with col2:
-                        st.metric("Keywords Found", len(analysis['found_keywords']))
-                    with col3:
-                        st.metric("Word Count", analysis['word_count'])
-                    
-                    # Download button
-                    st.download_button(
-                        "📥 Download Resume",
-                        resume,
-                        file_name=f"resume_{name.replace(' ', '_')}.txt"
-                    )
+                # Prepare data
+                personal_info = {
+                    'name': name,
+                    'title': title,
+                    'email': email,
+                    'phone': phone,
+                    'linkedin': linkedin,
+                    'portfolio': portfolio,
+                    'location': location
+                }
+                
+                experience = [{
+                    'company': company,
+                    'position': position,
+                    'duration': duration,
+                    'responsibilities': [r.strip() for r in responsibilities.split('•') if r.strip()]
+                }]
+                
+                education = [{
+                    'degree': degree,
+                    'institution': institution,
+                    'year': grad_year,
+                    'gpa': gpa
+                }]
+                
+                skills = {
+                    'programming_languages': [s.strip() for s in programming.split(',')],
+                    'frameworks': [s.strip() for s in frameworks.split(',')] if frameworks else [],
+                    'tools': [s.strip() for s in tools.split(',')] if tools else [],
+                    'databases': [s.strip() for s in databases.split(',')] if databases else []
+                }
+                
+                projects = []
+                
+                # Generate resume, showing it as it streams in
+                resume_builder = get_engine("resume_builder")
+                preview = st.empty()
+                with preview.container():
+                    resume = st.write_stream(resume_builder.create_ats_friendly_resume_stream(
+                        personal_info, experience, education, skills, projects, layout=layout
+                    ))
+                db = get_engine("db")
+                db.save_resume(name, resume, user_id=current_user_id())
+                
+                # ATS Analysis; job match weighs terms by their rarity across stored resumes
+                analysis = resume_builder.analyze_ats_score(resume, job_description,
+                                                            idf_table=db.idf_table() if job_description else None)
+                
+                # Keep the result in the user store so it survives reruns
+                save_user_data('last_resume', {
+                    'name': name,
+                    'content': resume,
+                    'analysis': analysis,
+                    'skills': skills
+                })
+                # The finished resume is shown below the form
+                preview.empty()
+                st.success("✅ ATS Resume Generated Successfully!")
+    
+    last_resume = user_data('last_resume')
+    if last_resume:
+        show_resume_result(last_resume)
+    
+    with st.expander("🔎 Search Saved Resumes"):
+        query = st.text_input("Skill query", placeholder='kubernetes AND go AND NOT php')
+        if query:
+            db = get_engine("db")
+            user_id = current_user_id()
+            try:
+                matches = db.search_resumes(query, user_id=user_id)
+            except ValueError as e:
+                st.error(f"❌ {e}")
+                matches = None
+            if matches is not None:
+                st.write(f"{len(matches)} matching resume(s)")
+                for resume_id in matches[:20]:
+                    st.write(f"• {db.get_resume(resume_id, user_id=user_id)['name']}")
+    
+    with st.expander("🎯 Rank Saved Resumes Against a Job"):
+        target_job = st.text_area("Job description", key="rank_job_description", height=100)
+        if target_job.strip():
+            db = get_engine("db")
+            user_id = current_user_id()
+            ranked = db.rank_resumes(target_job, user_id=user_id)
+            if not ranked:
+                st.write("No saved resumes yet")
+            for resume_id, score in ranked:
+                st.write(f"• {db.get_resume(resume_id, user_id=user_id)['name']} — {score * 100:.1f}% match")
+
+@timed("show_resume_result")
+def show_resume_result(last_resume):
+    """Render the most recently generated resume and its ATS analysis"""
+    
+    resume = last_resume['content']
+    analysis = last_resume['analysis']
+    
+    st.markdown("### 📄 Your Generated Resume")
+    st.text_area("Resume Content", resume, height=500)
+    
+    st.markdown("### 📊 ATS Compatibility Score")
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("ATS Score", f"{analysis['score']}%")
+    with col2:
+        st.metric("Keywords Found", len(analysis['found_keywords']))
+    with col3:
+        st.metric("Word Count", analysis['word_count'])
+    with col4:
+        st.metric("Job Match", f"{analysis['job_match']}%" if 'job_match' in analysis else "—")
+    
+    for tip in analysis['feedback']:
+        st.info(f"💡 {tip}")
+    
+    # Download button
+    st.download_button(
+        "📥 Download Resume",
+        resume,
+        file_name=f"resume_{last_resume['name'].replace(' ', '_')}.txt"
+    )
+
+def get_portfolio():
+    """The current user's portfolio, backed by the user store"""
+    from portfolio import PortfolioBuilder
+    return PortfolioBuilder(user_data('portfolio', {}))
 
+@pages.page("💼 Portfolio", modules=("portfolio",))
+@timed("show_portfolio")
 def show_portfolio():
     st.markdown('<div class="section-header"><h2>💼 Portfolio Builder</h2></div>', unsafe_allow_html=True)
     
@@ -483,12 +406,14 @@ def show_portfolio():
                     st.error("❌ Please fill in all required fields (*)")
                 else:
                     tech_list = [tech.strip() for tech in technologies.split(',')]
-                    portfolio_builder.add_project(title, description, tech_list, github_url, live_url)
+                    get_portfolio().add_project(title, description, tech_list, github_url, live_url)
+                    save_user_data()
                     st.success(f"✅ Project '{title}' added successfully!")
     
     with tab2:
         st.subheader("Your Portfolio")
         
+        portfolio_builder = get_portfolio()
         stats = portfolio_builder.get_stats()
         col1, col2 = st.columns(2)
         
@@ -509,6 +434,8 @@ def show_portfolio():
         else:
             st.info("No projects added yet. Start by adding your first project!")
 
+@pages.page("📝 Cover Letters", modules=("smart_ai_engine", "cover_letter"))
+@timed("show_cover_letters")
 def show_cover_letters():
     st.markdown('<div class="section-header"><h2>📝 Cover Letter Generator</h2></div>', unsafe_allow_html=True)
     
@@ -552,18 +479,106 @@ def show_cover_letters():
                     'contact': applicant_contact
                 }
                 
-                cover_letter = cover_letter_generator.generate_cover_letter(job_data, applicant_info)
-                db.add_cover_letter(company_name, position, cover_letter)
-                
+                preview = st.empty()
+                with preview.container():
+                    cover_letter = st.write_stream(
+                        get_engine("cover_letter_generator").generate_cover_letter_stream(job_data, applicant_info)
+                    )
+                preview.empty()
+                get_engine("db").add_cover_letter(company_name, position, cover_letter, user_id=current_user_id())
+                save_user_data('last_cover_letter', {
+                    'company': company_name,
+                    'position': position,
+                    'content': cover_letter
+                })
                 st.success("✅ Cover Letter Generated Successfully!")
-                st.text_area("Generated Cover Letter", cover_letter, height=300)
+    
+    last_letter = user_data('last_cover_letter')
+    if last_letter:
+        st.text_area("Generated Cover Letter", last_letter['content'], height=300)
+        
+        st.download_button(
+            "📥 Download Cover Letter",
+            last_letter['content'],
+            file_name=f"cover_letter_{last_letter['company']}_{last_letter['position']}.txt"
+        )
+    
+    show_bulk_cover_letters()
+
+# Bulk ZIPs larger than this are spooled to a temporary file instead of memory
+BULK_ZIP_SPOOL_BYTES = 8 * 1024 * 1024
+
+@timed("show_bulk_cover_letters")
+def show_bulk_cover_letters():
+    st.subheader("📦 Bulk Generate")
+    st.caption("Upload a CSV or JSONL of job postings with `company`, `position` and optional "
+               "`hiring_manager` and `motivation` columns to get one letter per posting in a ZIP.")
+    
+    with st.form("bulk_cover_letter_form"):
+        uploaded = st.file_uploader("Job postings", type=["csv", "jsonl", "json"])
+        col1, col2 = st.columns(2)
+        with col1:
+            applicant_name = st.text_input("Your Name *", key="bulk_name")
+            applicant_skills = st.text_input("Your Skills *", key="bulk_skills")
+        with col2:
+            applicant_contact = st.text_input("Contact Info", key="bulk_contact")
+            applicant_experience = st.text_area("Relevant Experience *", height=80, key="bulk_experience")
+        submitted = st.form_submit_button("🚀 Generate All")
+        
+        if submitted:
+            if uploaded is None or not all([applicant_name, applicant_skills, applicant_experience]):
+                st.error("❌ Please upload a job list and fill in all required fields (*)")
+            else:
+                from cover_letter import iter_job_postings
                 
-                st.download_button(
-                    "📥 Download Cover Letter",
-                    cover_letter,
-                    file_name=f"cover_letter_{company_name}_{position}.txt"
-                )
+                skipped = []
+                try:
+                    jobs = list(iter_job_postings(uploaded.getvalue(), uploaded.name, skipped))
+                except ValueError as e:
+                    st.error(f"❌ Could not read {uploaded.name}: {e}")
+                    jobs = []
+                if skipped:
+                    st.warning(f"⚠️ Skipped {len(skipped)} unreadable records in {uploaded.name}:\n\n" + "\n".join(f"- {message}" for message in skipped[:20]))
+                applicant_info = {
+                    'name': applicant_name,
+                    'skills': applicant_skills,
+                    'experience': applicant_experience,
+                    'contact': applicant_contact
+                }
+                if jobs:
+                    progress_bar = st.progress(0.0, text=f"Generating {len(jobs)} letters...")
+                    step = max(1, len(jobs) // 100)
+                    
+                    def report(done):
+                        if done % step == 0 or done == len(jobs):
+                            progress_bar.progress(done / len(jobs), text=f"{done} / {len(jobs)} letters")
+                    
+                    previous = st.session_state.pop('bulk_letters', None)
+                    if previous:
+                        previous['file'].close()
+                    archive = tempfile.SpooledTemporaryFile(max_size=BULK_ZIP_SPOOL_BYTES)
+                    count = get_engine("cover_letter_generator").generate_bulk(jobs, applicant_info, archive, progress=report)
+                    st.session_state.bulk_letters = {'file': archive, 'count': count}
+                    st.success(f"✅ Generated {count} cover letters!")
+    
+    bulk = st.session_state.get('bulk_letters')
+    if bulk:
+        bulk['file'].seek(0)
+        st.download_button(
+            f"📥 Download {bulk['count']} Cover Letters (ZIP)",
+            bulk['file'],
+            file_name="cover_letters.zip",
+            mime="application/zip"
+        )
+
+# How many recently asked question ids a session remembers
+RECENT_QUESTION_LIMIT = 50
+MOCK_INTERVIEW_LENGTH = 3
+# Practice questions listed per page; text for the rest stays on disk
+PRACTICE_QUESTION_LIMIT = 25
 
+@pages.page("🎤 Interview Prep", modules=("interview_prep", "review_scheduler"))
+@timed("show_interview_prep")
 def show_interview_prep():
     st.markdown('<div class="section-header"><h2>🎤 Interview Preparation</h2></div>', unsafe_allow_html=True)
     
@@ -572,7 +587,14 @@ def show_interview_prep():
     with tab1:
         st.subheader("Common Interview Questions")
         
-        questions = interview_preparer.get_questions_by_category("behavioral")
+        interview_preparer = get_engine("interview_preparer")
+        query = st.text_input("🔍 Search questions", placeholder="python generators, SQL joins, weakness...", key="question_search")
+        if query.strip():
+            questions = interview_preparer.search_questions(query, k=PRACTICE_QUESTION_LIMIT)
+            if not questions:
+                st.info("No questions match your search.")
+        else:
+            questions = interview_preparer.get_questions_by_category("behavioral", limit=PRACTICE_QUESTION_LIMIT)
         
         for i, qa in enumerate(questions, 1):
             with st.expander(f"Question {i}: {qa['question']}"):
@@ -583,10 +605,31 @@ def show_interview_prep():
     with tab2:
         st.subheader("Mock Interview Session")
         
+        from review_scheduler import GRADES
+        scheduler = get_engine("review_scheduler")
+        due = scheduler.due_questions(current_user_id(), limit=MOCK_INTERVIEW_LENGTH)
+        if due:
+            st.caption(f"🔁 {len(due)} question(s) due for review will be asked first.")
+        
+        last_resume = user_data('last_resume')
+        resume_skills = last_resume.get('skills') if last_resume else None
+        target_skills = resume_skills and st.checkbox(
+            "🎯 Target the skills on my last resume", value=True, key="mock_target_skills"
+        )
+        
         if st.button("🎬 Start Mock Interview"):
-            questions = interview_preparer.conduct_mock_interview(["behavioral"], 3)
+            # Due reviews first; down-weight questions this session has already seen
+            recent = st.session_state.setdefault('recent_questions', [])
+            categories = ["behavioral", "technical"] if target_skills else ["behavioral"]
+            questions = get_engine("interview_preparer").conduct_mock_interview(
+                categories, MOCK_INTERVIEW_LENGTH, recent=set(recent), due=due,
+                skills=resume_skills if target_skills else None
+            )
+            recent.extend(qa['id'] for qa in questions)
+            del recent[:-RECENT_QUESTION_LIMIT]
             st.session_state.mock_questions = questions
             st.session_state.current_question = 0
+            st.session_state.answer_revealed = False
         
         if 'mock_questions' in st.session_state:
             questions = st.session_state.mock_questions
@@ -598,17 +641,26 @@ def show_interview_prep():
                 st.write(f"**{qa['question']}**")
                 
                 if st.button("👀 Reveal Answer"):
+                    st.session_state.answer_revealed = True
+                
+                if st.session_state.get('answer_revealed'):
                     st.success(f"**Answer:** {qa['answer']}")
                     if qa.get('tips'):
                         st.info(f"**💡 Tips:** {' • '.join(qa['tips'])}")
                     
-                    if st.button("➡️ Next Question") and current < len(questions) - 1:
-                        st.session_state.current_question += 1
-                        st.rerun()
+                    st.write("How well did you recall it?")
+                    for col, (label, grade) in zip(st.columns(len(GRADES)), GRADES.items()):
+                        if col.button(label, key=f"grade_{label}"):
+                            scheduler.record(qa['id'], grade, user_id=current_user_id())
+                            st.session_state.current_question += 1
+                            st.session_state.answer_revealed = False
+                            st.rerun()
             else:
                 st.balloons()
                 st.success("🎉 Congratulations! You've completed the mock interview!")
 
+@pages.page("📋 Job Tracker")
+@timed("show_job_tracker")
 def show_job_tracker():
     st.markdown('<div class="section-header"><h2>📋 Job Application Tracker</h2></div>', unsafe_allow_html=True)
     
@@ -620,7 +672,7 @@ def show_job_tracker():
         with st.form("application_form"):
             company = st.text_input("Company Name *", placeholder="Microsoft")
             position = st.text_input("Position *", placeholder="Software Engineer")
-            status = st.selectbox("Status *", ["Applied", "Phone Screen", "Technical Interview", "Onsite", "Offer", "Rejected"])
+            status = st.selectbox("Status *", APPLICATION_STATUSES)
             notes = st.text_area("Notes", placeholder="Contact person, key requirements, follow-up dates...")
             
             submitted = st.form_submit_button("💾 Save Application")
@@ -629,32 +681,93 @@ def show_job_tracker():
                 if not all([company, position]):
                     st.error("❌ Please fill in Company and Position")
                 else:
-                    db.add_application(company, position, status, notes)
+                    get_engine("db").add_application(company, position, status, notes, user_id=current_user_id())
                     st.success(f"✅ Application to {company} saved!")
     
     with col2:
         st.subheader("Application History")
-        
-        applications = db.get_applications()
-        
-        if applications:
-            for app in applications:
-                status_emoji = {
-                    "Applied": "📝",
-                    "Phone Screen": "📞",
-                    "Technical Interview": "💻",
-                    "Onsite": "🏢",
-                    "Offer": "🎉",
-                    "Rejected": "❌"
-                }.get(app['status'], '📌')
-                
-                st.write(f"{status_emoji} **{app['company']}** - {app['position']}")
-                st.write(f"Status: {app['status']} | Date: {app.get('date_applied', 'N/A')[:10]}")
-                if app.get('notes'):
-                    st.write(f"Notes: {app['notes']}")
-                st.write("---")
+        show_application_history()
+
+STATUS_EMOJI = {
+    "Applied": "📝",
+    "Phone Screen": "📞",
+    "Technical Interview": "💻",
+    "Onsite": "🏢",
+    "Offer": "🎉",
+    "Rejected": "❌"
+}
+
+TRACKER_PERIODS = {"Any time": None, "Last 7 days": 7, "Last 30 days": 30, "Last 90 days": 90}
+
+@timed("show_application_history")
+def show_application_history():
+    """Render one page of the application history as a single table"""
+    
+    filter_col1, filter_col2, filter_col3 = st.columns(3)
+    with filter_col1:
+        status_filter = st.selectbox("Status", ["All"] + APPLICATION_STATUSES, key="tracker_status")
+    with filter_col2:
+        company_filter = st.text_input("Company starts with", key="tracker_company")
+    with filter_col3:
+        period = st.selectbox("Applied", list(TRACKER_PERIODS), key="tracker_period")
+    
+    sort_col, size_col = st.columns(2)
+    with sort_col:
+        order = st.selectbox("Sort by", list(APPLICATION_ORDERS), key="tracker_order")
+    with size_col:
+        page_size = st.selectbox("Rows per page", [25, 50, 100], key="tracker_page_size")
+    
+    days = TRACKER_PERIODS[period]
+    filters = {
+        'status': None if status_filter == "All" else status_filter,
+        'company': company_filter.strip() or None,
+        'date_from': (datetime.now() - timedelta(days=days)).date().isoformat() if days else None
+    }
+    
+    # Reset to the first page whenever the filters or ordering change
+    signature = (tuple(filters.items()), order, page_size)
+    if st.session_state.get('tracker_signature') != signature:
+        st.session_state.tracker_signature = signature
+        st.session_state.tracker_cursors = [None]
+    cursors = st.session_state.tracker_cursors
+    
+    db = get_engine("db")
+    user_id = current_user_id()
+    total = db.count_applications(user_id, **filters)
+    if not total:
+        if any(filters.values()) and db.count_applications(user_id):
+            st.info("No applications match these filters.")
         else:
             st.info("No applications tracked yet. Start by adding your first application!")
+        return
+    
+    rows, next_cursor = db.query_applications(user_id, order=order, limit=page_size, after=cursors[-1], **filters)
+    st.dataframe(
+        [
+            {
+                "Status": f"{STATUS_EMOJI.get(app['status'], '📌')} {app['status']}",
+                "Company": app['company'],
+                "Position": app['position'],
+                "Date": app['date_applied'][:10],
+                "Notes": app['notes']
+            }
+            for app in rows
+        ],
+        hide_index=True
+    )
+    
+    page = len(cursors)
+    prev_col, info_col, next_col = st.columns([1, 2, 1])
+    with prev_col:
+        if st.button("⬅️ Previous", disabled=page == 1, key="tracker_prev"):
+            cursors.pop()
+            st.rerun()
+    with info_col:
+        st.caption(f"Page {page} of {-(-total // page_size)} · {total} application(s)")
+    with next_col:
+        if st.button("Next ➡️", disabled=next_cursor is None, key="tracker_next"):
+            cursors.append(next_cursor)
+            st.rerun()
 
 # THIS LINE IS CRITICAL - Make sure it's at the end
 if __name__ == "__main__":
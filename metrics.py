@@ -0,0 +1,346 @@
+"""Latency histograms, call counters and cache hit rates for the hot paths
+
+Instrument a function with ``@timed("name")`` or a block with
+``with timer("name"):``. Both record into the ``call_seconds`` histogram
+labelled with the name, and count exceptions in ``call_errors_total``.
+Caches registered with ``register_cache`` are read only at export time.
+
+Metrics are off unless CAREER_SUITE_METRICS=1. When off, ``timed`` returns
+the function itself and ``timer`` a shared no-op context, so instrumented
+code runs exactly as before. When on, a snapshot can be served on localhost
+(CAREER_SUITE_METRICS_PORT: /metrics for Prometheus, /metrics.json) and/or
+written to CAREER_SUITE_METRICS_FILE; see ``start_exporter``.
+"""
+
+import atexit
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+import warnings
+from bisect import bisect_left
+from collections import deque
+from contextlib import nullcontext
+
+import config
+
+ENABLED = config.METRICS_ENABLED
+PREFIX = "career_suite_"
+
+# Upper bounds in seconds, from a fast cache hit to a slow model call
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+# Samples buffered per histogram before they are sorted into buckets
+FLUSH_SIZE = 1024
+
+HELP = {
+    "call_seconds": "Latency of instrumented calls",
+    "call_errors_total": "Instrumented calls that raised",
+    "ai_first_token_seconds": "Time from a stream request to its first piece of text (task=resume: the whole document)"
+}
+
+
+class Histogram:
+    """Bucketed latency counts
+
+    Observing only appends to a deque (atomic, no lock); samples are sorted
+    into buckets in bulk once FLUSH_SIZE are pending or when read.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._pending = deque()
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        pending = self._pending
+        pending.append(value)
+        if len(pending) >= FLUSH_SIZE:
+            self.flush()
+
+    def flush(self):
+        pending, counts, buckets = self._pending, self.counts, self.buckets
+        with self._lock:
+            while pending:
+                value = pending.popleft()
+                counts[bisect_left(buckets, value)] += 1
+                self.count += 1
+                self.sum += value
+
+    def totals(self):
+        """(per-bucket counts, count, sum) including pending samples"""
+        self.flush()
+        with self._lock:
+            return list(self.counts), self.count, self.sum
+
+    def quantile(self, q):
+        """Estimate of the q-quantile, interpolated within its bucket"""
+        counts, count, _ = self.totals()
+        if not count:
+            return 0.0
+        rank = q * count
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[index - 1] if index else 0.0
+                if index == len(self.buckets):
+                    return lower
+                return lower + (self.buckets[index] - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+    def snapshot(self):
+        counts, count, total = self.totals()
+        return {
+            "count": count,
+            "sum": total,
+            "mean": total / count if count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip([*map(str, self.buckets), "+Inf"], counts))
+        }
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+
+class MetricsRegistry:
+    """Named, labelled histograms and counters plus caches polled on export"""
+
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+        self.caches = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(metric, labels):
+        return metric, tuple(sorted(labels.items()))
+
+    def histogram(self, metric, **labels):
+        key = self._key(metric, labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(key, Histogram())
+        return histogram
+
+    def counter(self, metric, **labels):
+        key = self._key(metric, labels)
+        counter = self.counters.get(key)
+        if counter is None:
+            with self._lock:
+                counter = self.counters.setdefault(key, Counter())
+        return counter
+
+    def register_cache(self, name, cache):
+        """Report ``cache.stats()`` (hits, misses, evictions, size, hit_rate) on export"""
+        self.caches[name] = cache
+
+    def to_json(self):
+        calls = {}
+        for (metric, labels), histogram in list(self.histograms.items()):
+            name = ",".join(value for _, value in labels) or metric
+            calls.setdefault(metric, {})[name] = histogram.snapshot()
+        counters = {}
+        for (metric, labels), counter in list(self.counters.items()):
+            name = ",".join(value for _, value in labels) or metric
+            counters.setdefault(metric, {})[name] = counter.value
+        return {
+            "timestamp": time.time(),
+            "histograms": calls,
+            "counters": counters,
+            "caches": {name: cache.stats() for name, cache in list(self.caches.items())}
+        }
+
+    def to_prometheus(self):
+        lines = []
+        typed = set()
+
+        def header(metric, kind):
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# HELP {PREFIX}{metric} {HELP.get(metric, metric.replace('_', ' '))}")
+                lines.append(f"# TYPE {PREFIX}{metric} {kind}")
+
+        for (metric, labels), histogram in sorted(self.histograms.items()):
+            header(metric, "histogram")
+            counts, count, total = histogram.totals()
+            cumulative = 0
+            for bound, bucket_count in zip([*map(repr, histogram.buckets), "+Inf"], counts):
+                cumulative += bucket_count
+                lines.append(f"{PREFIX}{metric}_bucket{format_labels(labels, le=bound)} {cumulative}")
+            lines.append(f"{PREFIX}{metric}_sum{format_labels(labels)} {total!r}")
+            lines.append(f"{PREFIX}{metric}_count{format_labels(labels)} {count}")
+        for (metric, labels), counter in sorted(self.counters.items()):
+            header(metric, "counter")
+            lines.append(f"{PREFIX}{metric}{format_labels(labels)} {counter.value}")
+        cache_stats = {name: cache.stats() for name, cache in sorted(self.caches.items())}
+        for field, kind in (("hits", "counter"), ("misses", "counter"), ("evictions", "counter"),
+                            ("size", "gauge"), ("hit_rate", "gauge")):
+            metric = f"cache_{field}_total" if kind == "counter" else f"cache_{field}"
+            for name, stats in cache_stats.items():
+                header(metric, kind)
+                lines.append(f"{PREFIX}{metric}{format_labels((('cache', name),))} {stats.get(field, 0)}")
+        return "\n".join(lines) + "\n"
+
+
+def format_labels(labels, **extra):
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+# Global instance
+registry = MetricsRegistry()
+
+
+def timed(name):
+    """Decorator recording a function's latency and errors under ``name``"""
+    def decorate(func):
+        if not ENABLED:
+            return func
+        histogram = registry.histogram("call_seconds", function=name)
+        errors = registry.counter("call_errors_total", function=name)
+        # Histogram.observe inlined: this wrapper sits on microsecond-scale DB calls
+        pending = histogram._pending
+        clock = time.perf_counter
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                pending.append(clock() - start)
+                if len(pending) >= FLUSH_SIZE:
+                    histogram.flush()
+        return wrapper
+    return decorate
+
+
+class _Timer:
+    __slots__ = ("histogram", "errors", "start")
+
+    def __init__(self, name):
+        self.histogram = registry.histogram("call_seconds", function=name)
+        self.errors = registry.counter("call_errors_total", function=name)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.start)
+        if exc_type is not None and issubclass(exc_type, Exception):
+            self.errors.inc()
+
+
+_NO_TIMER = nullcontext()
+
+
+def timer(name):
+    """Context manager form of ``timed`` for a block inside a function"""
+    return _Timer(name) if ENABLED else _NO_TIMER
+
+
+def observe(metric, value, **labels):
+    if ENABLED:
+        registry.histogram(metric, **labels).observe(value)
+
+
+def register_cache(name, cache):
+    if ENABLED:
+        registry.register_cache(name, cache)
+
+
+# Export
+
+def write_snapshot(path):
+    """Write the current metrics to ``path`` atomically: JSON for .json, else Prometheus text"""
+    body = json.dumps(registry.to_json(), indent=2) if path.endswith(".json") else registry.to_prometheus()
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+    with os.fdopen(fd, "w") as f:
+        f.write(body)
+    os.replace(temp_path, path)
+
+
+def serve(port):
+    """Serve /metrics and /metrics.json on localhost from a daemon thread"""
+    # Imported here: http.server costs more at startup than the rest of this module
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body, content_type = registry.to_prometheus(), "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                body, content_type = json.dumps(registry.to_json()), "application/json"
+            else:
+                self.send_error(404)
+                return
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+_exporter_lock = threading.Lock()
+_exporter_started = False
+
+
+def start_exporter(port=config.METRICS_PORT, path=config.METRICS_FILE, interval=config.METRICS_EXPORT_SECONDS):
+    """Start the localhost endpoint and/or periodic file export, once per process
+
+    Safe to call on every Streamlit rerun; does nothing while metrics are off.
+    """
+    global _exporter_started
+    if not ENABLED:
+        return
+    with _exporter_lock:
+        if _exporter_started:
+            return
+        _exporter_started = True
+    if port:
+        try:
+            serve(port)
+        except OSError as e:
+            warnings.warn(f"Metrics endpoint not started on port {port}: {e}")
+    if path:
+        def export():
+            while True:
+                time.sleep(interval)
+                write_snapshot(path)
+
+        threading.Thread(target=export, name="metrics-file", daemon=True).start()
+        atexit.register(write_snapshot, path)
@@ -0,0 +1,161 @@
+"""Lazy page dispatch and startup-time profiling for main_app
+
+Pages declare the engine modules they need. Those modules are imported the
+first time the page is selected rather than when the app starts, so a cold
+container only pays for the dashboard.
+
+    python page_registry.py --check-budget     # exit 1 if cold start is over budget
+    python page_registry.py --profile          # -X importtime report for every page
+"""
+
+import argparse
+import importlib
+import os
+import subprocess
+import sys
+import time
+
+import config
+
+# Process-wide first-import cost of each engine module, in seconds
+module_load_times = {}
+
+
+class Page:
+    def __init__(self, label, render, modules=()):
+        self.label = label
+        self.render = render
+        self.modules = tuple(modules)
+
+
+class PageRegistry:
+    """Ordered set of pages; rendering a page first imports the modules it declares"""
+
+    def __init__(self):
+        self.pages = {}
+
+    def page(self, label, modules=()):
+        """Decorator registering a page render function"""
+        def register(render):
+            self.pages[label] = Page(label, render, modules)
+            return render
+        return register
+
+    def labels(self):
+        return list(self.pages)
+
+    def all_modules(self):
+        modules = []
+        for page in self.pages.values():
+            modules.extend(m for m in page.modules if m not in modules)
+        return modules
+
+    def render(self, label):
+        page = self.pages[label]
+        load_modules(page.modules)
+        page.render()
+
+
+def load_modules(modules):
+    """Import modules that are not loaded yet, recording how long each took"""
+    for name in modules:
+        if name in sys.modules:
+            continue
+        start = time.perf_counter()
+        importlib.import_module(name)
+        module_load_times[name] = time.perf_counter() - start
+
+
+def profile_imports(modules, cwd=config.BASE_DIR):
+    """Run ``python -X importtime`` for the given modules in a fresh interpreter
+
+    Returns rows of {'module', 'self_ms', 'cumulative_ms', 'depth'} in import
+    order, as reported by the interpreter.
+    """
+    code = "; ".join(f"import {name}" for name in modules) or "pass"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd, capture_output=True, text=True, timeout=120
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append({
+            "module": name.strip(),
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+            "depth": (len(name) - len(name.lstrip())) // 2
+        })
+    return rows
+
+
+def top_level_imports(rows, limit=25):
+    """The costliest top-level imports from a ``profile_imports`` report"""
+    top = [row for row in rows if row["depth"] <= 1]
+    return sorted(top, key=lambda row: row["cumulative_ms"], reverse=True)[:limit]
+
+
+COLD_START_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=120).run()
+elapsed = time.perf_counter() - start
+if at.exception:
+    raise SystemExit(at.exception[0].message)
+print(elapsed)
+print(",".join(sorted(name for name in sys.modules if "." not in name)))
+"""
+
+
+def measure_cold_start(app_path=os.path.join(config.BASE_DIR, "main_app.py")):
+    """Seconds from interpreter start to the first full run of the app, and the modules it loaded"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", COLD_START_SCRIPT.format(app=app_path)],
+        cwd=config.BASE_DIR, capture_output=True, text=True, timeout=300
+    )
+    total = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"App failed to start:\n{result.stderr[-2000:]}")
+    lines = result.stdout.strip().splitlines()
+    return {
+        "total_seconds": total,
+        "first_run_seconds": float(lines[-2]),
+        "modules": lines[-1].split(",")
+    }
+
+
+def check_startup_budget(budget=config.STARTUP_BUDGET_SECONDS, deferred=config.DEFERRED_MODULES):
+    """Return (ok, report) for the cold start against the configured budget"""
+    measurement = measure_cold_start()
+    eager = [name for name in deferred if name in measurement["modules"]]
+    ok = measurement["total_seconds"] <= budget and not eager
+    report = [f"Cold start: {measurement['total_seconds']:.2f}s (budget {budget:.2f}s)"]
+    if eager:
+        report.append(f"Modules that should load lazily were imported at startup: {', '.join(eager)}")
+    return ok, "\n".join(report)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Startup-time tools for main_app")
+    parser.add_argument("--check-budget", action="store_true", help="fail if cold start exceeds the budget")
+    parser.add_argument("--profile", action="store_true", help="print an import-time report")
+    parser.add_argument("--budget", type=float, default=config.STARTUP_BUDGET_SECONDS)
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        rows = profile_imports(["main_app"] + list(config.DEFERRED_MODULES))
+        for row in top_level_imports(rows):
+            print(f"{row['cumulative_ms']:>10.1f} ms  {row['module']}")
+    if args.check_budget or not args.profile:
+        ok, report = check_startup_budget(args.budget)
+        print(report)
+        if not ok:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
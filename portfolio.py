@@ -0,0 +1,42 @@
+from datetime import datetime
+
+class PortfolioBuilder:
+    def __init__(self, data=None):
+        """Wrap a user's portfolio data; the dict is updated in place so it can be persisted"""
+        self.data = data if data is not None else {}
+        self.projects = self.data.setdefault("projects", [])
+        self.skills = self.data.setdefault("skills", {
+            "programming_languages": [],
+            "frameworks": [],
+            "tools": [],
+            "databases": []
+        })
+    
+    def add_project(self, title, description, technologies, github_url="", live_url=""):
+        project = {
+            "title": title,
+            "description": description,
+            "technologies": technologies,
+            "github_url": github_url,
+            "live_url": live_url,
+            "date_created": datetime.now().strftime("%Y-%m-%d")
+        }
+        self.projects.append(project)
+        return project
+    
+    def add_skill(self, skill_name, category, proficiency=5):
+        if category not in self.skills:
+            self.skills[category] = []
+        skill = {
+            "name": skill_name,
+            "category": category,
+            "proficiency": proficiency
+        }
+        self.skills[category].append(skill)
+        return skill
+    
+    def get_stats(self):
+        return {
+            "total_projects": len(self.projects),
+            "total_skills": sum(len(skills) for skills in self.skills.values())
+        }
@@ -0,0 +1,243 @@
+"""On-disk interview question bank
+
+Questions live in a SQLite file that is memory-mapped for reads. Only the
+id and the small metadata columns (category, subcategory, level) are loaded into
+process memory as packed arrays; question text, answers and tips are fetched
+by id on demand through a small LRU cache.
+
+The bank is built from ``data/interview_questions.json`` the first time it
+is opened, and its seed rows are refreshed whenever that seed file is newer
+than the database; seed questions are matched by category and text, so they
+keep their ids. Larger banks can be loaded with
+``python question_bank.py import FILE.json``; imported rows are kept when
+the seed is refreshed.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from array import array
+from contextlib import closing
+
+import config
+from cache import LRUCache
+from columns import StringTable
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    category TEXT NOT NULL,
+    subcategory TEXT,
+    level TEXT,
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL DEFAULT '',
+    tips TEXT NOT NULL DEFAULT '[]',
+    source TEXT NOT NULL DEFAULT 'import'
+);
+CREATE INDEX IF NOT EXISTS idx_questions_category ON questions (category, subcategory);
+"""
+
+# "source" tells seed rows, which a seed refresh may rewrite, from imported ones
+SEED = "seed"
+IMPORT = "import"
+
+INSERT_QUESTION = (
+    "INSERT INTO questions (category, subcategory, level, question, answer, tips, source) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+UPDATE_QUESTION = (
+    "UPDATE questions SET category = ?, subcategory = ?, level = ?, question = ?, answer = ?, tips = ?, "
+    "source = ? WHERE id = ?"
+)
+DELETE_QUESTION = "DELETE FROM questions WHERE id = ?"
+SELECT_SEED_KEYS = "SELECT id, category, question FROM questions WHERE source = 'seed' ORDER BY id"
+ADD_SOURCE_COLUMN = "ALTER TABLE questions ADD COLUMN source TEXT NOT NULL DEFAULT 'import'"
+MARK_SEED_QUESTION = "UPDATE questions SET source = 'seed' WHERE question = ?"
+SELECT_METADATA = "SELECT id, category, subcategory, level FROM questions ORDER BY id"
+SELECT_METADATA_AFTER = "SELECT id, category, subcategory, level FROM questions WHERE id > ? ORDER BY id"
+SELECT_QUESTION = "SELECT id, category, subcategory, level, question, answer, tips FROM questions WHERE id = ?"
+SELECT_TEXT = "SELECT id, category, subcategory, level, question, answer, tips FROM questions ORDER BY id"
+
+MMAP_SIZE = 256 * 1024 * 1024
+
+
+def _row_to_question(row):
+    question_id, group, subcategory, level, question, answer, tips = row
+    # "category" holds the difficulty label, as in the original in-memory bank
+    return {
+        "id": question_id,
+        "group": group,
+        "subcategory": subcategory,
+        "category": level,
+        "question": question,
+        "answer": answer,
+        "tips": json.loads(tips)
+    }
+
+
+class QuestionBank:
+    """Memory-mapped question store with metadata held as packed arrays"""
+
+    def __init__(self, path=config.QUESTION_BANK_PATH, seed_path=config.QUESTION_SEED_PATH, cache_size=512):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self.cache = LRUCache(maxsize=cache_size)
+        if seed_path and self._needs_rebuild(seed_path):
+            self.rebuild(seed_path)
+        else:
+            with self._write_lock, closing(self._write_connection()) as conn, conn:
+                self._create_schema(conn, seed_path)
+
+        # Resident metadata: one entry per question, a few bytes each
+        self.ids = array("I")
+        self.categories = array("B")
+        self.subcategories = array("H")
+        self.levels = array("B")
+        self.category_names = StringTable()
+        self.subcategory_names = StringTable()
+        self.level_names = StringTable()
+        self._load_metadata(SELECT_METADATA, ())
+
+    def _needs_rebuild(self, seed_path):
+        if not os.path.exists(seed_path):
+            return False
+        return not os.path.exists(self.path) or os.path.getmtime(seed_path) > os.path.getmtime(self.path)
+
+    def _write_connection(self):
+        """A new connection for writes; callers close it"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _read_connection(self):
+        """Per-thread connection with the database file memory-mapped"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+            conn.execute("PRAGMA query_only=ON")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _read_seed(seed_path):
+        with open(seed_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _create_schema(self, conn, seed_path=None):
+        conn.executescript(SCHEMA)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(questions)")}
+        if "source" not in columns:
+            # Banks from before imports were told apart: rows whose text is in the seed are seed rows
+            conn.execute(ADD_SOURCE_COLUMN)
+            if seed_path and os.path.exists(seed_path):
+                conn.executemany(MARK_SEED_QUESTION, ((q["question"],) for q in self._read_seed(seed_path)))
+
+    def rebuild(self, seed_path):
+        """Replace the seed rows with the questions in a JSON seed file
+
+        Seed rows are matched to seed questions by (category, question text),
+        wherever they sit in the file. A matched row is updated in place, so it
+        keeps its id and the review history keyed by it; new questions get new
+        ids, and only rows whose question left the seed are deleted. A
+        reworded question counts as a new one. Imported questions are left alone.
+        """
+        questions = self._read_seed(seed_path)
+        rows = [self._question_row(q, SEED) for q in questions]
+        with self._write_lock, closing(self._write_connection()) as conn, conn:
+            self._create_schema(conn, seed_path)
+            existing = {}
+            for question_id, category, question in conn.execute(SELECT_SEED_KEYS):
+                existing.setdefault((category, question), []).append(question_id)
+            updates = []
+            inserts = []
+            for row in rows:
+                matches = existing.get((row[0], row[3]))
+                if matches:
+                    updates.append(row + (matches.pop(0),))
+                else:
+                    inserts.append(row)
+            conn.executemany(DELETE_QUESTION, ((question_id,) for ids in existing.values() for question_id in ids))
+            conn.executemany(UPDATE_QUESTION, updates)
+            conn.executemany(INSERT_QUESTION, inserts)
+        self.cache.clear()
+
+    @staticmethod
+    def _question_row(question, source=IMPORT):
+        return (
+            question["category"],
+            question.get("subcategory"),
+            question.get("level"),
+            question["question"],
+            question.get("answer", ""),
+            json.dumps(question.get("tips", [])),
+            source
+        )
+
+    def _load_metadata(self, sql, params):
+        first_new = len(self.ids)
+        for question_id, category, subcategory, level in self._read_connection().execute(sql, params):
+            self.ids.append(question_id)
+            self.categories.append(self.category_names.code(category))
+            self.subcategories.append(self.subcategory_names.code(subcategory))
+            self.levels.append(self.level_names.code(level))
+        return range(first_new, len(self.ids))
+
+    def add_questions(self, questions):
+        """Append questions; returns the positions of the new rows in the metadata arrays"""
+        last_id = self.ids[-1] if self.ids else 0
+        with self._write_lock, closing(self._write_connection()) as conn, conn:
+            conn.executemany(INSERT_QUESTION, (self._question_row(q) for q in questions))
+        return self._load_metadata(SELECT_METADATA_AFTER, (last_id,))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def metadata(self, position):
+        """(id, category, subcategory, level) for the question at a metadata position"""
+        return (
+            self.ids[position],
+            self.category_names[self.categories[position]],
+            self.subcategory_names[self.subcategories[position]],
+            self.level_names[self.levels[position]]
+        )
+
+    def get(self, question_id):
+        """Full question dict, read from disk on a cache miss"""
+        question = self.cache.get(question_id)
+        if question is None:
+            row = self._read_connection().execute(SELECT_QUESTION, (question_id,)).fetchone()
+            if row is None:
+                return None
+            question = _row_to_question(row)
+            self.cache.put(question_id, question)
+        return question
+
+    def iter_questions(self):
+        """Stream every question from disk without caching it"""
+        for row in self._read_connection().execute(SELECT_TEXT):
+            yield _row_to_question(row)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the interview question bank")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    import_parser = subcommands.add_parser("import", help="append questions from a JSON list")
+    import_parser.add_argument("source")
+    subcommands.add_parser("stats", help="print bank size")
+    args = parser.parse_args(argv)
+
+    bank = QuestionBank()
+    if args.command == "import":
+        with open(args.source, encoding="utf-8") as f:
+            added = bank.add_questions(json.load(f))
+        print(f"Imported {len(added)} questions")
+    print(f"{len(bank)} questions in {bank.path}")
+
+
+if __name__ == "__main__":
+    main()
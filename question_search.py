@@ -0,0 +1,147 @@
+import heapq
+import threading
+from array import array
+from bisect import bisect_left, insort
+
+import numpy as np
+
+from keyword_matcher import STOP_WORDS, tokenize
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# The last query word is treated as a prefix and expanded to at most this many terms
+PREFIX_EXPANSIONS = 32
+MIN_PREFIX_LENGTH = 2
+
+
+def question_text(question):
+    """All searchable text of a question: wording, answer, tips and its categories"""
+    parts = [question.get("question", ""), question.get("answer", "")]
+    parts.extend(question.get("tips") or [])
+    parts.extend(value for value in (question.get("group"), question.get("subcategory"), question.get("category")) if value)
+    return " ".join(parts)
+
+
+class QuestionSearchIndex:
+    """BM25 inverted index over the question bank, keyed by bank position
+
+    Each term maps to a pair of parallel arrays: the positions of the
+    questions containing it and the term's frequency in each. Scoring a query
+    reads those arrays as numpy views and accumulates BM25 contributions with
+    ``bincount``, so query time grows with posting lengths rather than with
+    the number of distinct questions touched in Python.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        self.frequencies = {}
+        self.lengths = array("I")
+        self.total_length = 0
+        self.vocabulary = []
+        self._norms = None
+        # numpy views pin the arrays' buffers, so appends must not overlap a search
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_bank(cls, bank):
+        index = cls()
+        for position, question in enumerate(bank.iter_questions()):
+            index.add_document(position, question_text(question))
+        return index
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def add_document(self, position, text):
+        """Index one question; positions must be added in increasing order"""
+        counts = {}
+        for token in tokenize(text):
+            if token not in STOP_WORDS:
+                counts[token] = counts.get(token, 0) + 1
+        with self._lock:
+            self._append(position, counts)
+
+    def _append(self, position, counts):
+        if position != len(self.lengths):
+            raise ValueError(f"expected position {len(self.lengths)}, got {position}")
+        length = sum(counts.values())
+        self._norms = None
+        self.lengths.append(length)
+        self.total_length += length
+        for term, count in counts.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                self.postings[term] = array("I", (position,))
+                self.frequencies[term] = array("I", (count,))
+                insort(self.vocabulary, term)
+            else:
+                posting.append(position)
+                self.frequencies[term].append(count)
+
+    def expand_prefix(self, prefix, limit=PREFIX_EXPANSIONS):
+        """Indexed terms starting with ``prefix``, most common first"""
+        vocabulary = self.vocabulary
+        matches = []
+        for i in range(bisect_left(vocabulary, prefix), len(vocabulary)):
+            term = vocabulary[i]
+            if not term.startswith(prefix):
+                break
+            matches.append(term)
+        if len(matches) > limit:
+            matches = heapq.nlargest(limit, matches, key=lambda term: len(self.postings[term]))
+        return matches
+
+    def query_terms(self, query, prefix=True):
+        """Query terms with the final word expanded as a prefix (search-as-you-type)"""
+        tokens = [token for token in tokenize(query) if token not in STOP_WORDS]
+        if not tokens:
+            return []
+        terms = [token for token in tokens[:-1] if token in self.postings]
+        last = tokens[-1]
+        ends_mid_word = prefix and query and not query[-1].isspace()
+        if ends_mid_word and len(last) >= MIN_PREFIX_LENGTH:
+            terms.extend(term for term in self.expand_prefix(last) if term not in terms)
+        elif last in self.postings:
+            terms.append(last)
+        return terms
+
+    def search(self, query, k=10, prefix=True):
+        """Top-k (position, score) pairs for a free-text query"""
+        terms = self.query_terms(query, prefix)
+        if not terms:
+            return []
+        with self._lock:
+            return self._score(terms, k)
+
+    def _length_norms(self):
+        """BM25 length normalization per question, recomputed after adds"""
+        if self._norms is None:
+            lengths = np.frombuffer(self.lengths, dtype=np.uint32)
+            average_length = self.total_length / len(lengths) or 1.0
+            self._norms = K1 * (1.0 - B + B * lengths / average_length)
+        return self._norms
+
+    def _score(self, terms, k):
+        total = len(self.lengths)
+        if not total:
+            return []
+        norms = self._length_norms()
+        all_positions = []
+        all_weights = []
+        for term in terms:
+            positions = np.frombuffer(self.postings[term], dtype=np.uint32)
+            tf = np.frombuffer(self.frequencies[term], dtype=np.uint32).astype(np.float64)
+            df = len(positions)
+            idf = np.log(1.0 + (total - df + 0.5) / (df + 0.5))
+            weights = tf * (idf * (K1 + 1.0))
+            weights /= tf + norms[positions]
+            all_positions.append(positions)
+            all_weights.append(weights)
+        scores = np.bincount(np.concatenate(all_positions), weights=np.concatenate(all_weights), minlength=total)
+
+        matched = np.flatnonzero(scores)
+        if len(matched) > k:
+            matched = matched[np.argpartition(scores[matched], -k)[-k:]]
+        order = matched[np.argsort(-scores[matched], kind="stable")]
+        return [(int(position), float(scores[position])) for position in order]
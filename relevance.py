@@ -0,0 +1,191 @@
+import json
+import math
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+from keyword_matcher import STOP_WORDS, tokenize
+
+
+def term_counts(text):
+    """Count the content terms in a piece of text"""
+    return Counter(token for token in tokenize(text) if token not in STOP_WORDS)
+
+
+class IDFTable:
+    """Document frequencies for a corpus, used to weight terms by rarity"""
+
+    def __init__(self, doc_freq=None, num_docs=0):
+        self.doc_freq = dict(doc_freq or {})
+        self.num_docs = num_docs
+        self._idf_cache = {}
+
+    @classmethod
+    def from_corpus(cls, texts):
+        """Build an IDF table from an iterable of documents"""
+        table = cls()
+        for text in texts:
+            table.add_document(text)
+        return table
+
+    @classmethod
+    def load(cls, path):
+        """Load a precomputed IDF table saved with ``save``"""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["doc_freq"], data["num_docs"])
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"num_docs": self.num_docs, "doc_freq": self.doc_freq}, f)
+
+    def add_document(self, text=None, counts=None):
+        if counts is None:
+            counts = term_counts(text)
+        self.num_docs += 1
+        self._idf_cache = {}
+        doc_freq = self.doc_freq
+        for term in counts:
+            doc_freq[term] = doc_freq.get(term, 0) + 1
+
+    def idf(self, term):
+        """Smoothed inverse document frequency; unseen terms get the maximum weight"""
+        value = self._idf_cache.get(term)
+        if value is None:
+            value = math.log((1 + self.num_docs) / (1 + self.doc_freq.get(term, 0))) + 1.0
+            self._idf_cache[term] = value
+        return value
+
+
+def tfidf_vector(text, idf_table, counts=None):
+    """Return an L2-normalized {term: weight} vector with sublinear term frequency"""
+    if counts is None:
+        counts = term_counts(text)
+    idf = idf_table.idf
+    vector = {term: (1.0 + math.log(count)) * idf(term) for term, count in counts.items()}
+    norm = math.sqrt(sum(w * w for w in vector.values()))
+    if norm:
+        for term in vector:
+            vector[term] /= norm
+    return vector
+
+
+def cosine_similarity(vector_a, vector_b):
+    """Cosine similarity of two normalized sparse vectors"""
+    if len(vector_a) > len(vector_b):
+        vector_a, vector_b = vector_b, vector_a
+    return sum(weight * vector_b.get(term, 0.0) for term, weight in vector_a.items())
+
+
+class RelevanceEngine:
+    """Rank stored resumes against job descriptions by TF-IDF cosine similarity
+
+    Resumes are held as rows of a sparse CSR matrix with unit-length rows, so
+    scoring every resume against a job description is one sparse
+    matrix-vector product rather than a Python loop.
+    """
+
+    def __init__(self, idf_table=None):
+        self.idf_table = idf_table
+        self.vocabulary = {}
+        self.resume_ids = []
+        self._rows = []
+        self._matrix = None
+
+    def fit(self, resumes):
+        """Index an iterable of (resume_id, text) pairs, replacing any existing ones
+
+        Without a precomputed IDF table, one is derived from these resumes.
+        """
+        resumes = [(resume_id, term_counts(text)) for resume_id, text in resumes]
+        if self.idf_table is None:
+            self.idf_table = IDFTable()
+            for _, counts in resumes:
+                self.idf_table.add_document(counts=counts)
+        self.vocabulary = {}
+        self.resume_ids = []
+        self._rows = []
+        self._matrix = None
+        for resume_id, counts in resumes:
+            self.add(resume_id, counts=counts)
+        return self
+
+    def add(self, resume_id, text=None, counts=None):
+        """Add one resume to the index"""
+        if self.idf_table is None:
+            self.idf_table = IDFTable()
+        vocabulary = self.vocabulary
+        vector = tfidf_vector(text, self.idf_table, counts)
+        columns = np.fromiter((vocabulary.setdefault(term, len(vocabulary)) for term in vector),
+                              dtype=np.int32, count=len(vector))
+        weights = np.fromiter(vector.values(), dtype=np.float32, count=len(vector))
+        self.resume_ids.append(resume_id)
+        self._rows.append((columns, weights))
+        self._matrix = None
+
+    def __len__(self):
+        return len(self.resume_ids)
+
+    @property
+    def matrix(self):
+        """The resume-term matrix, rebuilt lazily after additions"""
+        if self._matrix is None:
+            lengths = np.fromiter((len(columns) for columns, _ in self._rows), dtype=np.int64,
+                                  count=len(self._rows))
+            indptr = np.zeros(len(self._rows) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=indptr[1:])
+            if self._rows:
+                indices = np.concatenate([columns for columns, _ in self._rows])
+                data = np.concatenate([weights for _, weights in self._rows])
+            else:
+                indices = np.zeros(0, dtype=np.int32)
+                data = np.zeros(0, dtype=np.float32)
+            self._matrix = sparse.csr_matrix((data, indices, indptr),
+                                             shape=(len(self._rows), len(self.vocabulary)))
+        return self._matrix
+
+    def _query_matrix(self, job_descriptions):
+        """Vectorize job descriptions into a sparse (queries x terms) matrix"""
+        vocabulary = self.vocabulary
+        data, indices, indptr = [], [], [0]
+        for text in job_descriptions:
+            # Terms the resumes never use still count towards the query norm,
+            # which tfidf_vector has already applied.
+            for term, weight in tfidf_vector(text, self.idf_table or IDFTable()).items():
+                column = vocabulary.get(term)
+                if column is not None:
+                    indices.append(column)
+                    data.append(weight)
+            indptr.append(len(indices))
+        return sparse.csr_matrix((np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32),
+                                  np.asarray(indptr, dtype=np.int64)),
+                                 shape=(len(job_descriptions), len(vocabulary)))
+
+    def scores(self, job_description):
+        """Cosine similarity of every indexed resume to the job description"""
+        return self.score_matrix([job_description])[0]
+
+    def score_matrix(self, job_descriptions):
+        """Dense (job descriptions x resumes) similarity matrix from one sparse product"""
+        if not self.resume_ids:
+            return np.zeros((len(job_descriptions), 0), dtype=np.float32)
+        product = self.matrix @ self._query_matrix(job_descriptions).T
+        return product.toarray().T
+
+    def top_k(self, job_description, k=10):
+        """Return the k most relevant resumes as (resume_id, score) pairs"""
+        return self.rank_many([job_description], k)[0]
+
+    def rank_many(self, job_descriptions, k=10):
+        """Top-k resumes for each of several job descriptions"""
+        results = []
+        for row in self.score_matrix(job_descriptions):
+            k_row = min(k, len(row))
+            if k_row == 0:
+                results.append([])
+                continue
+            top = np.argpartition(-row, k_row - 1)[:k_row]
+            top = top[np.argsort(-row[top], kind="stable")]
+            results.append([(self.resume_ids[i], float(row[i])) for i in top])
+        return results
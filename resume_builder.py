@@ -1,135 +1,252 @@
-import streamlit as st
-import json
-from datetime import datetime
+from cache import LRUCache, content_hash
+from keyword_matcher import KeywordMatcher
+from metrics import register_cache, timed
+from relevance import IDFTable, cosine_similarity, tfidf_vector
+from smart_ai_engine import ai_engine
+from template import template_engine
 
-class ATSResumeBuilder:
-    def __init__(self):
-        self.ats_keywords = [
-            # Technical Skills
-            "Python", "JavaScript", "Java", "C++", "SQL", "React", "Node.js", "AWS", "Docker", "Kubernetes",
-            "Machine Learning", "Data Analysis", "Web Development", "API", "REST", "Git", "Agile", "Scrum",
-            "DevOps", "CI/CD", "Testing", "Debugging", "Optimization", "Automation", "Security",
-            # Soft Skills
-            "Leadership", "Communication", "Teamwork", "Problem Solving", "Project Management",
-            "Critical Thinking", "Time Management", "Adaptability", "Creativity", "Collaboration"
-        ]
-    
-    def create_ats_friendly_resume(self, personal_info, experience, education, skills, projects):
-        """Generate an ATS-optimized resume"""
-        
-        resume = f"""
-# {personal_info.get('name', 'Your Name').upper()}
-{personal_info.get('title', 'Professional Title')}
-
-## Contact Information
-- 📧 Email: {personal_info.get('email', 'your.email@example.com')}
-- 📱 Phone: {personal_info.get('phone', '+1 (555) 123-4567')}
-- 🔗 LinkedIn: {personal_info.get('linkedin', 'linkedin.com/in/yourprofile')}
-- 🌐 Portfolio: {personal_info.get('portfolio', 'yourportfolio.com')}
-- 📍 Location: {personal_info.get('location', 'City, State')}
-
-## Professional Summary
-{self._generate_professional_summary(personal_info, experience, skills)}
+DEFAULT_ATS_KEYWORDS = [
+    # Technical Skills
+    "Python", "JavaScript", "Java", "C++", "SQL", "React", "Node.js", "AWS", "Docker", "Kubernetes",
+    "Machine Learning", "Data Analysis", "Web Development", "API", "REST", "Git", "Agile", "Scrum",
+    "DevOps", "CI/CD", "Testing", "Debugging", "Optimization", "Automation", "Security",
+    # Soft Skills
+    "Leadership", "Communication", "Teamwork", "Problem Solving", "Project Management",
+    "Critical Thinking", "Time Management", "Adaptability", "Creativity", "Collaboration"
+]
 
-## Technical Skills
-{self._format_skills_section(skills)}
+# Template fields taken straight from personal_info, with their placeholders
+PERSONAL_FIELDS = {
+    "name": "Your Name",
+    "title": "Professional Title",
+    "email": "your.email@example.com",
+    "phone": "+1 (555) 123-4567",
+    "linkedin": "linkedin.com/in/yourprofile",
+    "portfolio": "yourportfolio.com",
+    "location": "City, State",
+    "certifications": ""
+}
 
-## Professional Experience
-{self._format_experience_section(experience)}
+DEFAULT_LAYOUT = "classic"
 
-## Projects
-{self._format_projects_section(projects)}
-
-## Education
-{self._format_education_section(education)}
-
-## Certifications
-{personal_info.get('certifications', '• Relevant certifications will appear here')}
+class ATSResumeBuilder:
+    def __init__(self, keywords=None, idf_table=None, section_cache_size=512):
+        self.ats_keywords = list(keywords) if keywords is not None else list(DEFAULT_ATS_KEYWORDS)
+        self.keyword_matcher = KeywordMatcher(self.ats_keywords)
+        # Without a corpus every term weighs the same; main_app passes db.idf_table() per analysis
+        self.idf_table = idf_table or IDFTable()
+        self.section_cache = LRUCache(maxsize=section_cache_size)
+    
+    @timed("create_ats_friendly_resume")
+    def create_ats_friendly_resume(self, personal_info, experience, education, skills, projects, layout=DEFAULT_LAYOUT):
+        """Generate an ATS-optimized resume
+        
+        Each section is memoized by a hash of its own inputs, so editing one
+        field re-renders only that section and splices it into the document.
+        The document itself is laid out by one of the templates in ``templates/``.
         """
         
+        version, template = template_engine.get(layout)
+        fields = {field: personal_info.get(field, default) for field, default in PERSONAL_FIELDS.items()}
+        sections = self._lazy_sections(personal_info, experience, education, skills, projects)
+        document_key = ("document", layout, version, content_hash(fields)) + tuple(key for key, _ in sections.values())
+        resume = self.section_cache.get(document_key)
+        if resume is None:
+            # Sections are rendered only if the layout uses them (one_page has no summary)
+            for name, (_, render) in sections.items():
+                fields[name] = render
+            resume = template.render(fields)
+            self.section_cache.put(document_key, resume)
+        
         return resume
     
+    def create_ats_friendly_resume_stream(self, personal_info, experience, education, skills, projects,
+                                          layout=DEFAULT_LAYOUT):
+        """Yield the same document as ``create_ats_friendly_resume`` in pieces
+        
+        The template is walked in document order: the header goes out at once,
+        the professional summary streams from the AI engine (or the cache), and
+        each later section is rendered only when the walk reaches it, so the
+        first piece never waits on the bullet rewrites. The wait for the first
+        piece is recorded as the ``resume`` time to first token.
+        """
+        
+        return ai_engine.time_first_piece("resume", self._stream_document(
+            personal_info, experience, education, skills, projects, layout
+        ))
+    
+    def _stream_document(self, personal_info, experience, education, skills, projects, layout):
+        _, template = template_engine.get(layout)
+        context = {field: personal_info.get(field, default) for field, default in PERSONAL_FIELDS.items()}
+        summary_input = self._summary_inputs(personal_info, experience, skills)
+        summary_key = ("summary", content_hash(summary_input))
+        
+        def summary():
+            text = self.section_cache.get(summary_key)
+            return text if text is not None else self._stream_summary(summary_key, summary_input)
+        
+        for name, (_, render) in self._lazy_sections(personal_info, experience, education, skills, projects).items():
+            context[name] = render
+        context['summary'] = summary
+        yield from template.stream(context)
+    
+    def _stream_summary(self, key, summary_input):
+        """Yield the summary as the AI engine produces it, then cache the whole"""
+        
+        pieces = []
+        for piece in ai_engine.stream_pieces("summary", self._summary_fields(summary_input)):
+            pieces.append(piece)
+            yield piece
+        self.section_cache.put(key, "".join(pieces))
+    
+    def _lazy_sections(self, personal_info, experience, education, skills, projects):
+        """{name: (cache key, callable rendering the section through the cache)}
+        
+        Keys are cheap hashes of each section's inputs; nothing is rendered
+        until a callable is called.
+        """
+        
+        return {
+            'summary': self._lazy_section("summary", self._format_summary_section,
+                                          self._summary_inputs(personal_info, experience, skills)),
+            'skills': self._lazy_section("skills", self._format_skills_section, skills),
+            'skills_inline': self._lazy_section("skills_inline", self._format_inline_skills, skills),
+            'experience': self._lazy_section("experience", self._format_experience_section, experience),
+            'projects': self._lazy_section("projects", self._format_projects_section, projects),
+            'education': self._lazy_section("education", self._format_education_section, education)
+        }
+    
+    def _lazy_section(self, name, renderer, section_input):
+        key = (name, content_hash(section_input))
+        
+        def render():
+            text = self.section_cache.get(key)
+            if text is None:
+                text = renderer(section_input)
+                self.section_cache.put(key, text)
+            return text
+        
+        return key, render
+    
+    def _summary_inputs(self, personal_info, experience, skills):
+        """The only fields the professional summary depends on"""
+        
+        return {
+            'title': personal_info.get('title', 'Professional'),
+            'domain': personal_info.get('domain', 'software development'),
+            'target_company': personal_info.get('target_company', 'a forward-thinking organization'),
+            'years': experience[0].get('years', '2+') if experience else '2+',
+            'primary_skills': skills.get('programming_languages', ['Python', 'JavaScript'])[:3]
+        }
+    
     def _generate_professional_summary(self, personal_info, experience, skills):
         """Generate an ATS-optimized professional summary"""
         
-        years_exp = experience[0].get('years', '2+') if experience else '2+'
-        primary_skills = ', '.join(skills.get('programming_languages', ['Python', 'JavaScript'])[:3])
-        domain = personal_info.get('domain', 'software development')
+        return self._format_summary_section(self._summary_inputs(personal_info, experience, skills))
+    
+    def _format_summary_section(self, summary):
+        """Format the professional summary from its distilled inputs"""
         
-        summary = f"""Results-driven {personal_info.get('title', 'Professional')} with {years_exp} years of experience in {domain}. 
-Proficient in {primary_skills} with demonstrated success in delivering high-quality solutions. 
-Strong problem-solving abilities combined with excellent communication and teamwork skills. 
-Seeking to leverage technical expertise and innovative thinking to drive success at {personal_info.get('target_company', 'a forward-thinking organization')}."""
+        return ai_engine.generate("summary", **self._summary_fields(summary))
+    
+    def _summary_fields(self, summary):
+        """The AI engine request for a summary"""
         
-        return summary
+        return {
+            'title': summary['title'],
+            'years': summary['years'],
+            'domain': summary['domain'],
+            'skills': ', '.join(summary['primary_skills']),
+            'target_company': summary['target_company']
+        }
     
     def _format_skills_section(self, skills):
         """Format skills section for ATS optimization"""
         
-        skills_text = ""
+        lines = []
         for category, skill_list in skills.items():
             if skill_list:
                 category_name = category.replace('_', ' ').title()
-                skills_text += f"**{category_name}:** {', '.join(skill_list)}\n\n"
+                lines.append(f"**{category_name}:** {', '.join(skill_list)}")
+        
+        return "\n\n".join(lines)
+    
+    def _format_inline_skills(self, skills):
+        """All skills on a single line, for compact layouts"""
         
-        return skills_text.strip()
+        return ", ".join(skill for skill_list in skills.values() for skill in skill_list)
     
     def _format_experience_section(self, experience):
         """Format experience section with ATS-friendly bullet points"""
         
-        experience_text = ""
+        # Rewrite every bullet in one request so they share a batch
+        bullets = ai_engine.generate_many("bullet", [
+            {'text': responsibility} for job in experience for responsibility in job.get('responsibilities', [])
+        ])
+        parts = []
         for job in experience:
-            experience_text += f"### {job.get('position', 'Position')}\n"
-            experience_text += f"**{job.get('company', 'Company')}** | {job.get('duration', 'Duration')}\n\n"
+            parts.append(f"### {job.get('position', 'Position')}\n")
+            parts.append(f"**{job.get('company', 'Company')}** | {job.get('duration', 'Duration')}\n\n")
             
-            for responsibility in job.get('responsibilities', []):
+            for _ in job.get('responsibilities', []):
                 # Start with action verbs (ATS-friendly)
-                experience_text += f"• {responsibility}\n"
+                parts.append(f"• {bullets.pop(0)}\n")
             
-            experience_text += "\n"
+            parts.append("\n")
         
-        return experience_text.strip()
+        return "".join(parts).strip()
     
     def _format_projects_section(self, projects):
         """Format projects section"""
         
-        projects_text = ""
+        parts = []
         for project in projects:
-            projects_text += f"### {project.get('name', 'Project Name')}\n"
-            projects_text += f"*Technologies: {', '.join(project.get('technologies', []))}*\n\n"
-            projects_text += f"{project.get('description', 'Project description')}\n\n"
+            parts.append(f"### {project.get('name', 'Project Name')}\n")
+            parts.append(f"*Technologies: {', '.join(project.get('technologies', []))}*\n\n")
+            parts.append(f"{project.get('description', 'Project description')}\n\n")
         
-        return projects_text.strip()
+        return "".join(parts).strip()
     
     def _format_education_section(self, education):
         """Format education section"""
         
-        education_text = ""
+        parts = []
         for edu in education:
-            education_text += f"### {edu.get('degree', 'Degree')}\n"
-            education_text += f"**{edu.get('institution', 'Institution')}** | {edu.get('year', 'Year')}\n"
-            education_text += f"*{edu.get('details', 'Relevant details')}*\n\n"
+            parts.append(f"### {edu.get('degree', 'Degree')}\n")
+            parts.append(f"**{edu.get('institution', 'Institution')}** | {edu.get('year', 'Year')}\n")
+            if edu.get('gpa'):
+                parts.append(f"GPA: {edu['gpa']}\n")
+            if edu.get('details'):
+                parts.append(f"*{edu['details']}*\n")
+            parts.append("\n")
         
-        return education_text.strip()
+        return "".join(parts).strip()
+    
+    def cache_stats(self):
+        """Hit/miss counters for the section cache"""
+        return self.section_cache.stats()
     
-    def analyze_ats_score(self, resume_text, job_description=""):
-        """Analyze how ATS-friendly the resume is"""
+    @timed("analyze_ats_score")
+    def analyze_ats_score(self, resume_text, job_description="", idf_table=None):
+        """Analyze how ATS-friendly the resume is
+        
+        ``idf_table`` weights job match terms by rarity, e.g. ``db.idf_table()``.
+        """
         
         score = 0
         max_score = 100
         feedback = []
         
-        # Check for keywords
-        found_keywords = []
-        for keyword in self.ats_keywords:
-            if keyword.lower() in resume_text.lower():
-                found_keywords.append(keyword)
-                score += 2
+        resume_lower = resume_text.lower()
+        
+        # Check for keywords (single pass over the resume tokens)
+        found_keywords, missing_keywords = self.keyword_matcher.match(resume_text, missing_limit=10)
+        score += 2 * len(found_keywords)
         
         # Check structure
         sections = ["experience", "education", "skills", "projects", "summary"]
         for section in sections:
-            if section in resume_text.lower():
+            if section in resume_lower:
                 score += 5
             else:
                 feedback.append(f"Consider adding a '{section.title()}' section")
@@ -144,19 +261,34 @@ Seeking to leverage technical expertise and innovative thinking to drive success
         # Check contact info
         contact_items = ["@", "linkedin", "github"]
         for item in contact_items:
-            if item in resume_text.lower():
+            if item in resume_lower:
                 score += 5
         
         # Normalize score
         final_score = min(score, max_score)
         
-        return {
+        analysis = {
             'score': final_score,
             'found_keywords': found_keywords,
-            'missing_keywords': [k for k in self.ats_keywords if k.lower() not in resume_text.lower()][:10],
+            'missing_keywords': missing_keywords,
             'feedback': feedback,
             'word_count': word_count
         }
+        
+        # Compare against the job description when one is given
+        if job_description:
+            idf_table = idf_table or self.idf_table
+            similarity = cosine_similarity(tfidf_vector(resume_text, idf_table),
+                                           tfidf_vector(job_description, idf_table))
+            found = set(found_keywords)
+            job_keywords, _ = self.keyword_matcher.match(job_description, missing_limit=0)
+            analysis['job_match'] = round(similarity * 100, 1)
+            analysis['missing_job_keywords'] = [k for k in job_keywords if k not in found]
+            if analysis['missing_job_keywords']:
+                feedback.append(f"Job description mentions {', '.join(analysis['missing_job_keywords'][:5])} - add them if they apply")
+        
+        return analysis
 
 # Global instance
 resume_builder = ATSResumeBuilder()
+register_cache("resume_sections", resume_builder.section_cache)
@@ -0,0 +1,237 @@
+"""SM-2 spaced repetition for interview questions
+
+Each user's review state is held as parallel arrays sorted by question id
+(question id, due time, interval, ease, repetition count), 22 bytes per
+reviewed question, found by binary search. Due questions are ordered by a
+binary heap in an int64 array whose entries pack ``due << ID_BITS |
+question_id``, another 8 to 16 bytes per question. A grade pushes a fresh
+entry and the old one is skipped when it surfaces, so recording a grade and
+fetching the next due question are both O(log n) (plus a memmove when a
+question is reviewed for the first time).
+"""
+
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+import config
+from database import get_db
+
+DAY_SECONDS = 86400
+ID_BITS = 32
+ID_MASK = (1 << ID_BITS) - 1
+
+# SM-2 constants
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+PASSING_GRADE = 3
+
+# Self-grades offered in the UI: label -> SM-2 quality (0-5)
+GRADES = {
+    "Again": 1,
+    "Hard": 3,
+    "Good": 4,
+    "Easy": 5
+}
+
+
+def sm2(grade, interval, ease, repetitions):
+    """Next (interval_days, ease, repetitions) after a review graded 0-5"""
+    if grade >= PASSING_GRADE:
+        if repetitions == 0:
+            interval = 1.0
+        elif repetitions == 1:
+            interval = 6.0
+        else:
+            interval = interval * ease
+        repetitions += 1
+    else:
+        interval = 1.0
+        repetitions = 0
+    ease = max(MIN_EASE, ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+    return interval, ease, repetitions
+
+
+# Binary heap operations on an array("q"); heapq's C functions only accept lists
+
+def heap_push(heap, entry):
+    heap.append(entry)
+    position = len(heap) - 1
+    while position:
+        parent = (position - 1) >> 1
+        if heap[parent] <= entry:
+            break
+        heap[position] = heap[parent]
+        position = parent
+    heap[position] = entry
+
+
+def heap_pop(heap):
+    last = heap.pop()
+    if not heap:
+        return last
+    top = heap[0]
+    _sift_down(heap, 0, last)
+    return top
+
+
+def heapify(heap):
+    for position in reversed(range(len(heap) // 2)):
+        _sift_down(heap, position, heap[position])
+
+
+def _sift_down(heap, position, entry):
+    """Place ``entry`` at ``position`` and move it down to restore the heap order"""
+    end = len(heap)
+    child = 2 * position + 1
+    while child < end:
+        if child + 1 < end and heap[child + 1] < heap[child]:
+            child += 1
+        if entry <= heap[child]:
+            break
+        heap[position] = heap[child]
+        position = child
+        child = 2 * position + 1
+    heap[position] = entry
+
+
+class UserReviews:
+    """One user's review records in id-sorted parallel arrays with a packed due-time heap"""
+
+    def __init__(self):
+        self.question_ids = array("I")
+        self.due = array("q")
+        self.intervals = array("f")
+        self.ease = array("f")
+        self.repetitions = array("H")
+        self.heap = array("q")
+
+    def __len__(self):
+        return len(self.question_ids)
+
+    def _find(self, question_id):
+        """Index of a question's record, or None"""
+        ids = self.question_ids
+        index = bisect_left(ids, question_id)
+        return index if index < len(ids) and ids[index] == question_id else None
+
+    def set(self, question_id, due, interval, ease, repetitions):
+        ids = self.question_ids
+        if ids and ids[-1] >= question_id:
+            index = bisect_left(ids, question_id)
+        else:
+            index = len(ids)
+        if index < len(ids) and ids[index] == question_id:
+            self.due[index] = due
+            self.intervals[index] = interval
+            self.ease[index] = ease
+            self.repetitions[index] = repetitions
+        else:
+            ids.insert(index, question_id)
+            self.due.insert(index, due)
+            self.intervals.insert(index, interval)
+            self.ease.insert(index, ease)
+            self.repetitions.insert(index, repetitions)
+        heap_push(self.heap, due << ID_BITS | question_id)
+        if len(self.heap) > 2 * len(ids) + 64:
+            self._compact()
+
+    def state(self, question_id):
+        """(interval, ease, repetitions), or the initial state for an unseen question"""
+        index = self._find(question_id)
+        if index is None:
+            return 0.0, INITIAL_EASE, 0
+        return self.intervals[index], self.ease[index], self.repetitions[index]
+
+    def _is_current(self, entry):
+        """False if a later review superseded this heap entry"""
+        index = self._find(entry & ID_MASK)
+        return index is not None and self.due[index] == entry >> ID_BITS
+
+    def _compact(self):
+        self.heap = array("q", (due << ID_BITS | question_id for question_id, due in zip(self.question_ids, self.due)))
+        heapify(self.heap)
+
+    def due_questions(self, now, limit):
+        """Up to ``limit`` question ids due at ``now``, most overdue first"""
+        heap = self.heap
+        taken = []
+        result = []
+        while heap and len(result) < limit and heap[0] >> ID_BITS <= now:
+            entry = heap_pop(heap)
+            # A regrade within the same second leaves an identical duplicate behind
+            if self._is_current(entry) and (not taken or taken[-1] != entry):
+                taken.append(entry)
+                result.append(entry & ID_MASK)
+        for entry in taken:
+            heap_push(heap, entry)
+        return result
+
+    def next_due_time(self):
+        """Epoch seconds of the earliest scheduled review, or None"""
+        heap = self.heap
+        while heap and not self._is_current(heap[0]):
+            heap_pop(heap)
+        return heap[0] >> ID_BITS if heap else None
+
+
+class ReviewScheduler:
+    """Per-user SM-2 scheduler persisted through the database's review table"""
+
+    def __init__(self, database=None):
+        # A DatabaseManager, or a function returning one so it is opened only when first needed
+        self._database = database
+        self._users = {}
+        self._lock = threading.RLock()
+
+    @property
+    def database(self):
+        database = self._database
+        return database() if callable(database) else database
+
+    def _reviews(self, user_id):
+        reviews = self._users.get(user_id)
+        if reviews is None:
+            with self._lock:
+                reviews = self._users.get(user_id)
+                if reviews is None:
+                    reviews = UserReviews()
+                    database = self.database
+                    if database is not None:
+                        for question_id, due, interval, ease, repetitions in database.get_reviews(user_id):
+                            reviews.set(question_id, due, interval, ease, repetitions)
+                    self._users[user_id] = reviews
+        return reviews
+
+    def record(self, question_id, grade, user_id=config.DEFAULT_USER, now=None):
+        """Apply a self-grade (0-5) and return the question's next due time"""
+        now = int(now if now is not None else time.time())
+        reviews = self._reviews(user_id)
+        with self._lock:
+            interval, ease, repetitions = sm2(grade, *reviews.state(question_id))
+            due = now + int(interval * DAY_SECONDS)
+            reviews.set(question_id, due, interval, ease, repetitions)
+        database = self.database
+        if database is not None:
+            database.save_review(question_id, due, interval, ease, repetitions, user_id=user_id)
+        return due
+
+    def due_questions(self, user_id=config.DEFAULT_USER, limit=10, now=None):
+        """Question ids whose review is due, most overdue first"""
+        now = int(now if now is not None else time.time())
+        reviews = self._reviews(user_id)
+        with self._lock:
+            return reviews.due_questions(now, limit)
+
+    def next_due_time(self, user_id=config.DEFAULT_USER):
+        reviews = self._reviews(user_id)
+        with self._lock:
+            return reviews.next_due_time()
+
+    def review_count(self, user_id=config.DEFAULT_USER):
+        return len(self._reviews(user_id))
+
+
+# Global instance
+review_scheduler = ReviewScheduler(get_db)
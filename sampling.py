@@ -0,0 +1,51 @@
+import random
+from array import array
+
+
+class AliasTable:
+    """Walker/Vose alias table: O(n) to build, O(1) per weighted draw
+
+    Tables are stored as packed arrays (12 bytes per entry). When every
+    weight is equal no table is built at all and draws are plain uniform.
+    """
+
+    def __init__(self, weights, rng=random):
+        self.rng = rng
+        n = len(weights)
+        self.size = n
+        self.probability = None
+        self.alias = None
+        total = float(sum(weights))
+        if n == 0 or total <= 0:
+            self.size = 0
+            return
+        first = weights[0]
+        if all(w == first for w in weights):
+            return
+
+        self.probability = array("d", bytes(8 * n))
+        self.alias = array("I", bytes(4 * n))
+        scaled = array("d", (w * n / total for w in weights))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        for i in large + small:
+            self.probability[i] = 1.0
+
+    def __len__(self):
+        return self.size
+
+    def sample(self):
+        """Index drawn with probability proportional to its weight"""
+        if not self.size:
+            raise IndexError("sample from an empty alias table")
+        i = int(self.rng.random() * self.size)
+        if self.probability is None:
+            return i
+        return i if self.rng.random() < self.probability[i] else self.alias[i]
@@ -0,0 +1,131 @@
+import hashlib
+import re
+import threading
+import zlib
+
+import numpy as np
+
+from keyword_matcher import tokenize
+
+# Numbers (with decimals, separators and units like % or K) and capitalized words:
+# the names and figures two texts must share exactly to be interchangeable
+FACT_PATTERN = re.compile(r"\d[\d.,]*[%kKmMbBxX+]*|\b[A-Z][\w&'.+#-]*")
+
+
+def embed(text, dim):
+    """Unit-length hashed n-gram vector: word unigrams plus character trigrams
+
+    Features are hashed with CRC32 (stable across processes) into ``dim``
+    buckets with a hash-derived sign, so collisions tend to cancel rather
+    than accumulate.
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    for word in tokenize(text):
+        features = [f"w:{word}"]
+        padded = f"^{word}$"
+        features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+        for feature in features:
+            h = zlib.crc32(feature.encode("utf-8"))
+            vector[h % dim] += 1.0 if h & 0x80000000 else -1.0
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    return vector
+
+
+def fact_key(text):
+    """Signed 64-bit hash of the text's numbers and proper-noun tokens, order-insensitive"""
+    facts = sorted(set(match.rstrip(".,") for match in FACT_PATTERN.findall(text)))
+    digest = hashlib.blake2b("\0".join(facts).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+class SemanticCache:
+    """Near-duplicate response cache over embedded request text
+
+    Vectors live in one preallocated float32 matrix, one row per entry, so a
+    lookup is a single matrix-vector product. Entries only match others in
+    the same namespace (backend and task) with exactly the same numbers and
+    proper nouns (see ``fact_key``), so "45%" never gets the "40%" answer and
+    one company's text is never served for another. When full, the least
+    recently used row is overwritten.
+    """
+
+    def __init__(self, maxsize=2048, threshold=0.95, dim=512):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.dim = dim
+        self.vectors = np.zeros((maxsize, dim), dtype=np.float32)
+        self.namespaces = np.full(maxsize, -1, dtype=np.int32)
+        self.fact_keys = np.zeros(maxsize, dtype=np.int64)
+        self.last_used = np.zeros(maxsize, dtype=np.int64)
+        self.values = [None] * maxsize
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._namespace_ids = {}
+        self._clock = 0
+        self._lock = threading.Lock()
+
+    def _namespace(self, namespace):
+        namespace_id = self._namespace_ids.get(namespace)
+        if namespace_id is None:
+            namespace_id = self._namespace_ids.setdefault(namespace, len(self._namespace_ids))
+        return namespace_id
+
+    def get(self, namespace, text, default=None):
+        """Cached response for the most similar text above the threshold with the same facts"""
+        vector = embed(text, self.dim)
+        facts = fact_key(text)
+        with self._lock:
+            self._clock += 1
+            if self.size:
+                similarities = self.vectors[:self.size] @ vector
+                mismatched = self.namespaces[:self.size] != self._namespace(namespace)
+                mismatched |= self.fact_keys[:self.size] != facts
+                similarities[mismatched] = -1.0
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    self.last_used[best] = self._clock
+                    self.hits += 1
+                    return self.values[best]
+            self.misses += 1
+            return default
+
+    def put(self, namespace, text, value):
+        vector = embed(text, self.dim)
+        facts = fact_key(text)
+        with self._lock:
+            self._clock += 1
+            if self.size < self.maxsize:
+                slot = self.size
+                self.size += 1
+            else:
+                slot = int(np.argmin(self.last_used))
+                self.evictions += 1
+            self.vectors[slot] = vector
+            self.namespaces[slot] = self._namespace(namespace)
+            self.fact_keys[slot] = facts
+            self.last_used[slot] = self._clock
+            self.values[slot] = value
+
+    def __len__(self):
+        return self.size
+
+    def clear(self):
+        with self._lock:
+            self.size = 0
+            self.values = [None] * self.maxsize
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": self.size,
+            "maxsize": self.maxsize,
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
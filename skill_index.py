@@ -0,0 +1,323 @@
+import heapq
+import math
+import re
+from array import array
+from bisect import bisect_left, insort
+
+from keyword_matcher import STOP_WORDS, KeywordMatcher, tokenize
+
+# A leading "-" is its own token (NOT); inside a term ("ci-cd") it stays part of it
+QUERY_TOKEN_PATTERN = re.compile(r'-(?=[^\s)])|"[^"]*"|\(|\)|[^\s()"]+')
+QUERY_OPERATORS = ("AND", "OR", "NOT")
+
+
+def normalize_term(term):
+    """Normalize a skill or search term the same way documents are indexed"""
+    return " ".join(tokenize(term))
+
+
+# Posting list compression: sorted ids are stored as varint-encoded gaps
+
+def encode_postings(postings):
+    """Delta + varint encode a sorted posting list"""
+    out = bytearray()
+    previous = 0
+    for doc_id in postings:
+        gap = doc_id - previous
+        previous = doc_id
+        while gap >= 0x80:
+            out.append((gap & 0x7F) | 0x80)
+            gap >>= 7
+        out.append(gap)
+    return bytes(out)
+
+
+def decode_postings(data):
+    """Decode a posting list produced by ``encode_postings``"""
+    postings = array("I")
+    value = shift = previous = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        previous += value
+        postings.append(previous)
+        value = shift = 0
+    return postings
+
+
+def _intersect(a, b):
+    """Intersect two sorted arrays, galloping through the longer one"""
+    if len(a) > len(b):
+        a, b = b, a
+    result = array("I")
+    position = 0
+    end = len(b)
+    for doc_id in a:
+        position = bisect_left(b, doc_id, position, end)
+        if position == end:
+            break
+        if b[position] == doc_id:
+            result.append(doc_id)
+    return result
+
+
+def _union(a, b):
+    return array("I", sorted(set(a).union(b)))
+
+
+def _difference(a, b):
+    """Ids in a that are not in b"""
+    result = array("I")
+    position = 0
+    end = len(b)
+    for doc_id in a:
+        position = bisect_left(b, doc_id, position, end)
+        if position == end or b[position] != doc_id:
+            result.append(doc_id)
+    return result
+
+
+class SkillIndex:
+    """Inverted index from normalized skill/term to sorted resume-id posting lists
+
+    Single words and multi-word skills from the ATS keyword list ("machine
+    learning") are both indexed. Posting lists are unsigned 32-bit arrays kept
+    in id order, so boolean queries are merges of sorted arrays rather than
+    rescans of resume text.
+    """
+
+    def __init__(self, skills=None, text_source=None):
+        self.postings = {}
+        self.doc_ids = array("I")
+        self.deleted = set()
+        self.phrase_matcher = KeywordMatcher(skills or [])
+        # doc_id -> text, used to check phrases that are not indexed skills
+        self.text_source = text_source
+
+    def document_terms(self, text):
+        """The set of normalized terms a document is indexed under"""
+        tokens = tokenize(text)
+        terms = {token for token in tokens if token not in STOP_WORDS}
+        matcher = self.phrase_matcher
+        for index in matcher.match_indices(tokens=tokens):
+            terms.add(normalize_term(matcher.keywords[index]))
+        return terms
+
+    def add_document(self, doc_id, text):
+        """Index a saved resume; ids are expected to grow but need not"""
+        self.deleted.discard(doc_id)
+        self._insert(self.doc_ids, doc_id)
+        postings = self.postings
+        for term in self.document_terms(text):
+            posting = postings.get(term)
+            if posting is None:
+                postings[term] = array("I", (doc_id,))
+            else:
+                self._insert(posting, doc_id)
+
+    @staticmethod
+    def _insert(posting, doc_id):
+        if not posting or posting[-1] < doc_id:
+            posting.append(doc_id)
+        else:
+            position = bisect_left(posting, doc_id)
+            if position == len(posting) or posting[position] != doc_id:
+                insort(posting, doc_id)
+
+    def remove_document(self, doc_id, text=None):
+        """Remove a document; without its text it is hidden from results instead"""
+        if text is None:
+            self.deleted.add(doc_id)
+            return
+        for term in self.document_terms(text):
+            posting = self.postings.get(term)
+            if posting is not None:
+                position = bisect_left(posting, doc_id)
+                if position < len(posting) and posting[position] == doc_id:
+                    del posting[position]
+                if not posting:
+                    del self.postings[term]
+        position = bisect_left(self.doc_ids, doc_id)
+        if position < len(self.doc_ids) and self.doc_ids[position] == doc_id:
+            del self.doc_ids[position]
+
+    def __len__(self):
+        return len(self.doc_ids) - len(self.deleted)
+
+    def lookup(self, term):
+        """Posting list for a single skill or phrase"""
+        return self.postings.get(normalize_term(term), array("I"))
+
+    def search(self, all_of=(), any_of=(), none_of=()):
+        """Boolean search: documents with every ``all_of``, at least one ``any_of``
+        (if given) and none of ``none_of``"""
+        lists = sorted((self.lookup(term) for term in all_of), key=len)
+        if lists:
+            result = lists[0]
+            for posting in lists[1:]:
+                if not result:
+                    break
+                result = _intersect(result, posting)
+        else:
+            result = self.doc_ids
+        if any_of:
+            alternatives = array("I")
+            for term in any_of:
+                alternatives = _union(alternatives, self.lookup(term))
+            result = _intersect(result, alternatives)
+        for term in none_of:
+            result = _difference(result, self.lookup(term))
+        return self._visible(result)
+
+    def query(self, expression):
+        """Evaluate a boolean query such as ``kubernetes AND go AND NOT php``
+
+        Supports AND, OR and NOT in any case, ``-term`` for NOT, parentheses
+        and quoted phrases; adjacent terms without an operator are ANDed, and
+        AND binds tighter than OR. A phrase that is not an indexed skill
+        matches documents whose text contains its words in order, which
+        needs ``text_source``. Malformed queries raise ValueError.
+        """
+        tokens = QUERY_TOKEN_PATTERN.findall(expression)
+        if not tokens:
+            return []
+        result, position = self._parse_or(tokens, 0)
+        if position < len(tokens):
+            raise ValueError(f"Unexpected {tokens[position]!r} in query")
+        return self._visible(result)
+
+    @staticmethod
+    def _operator(tokens, position):
+        """The operator at a position (AND, OR, NOT, or - for NOT), or None"""
+        if position >= len(tokens):
+            return None
+        token = tokens[position]
+        if token == "-":
+            return "NOT"
+        upper = token.upper()
+        return upper if upper in QUERY_OPERATORS else None
+
+    def _parse_or(self, tokens, position):
+        result, position = self._parse_and(tokens, position)
+        while self._operator(tokens, position) == "OR":
+            right, position = self._parse_and(tokens, position + 1)
+            result = _union(result, right)
+        return result, position
+
+    def _parse_and(self, tokens, position):
+        if self._operator(tokens, position) == "NOT":
+            operand, position = self._parse_not(tokens, position)
+            result = _difference(self.doc_ids, operand)
+        else:
+            result, position = self._parse_operand(tokens, position)
+        while position < len(tokens) and tokens[position] != ")":
+            operator = self._operator(tokens, position)
+            if operator == "OR":
+                break
+            if operator == "AND":
+                position += 1
+            if self._operator(tokens, position) == "NOT":
+                right, position = self._parse_not(tokens, position)
+                result = _difference(result, right)
+            else:
+                right, position = self._parse_operand(tokens, position)
+                result = _intersect(result, right)
+        return result, position
+
+    def _parse_not(self, tokens, position):
+        """Postings a NOT (or -) at ``position`` excludes; NOT NOT cancels out"""
+        position += 1
+        if self._operator(tokens, position) == "NOT":
+            operand, position = self._parse_not(tokens, position)
+            return _difference(self.doc_ids, operand), position
+        return self._parse_operand(tokens, position)
+
+    def _parse_operand(self, tokens, position):
+        if position >= len(tokens):
+            after = f" after {tokens[position - 1]!r}" if position else ""
+            raise ValueError(f"Query ends early: expected a skill{after}")
+        token = tokens[position]
+        if token == ")" or self._operator(tokens, position):
+            raise ValueError(f"Expected a skill before {token!r}")
+        if token == "(":
+            result, position = self._parse_or(tokens, position + 1)
+            if position >= len(tokens) or tokens[position] != ")":
+                raise ValueError("Missing closing parenthesis")
+            return result, position + 1
+        term = token[1:-1] if token.startswith('"') else token
+        if not normalize_term(term):
+            raise ValueError(f"No searchable words in {token!r}")
+        return self._phrase(term), position + 1
+
+    def _phrase(self, term):
+        """Postings for an indexed term, else for documents containing its words in order"""
+        words = normalize_term(term).split()
+        posting = self.postings.get(" ".join(words))
+        if posting is not None or len(words) == 1:
+            return posting if posting is not None else array("I")
+        if self.text_source is None:
+            raise ValueError(f"{term!r} is not an indexed skill; search its words separately")
+        candidates = sorted((self.lookup(word) for word in words if word not in STOP_WORDS), key=len)
+        result = candidates[0] if candidates else self.doc_ids
+        for other in candidates[1:]:
+            result = _intersect(result, other)
+        width = len(words)
+        matches = array("I")
+        for doc_id in result:
+            tokens = tokenize(self.text_source(doc_id) or "")
+            if any(tokens[i:i + width] == words for i in range(len(tokens) - width + 1)):
+                matches.append(doc_id)
+        return matches
+
+    def rank(self, terms, k=10):
+        """Top-k documents by summed IDF of the query terms they contain"""
+        total = max(len(self), 1)
+        scores = {}
+        for term in terms:
+            posting = self.lookup(term)
+            if not posting:
+                continue
+            weight = math.log(1 + total / len(posting))
+            for doc_id in posting:
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight
+        deleted = self.deleted
+        return heapq.nlargest(k, ((doc_id, score) for doc_id, score in scores.items() if doc_id not in deleted),
+                              key=lambda item: item[1])
+
+    def _visible(self, postings):
+        if not self.deleted:
+            return list(postings)
+        return [doc_id for doc_id in postings if doc_id not in self.deleted]
+
+    def save(self, path):
+        """Write the index with delta-varint compressed posting lists"""
+        with open(path, "wb") as f:
+            for term, posting in self.postings.items():
+                encoded = encode_postings(posting)
+                term_bytes = term.encode("utf-8")
+                f.write(len(term_bytes).to_bytes(2, "little"))
+                f.write(term_bytes)
+                f.write(len(encoded).to_bytes(4, "little"))
+                f.write(encoded)
+
+    def load(self, path):
+        """Load posting lists written by ``save``"""
+        doc_ids = set()
+        with open(path, "rb") as f:
+            data = f.read()
+        offset = 0
+        while offset < len(data):
+            term_length = int.from_bytes(data[offset:offset + 2], "little")
+            offset += 2
+            term = data[offset:offset + term_length].decode("utf-8")
+            offset += term_length
+            encoded_length = int.from_bytes(data[offset:offset + 4], "little")
+            offset += 4
+            posting = decode_postings(data[offset:offset + encoded_length])
+            offset += encoded_length
+            self.postings[term] = posting
+            doc_ids.update(posting)
+        self.doc_ids = array("I", sorted(doc_ids))
+        return self
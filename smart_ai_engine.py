@@ -0,0 +1,526 @@
+"""Text generation for summaries, resume bullets and cover letters
+
+Every generated passage goes through ``ai_engine``: a response cache keyed by
+a hash of the normalized prompt, an opt-in semantic cache that answers
+near-duplicate requests for model backends, then a queue that gathers concurrent
+requests from all sessions into micro-batches for one backend call.
+
+Backends:
+
+    local          deterministic templates, no model (default; used by tests)
+    http           OpenAI-compatible /v1/completions server (vLLM, llama.cpp, TGI)
+    transformers   a Hugging Face text-generation pipeline in this process
+
+Select one with CAREER_SUITE_AI_BACKEND; see config.py for the other knobs.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import threading
+import time
+import urllib.request
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import config
+import metrics
+from cache import TTLCache
+from semantic_cache import SemanticCache
+
+# The local backend's "prompts" are the finished text: it echoes them back
+LOCAL_TEMPLATES = {
+    "summary": (
+        "Results-driven {title} with {years} years of experience in {domain}. \n"
+        "Proficient in {skills} with demonstrated success in delivering high-quality solutions. \n"
+        "Strong problem-solving abilities combined with excellent communication and teamwork skills. \n"
+        "Seeking to leverage technical expertise and innovative thinking to drive success at {target_company}."
+    ),
+    "bullet": "{text}",
+    "cover_letter": """
+Dear {hiring_manager},
+
+I am writing to express my enthusiastic interest in the {position} position at {company}. With my background in {skills}, I am confident that I possess the qualifications necessary to excel in this role.
+
+{experience}
+
+I am particularly drawn to this position because {motivation}. I am impressed by {company_reference}'s reputation and would be thrilled to contribute to your team.
+
+Thank you for considering my application. I look forward to discussing how my skills can benefit {company_organization}.
+
+Sincerely,
+{name}
+{contact}
+"""
+}
+
+# Instructions sent to a real model for each task
+PROMPTS = {
+    "summary": (
+        "Write a four-sentence professional summary for an ATS-friendly resume.\n"
+        "Title: {title}\nYears of experience: {years}\nDomain: {domain}\n"
+        "Key skills: {skills}\nTarget employer: {target_company}\n\nSummary:"
+    ),
+    "bullet": (
+        "Rewrite this resume bullet point so it starts with a strong action verb and states "
+        "measurable impact where the original supports it. Reply with one line.\n\n"
+        "Bullet: {text}\n\nRewritten bullet:"
+    ),
+    "cover_letter": (
+        "Write a concise, professional cover letter.\n"
+        "Company: {company}\nPosition: {position}\nAddress it to: {hiring_manager}\n"
+        "Applicant: {name}\nContact: {contact}\nSkills: {skills}\nExperience: {experience}\n"
+        "Why this role: {motivation}\n\nCover letter:"
+    )
+}
+
+MAX_TOKENS = {
+    "summary": 200,
+    "bullet": 60,
+    "cover_letter": 600
+}
+
+
+WORD_CHUNK_PATTERN = re.compile(r"\s*\S+\s*|\s+")
+# Time-to-first-token samples kept for percentile stats
+FIRST_TOKEN_SAMPLES = 1000
+
+
+def normalize_prompt(prompt):
+    """Collapse whitespace so trivially different prompts share a cache entry"""
+    return " ".join(prompt.split())
+
+
+def normalize_output(text):
+    """Generated text without surrounding whitespace, the same for batched and streamed responses"""
+    return text.strip()
+
+
+def strip_stream(pieces):
+    """Yield streamed pieces so that together they spell ``normalize_output`` of the whole
+
+    Leading whitespace is dropped and trailing whitespace is held back until
+    more text follows it.
+    """
+    started = False
+    held = ""
+    for piece in pieces:
+        if not started:
+            piece = piece.lstrip()
+            started = bool(piece)
+        text = held + piece
+        body = text.rstrip()
+        held = text[len(body):]
+        if body:
+            yield body
+
+
+class GenerationRequest:
+    __slots__ = ("task", "fields", "prompt", "key")
+
+    def __init__(self, task, fields, backend):
+        self.task = task
+        self.fields = fields
+        self.prompt = backend.prompts[task].format(**fields)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{backend.name}\0{task}\0{normalize_prompt(self.prompt)}".encode("utf-8"))
+        self.key = digest.hexdigest()
+
+
+# Backends
+
+class LocalBackend:
+    """Deterministic stand-in model: each task's prompt is its fixed template, returned as is"""
+
+    name = "local"
+    prompts = LOCAL_TEMPLATES
+    # Templates are free and exact; a similar prompt's text would be wrong
+    reuse_similar = False
+
+    def generate_batch(self, requests):
+        return [request.prompt for request in requests]
+
+    def stream(self, request):
+        """Yield the text a word (plus its trailing whitespace) at a time"""
+        for match in WORD_CHUNK_PATTERN.finditer(request.prompt):
+            yield match.group()
+
+
+class HTTPBackend:
+    """Remote model behind an OpenAI-compatible completions endpoint; one HTTP call per batch"""
+
+    reuse_similar = True
+
+    def __init__(self, endpoint=config.AI_ENDPOINT, model=config.AI_MODEL, api_key=config.AI_API_KEY,
+                 timeout=config.AI_TIMEOUT_SECONDS):
+        if not endpoint:
+            raise ValueError("The http AI backend needs CAREER_SUITE_AI_ENDPOINT")
+        self.url = endpoint.rstrip("/") + "/v1/completions"
+        self.model = model
+        self.api_key = api_key
+        self.timeout = timeout
+        self.name = f"http:{model}"
+        self.prompts = PROMPTS
+
+    def generate_batch(self, requests):
+        payload = {
+            "model": self.model,
+            "prompt": [request.prompt for request in requests],
+            "max_tokens": max(MAX_TOKENS[request.task] for request in requests),
+            "temperature": 0
+        }
+        with urllib.request.urlopen(self._request(payload), timeout=self.timeout) as response:
+            choices = json.load(response)["choices"]
+        # Place each choice by its index; a prompt the server skipped stays None
+        texts = [None] * len(requests)
+        for position, choice in enumerate(choices):
+            index = choice.get("index", position)
+            if 0 <= index < len(texts):
+                texts[index] = choice["text"]
+        return texts
+
+    def stream(self, request):
+        """Yield completion text as the server sends it (server-sent events)"""
+        payload = {
+            "model": self.model,
+            "prompt": request.prompt,
+            "max_tokens": MAX_TOKENS[request.task],
+            "temperature": 0,
+            "stream": True
+        }
+        with urllib.request.urlopen(self._request(payload), timeout=self.timeout) as response:
+            for line in response:
+                line = line.decode("utf-8").strip()
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                text = json.loads(data)["choices"][0].get("text", "")
+                if text:
+                    yield text
+
+    def _request(self, payload):
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return urllib.request.Request(self.url, json.dumps(payload).encode("utf-8"), headers)
+
+
+class TransformersBackend:
+    """Local Hugging Face model; the whole micro-batch runs as one pipeline call"""
+
+    reuse_similar = True
+
+    def __init__(self, model=config.AI_MODEL):
+        try:
+            from transformers import pipeline
+        except ImportError as e:
+            raise ImportError("The transformers AI backend needs `pip install transformers torch`") from e
+        self.pipeline = pipeline("text-generation", model=model)
+        self.name = f"transformers:{model}"
+        self.prompts = PROMPTS
+
+    def generate_batch(self, requests):
+        outputs = self.pipeline(
+            [request.prompt for request in requests],
+            max_new_tokens=max(MAX_TOKENS[request.task] for request in requests),
+            do_sample=False,
+            return_full_text=False,
+            batch_size=len(requests)
+        )
+        return [output[0]["generated_text"] for output in outputs]
+
+    def stream(self, request):
+        """Run generation on a thread and yield decoded text as tokens are produced"""
+        from transformers import TextIteratorStreamer
+
+        streamer = TextIteratorStreamer(self.pipeline.tokenizer, skip_prompt=True, skip_special_tokens=True)
+        thread = threading.Thread(target=self.pipeline, args=(request.prompt,), kwargs={
+            "max_new_tokens": MAX_TOKENS[request.task],
+            "do_sample": False,
+            "streamer": streamer
+        }, daemon=True)
+        thread.start()
+        yield from streamer
+        thread.join()
+
+
+BACKENDS = {
+    "local": LocalBackend,
+    "http": HTTPBackend,
+    "transformers": TransformersBackend
+}
+
+
+def create_backend(name=config.AI_BACKEND):
+    try:
+        backend = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown AI backend {name!r}; choose from {', '.join(BACKENDS)}") from None
+    return backend()
+
+
+class BatchQueue:
+    """Gathers requests from any thread into micro-batches for the backend
+
+    An asyncio loop on a daemon thread takes the first waiting request, waits
+    for a free worker (and optionally ``max_wait`` seconds more), then sends
+    up to ``max_batch`` waiting requests together. An idle backend therefore
+    sees single requests with no added latency, and batches grow exactly when
+    the backend is the bottleneck. Identical prompts in a batch are sent once.
+    Outputs are passed through ``normalize_output``. A request the backend
+    returned no output for fails, and whatever else goes wrong in a batch,
+    every future in it is resolved: none is left waiting forever.
+    ``on_result(request, text)`` runs before a request's waiters are released.
+    """
+
+    def __init__(self, backend, max_batch=config.AI_BATCH_SIZE, max_wait=config.AI_BATCH_WAIT_MS / 1000,
+                 workers=config.AI_CONCURRENT_BATCHES, on_result=None):
+        self.backend = backend
+        self.on_result = on_result
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.workers = workers
+        self.batches = 0
+        self.batched_requests = 0
+        self._loop = None
+        self._queue = None
+        self._executor = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._loop is not None:
+            return
+        with self._start_lock:
+            if self._loop is not None:
+                return
+            ready = threading.Event()
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ai-batch")
+            thread = threading.Thread(target=self._run_loop, args=(ready,), name="ai-batch-queue", daemon=True)
+            thread.start()
+            ready.wait()
+
+    def _run_loop(self, ready):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._queue = asyncio.Queue()
+        self._loop = loop
+        ready.set()
+        loop.run_until_complete(self._collect())
+
+    def submit(self, request):
+        """Queue a request; returns a concurrent.futures.Future for its text"""
+        self._ensure_started()
+        future = Future()
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (request, future))
+        return future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        free_workers = asyncio.Semaphore(self.workers)
+        while True:
+            batch = [await queue.get()]
+            # While every worker is busy, new requests pile up into the next batch
+            await free_workers.acquire()
+            # Sleep rather than wait_for(queue.get()): a get cancelled by the
+            # timeout can swallow a request on Python < 3.12
+            if self.max_wait > 0 and queue.qsize() < self.max_batch - 1:
+                await asyncio.sleep(self.max_wait)
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+            done = loop.run_in_executor(self._executor, self._process, batch)
+            done.add_done_callback(lambda _: free_workers.release())
+
+    def _process(self, batch):
+        unique = {}
+        for request, future in batch:
+            unique.setdefault(request.key, (request, []))[1].append(future)
+        self.batches += 1
+        self.batched_requests += len(batch)
+        error = None
+        try:
+            self._dispatch(unique)
+        except Exception as e:
+            error = e
+        finally:
+            # Whatever went wrong, no caller is left waiting on an unresolved future
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error or RuntimeError(f"AI batch on {self.backend.name} ended without a result"))
+
+    def _dispatch(self, unique):
+        """Generate a batch and resolve its futures; a request's ``on_result`` failure fails only that request"""
+        outputs = list(self.backend.generate_batch([request for request, _ in unique.values()]))
+        for index, (request, futures) in enumerate(unique.values()):
+            output = outputs[index] if index < len(outputs) else None
+            if output is None:
+                error = RuntimeError(
+                    f"AI backend {self.backend.name} returned no output for request {index + 1} "
+                    f"of {len(unique)} in a batch ({len(outputs)} outputs)"
+                )
+                for future in futures:
+                    future.set_exception(error)
+                continue
+            output = normalize_output(output)
+            try:
+                if self.on_result is not None:
+                    self.on_result(request, output)
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            for future in futures:
+                future.set_result(output)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "requests": self.batched_requests,
+            "mean_batch_size": self.batched_requests / self.batches if self.batches else 0.0
+        }
+
+
+class SmartAIEngine:
+    """Cached, micro-batched generation for every AI-written passage in the app"""
+
+    def __init__(self, backend=None, max_batch=config.AI_BATCH_SIZE, max_wait=config.AI_BATCH_WAIT_MS / 1000,
+                 cache_size=config.AI_CACHE_SIZE, cache_ttl=config.AI_CACHE_TTL_SECONDS,
+                 semantic_cache_size=config.AI_SEMANTIC_CACHE_SIZE, semantic_threshold=config.AI_SEMANTIC_THRESHOLD,
+                 semantic_tasks=config.AI_SEMANTIC_TASKS):
+        self.backend = backend or create_backend()
+        self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self.semantic_cache = None
+        self.semantic_tasks = frozenset(semantic_tasks)
+        if semantic_cache_size and self.semantic_tasks and getattr(self.backend, "reuse_similar", False):
+            self.semantic_cache = SemanticCache(maxsize=semantic_cache_size, threshold=semantic_threshold)
+        # Responses are cached before waiters wake, so an immediate repeat is a hit
+        self.queue = BatchQueue(self.backend, max_batch, max_wait, on_result=self._store)
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.first_token_seconds = deque(maxlen=FIRST_TOKEN_SAMPLES)
+
+    def _cached(self, request):
+        """A cached response for this prompt or, where allowed, a near-duplicate of it"""
+        cached = self.cache.get(request.key)
+        if cached is None and self._reuses_similar(request):
+            cached = self.semantic_cache.get((self.backend.name, request.task), self._variable_text(request))
+        return cached
+
+    def _reuses_similar(self, request):
+        return self.semantic_cache is not None and request.task in self.semantic_tasks
+
+    @staticmethod
+    def _variable_text(request):
+        """The request's own field values, without the task's fixed instructions
+
+        Embedding the whole prompt would let the shared boilerplate dominate
+        the similarity of two otherwise unrelated requests.
+        """
+        return "\n".join(str(request.fields[name]) for name in sorted(request.fields))
+
+    def _store(self, request, text):
+        self.cache.put(request.key, text)
+        if self._reuses_similar(request):
+            self.semantic_cache.put((self.backend.name, request.task), self._variable_text(request), text)
+
+    def submit(self, task, fields):
+        """Future for one generation; cache hits and duplicate in-flight prompts share work"""
+        request = GenerationRequest(task, fields, self.backend)
+        cached = self._cached(request)
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return future
+        with self._lock:
+            future = self._inflight.get(request.key)
+            if future is not None:
+                return future
+            future = self.queue.submit(request)
+            self._inflight[request.key] = future
+        # Outside the lock: the callback runs inline if the future is already done
+        future.add_done_callback(lambda done, request=request: self._finish(request, done))
+        return future
+
+    def _finish(self, request, future):
+        with self._lock:
+            self._inflight.pop(request.key, None)
+
+    def generate(self, task, **fields):
+        return self.submit(task, fields).result(timeout=config.AI_TIMEOUT_SECONDS)
+
+    def generate_many(self, task, fields_list):
+        """Generate several passages at once so they can share a batch"""
+        futures = [self.submit(task, fields) for fields in fields_list]
+        return [future.result(timeout=config.AI_TIMEOUT_SECONDS) for future in futures]
+
+    def stream(self, task, **fields):
+        """Yield the generated text in pieces as the backend produces them
+        
+        Streams bypass the batch queue, since batching would hold back the
+        first token. A cached response is yielded whole; a finished stream is
+        cached like any other response. Time to the first piece is recorded
+        in ``first_token_seconds``.
+        """
+        return self.time_first_piece(task, self.stream_pieces(task, fields))
+
+    def stream_pieces(self, task, fields):
+        """``stream`` without the time-to-first-token record, for callers that time a larger stream"""
+        request = GenerationRequest(task, fields, self.backend)
+        cached = self._cached(request)
+        if cached is not None:
+            yield cached
+            return
+        pieces = []
+        for piece in strip_stream(self.backend.stream(request)):
+            pieces.append(piece)
+            yield piece
+        self._store(request, "".join(pieces))
+
+    def time_first_piece(self, label, pieces):
+        """Pass a stream through, recording the wait for its first piece under ``label``
+
+        The clock starts when the consumer first asks for a piece, which is
+        when a page starts rendering the stream.
+        """
+        start = time.perf_counter()
+        waiting = True
+        for piece in pieces:
+            if waiting:
+                self._record_first_token(label, start)
+                waiting = False
+            yield piece
+
+    def _record_first_token(self, task, start):
+        elapsed = time.perf_counter() - start
+        self.first_token_seconds.append(elapsed)
+        metrics.observe("ai_first_token_seconds", elapsed, task=task)
+
+    def first_token_stats(self):
+        """Count and p50/p95 time-to-first-token in milliseconds over recent streams"""
+        samples = sorted(self.first_token_seconds)
+        if not samples:
+            return {"count": 0, "p50_ms": None, "p95_ms": None}
+        return {
+            "count": len(samples),
+            "p50_ms": samples[len(samples) // 2] * 1000,
+            "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000
+        }
+
+    def stats(self):
+        stats = self.queue.stats()
+        stats["backend"] = self.backend.name
+        stats["cache"] = self.cache.stats()
+        if self.semantic_cache is not None:
+            stats["semantic_cache"] = self.semantic_cache.stats()
+        stats["first_token"] = self.first_token_stats()
+        return stats
+
+
+# Global instance
+ai_engine = SmartAIEngine()
+metrics.register_cache("ai_responses", ai_engine.cache)
+if ai_engine.semantic_cache is not None:
+    metrics.register_cache("ai_semantic", ai_engine.semantic_cache)
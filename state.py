@@ -0,0 +1,154 @@
+"""Process-wide engines and per-user data that survive Streamlit reruns
+
+Streamlit re-executes ``main_app.py`` top to bottom on every interaction, so
+anything constructed there is rebuilt each time. Stateless engines (keyword
+automata, template plans, question banks) are instead built once per process
+through ``get_engine``, and user data lives in ``user_store``, keyed by the
+signed-in identity where Streamlit authentication is configured and by the
+browser session otherwise. Nothing a visitor can edit, such as the URL,
+chooses whose data a session sees.
+"""
+
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import threading
+import time
+import uuid
+
+import streamlit as st
+
+import config
+from cache import TTLCache
+
+# Engine name -> (module, global instance within that module, or a function returning it)
+ENGINES = {
+    "resume_builder": ("resume_builder", "resume_builder"),
+    "cover_letter_generator": ("cover_letter", "cover_letter_generator"),
+    "interview_preparer": ("interview_prep", "interview_preparer"),
+    "review_scheduler": ("review_scheduler", "review_scheduler"),
+    "db": ("database", "get_db")
+}
+
+
+@st.cache_resource(show_spinner=False)
+def get_engine(name):
+    """Build (import) an engine once per process and share it across sessions"""
+    module_name, attribute = ENGINES[name]
+    engine = getattr(importlib.import_module(module_name), attribute)
+    return engine() if inspect.isfunction(engine) else engine
+
+
+class SessionStore:
+    """Per-user data kept in process memory, optionally written through to disk
+
+    Values must be JSON-serializable. ``get`` returns the live object, so
+    callers mutate it in place and call ``save`` to persist the change.
+    Users idle for ``idle_seconds``, and the least recently active beyond
+    ``max_users``, are dropped from memory (and reloaded from disk, if
+    written through, when they return).
+    """
+
+    def __init__(self, directory=None, max_users=config.SESSION_STORE_MAX_USERS,
+                 idle_seconds=config.SESSION_IDLE_SECONDS, clock=time.monotonic):
+        self.directory = directory
+        self._users = TTLCache(maxsize=max_users, ttl=idle_seconds, clock=clock)
+        self._lock = threading.RLock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _user_data(self, user_id):
+        with self._lock:
+            data = self._users.get(user_id)
+            if data is None:
+                data = self._load(user_id)
+            # Storing again on every access makes the TTL an idle timeout
+            self._users.put(user_id, data)
+        return data
+
+    def __len__(self):
+        return len(self._users)
+
+    def get(self, user_id, key, default=None):
+        """Return the stored value, storing ``default`` first if the key is missing"""
+        data = self._user_data(user_id)
+        if key not in data and default is not None:
+            with self._lock:
+                data.setdefault(key, default)
+        return data.get(key)
+
+    def set(self, user_id, key, value):
+        with self._lock:
+            self._user_data(user_id)[key] = value
+        self.save(user_id)
+
+    def save(self, user_id):
+        """Write a user's data through to disk, if a directory is configured"""
+        if not self.directory:
+            return
+        with self._lock:
+            payload = json.dumps(self._user_data(user_id))
+        path = self._path(user_id)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(temp_path, path)
+
+    def _path(self, user_id):
+        return os.path.join(self.directory, f"{user_id}.json")
+
+    def _load(self, user_id):
+        if not self.directory:
+            return {}
+        try:
+            with open(self._path(user_id), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+
+@st.cache_resource(show_spinner=False)
+def get_user_store():
+    """The process-wide user store"""
+    return SessionStore(config.SESSION_STORE_DIR)
+
+
+def _signed_in_identity():
+    """The subject (or email) of the signed-in user, if Streamlit authentication is in use"""
+    try:
+        user = st.user
+        if not user.get("is_logged_in"):
+            return None
+        return user.get("sub") or user.get("email")
+    except Exception:
+        # No st.user on this Streamlit version, or authentication is not configured
+        return None
+
+
+def current_user_id():
+    """Id whose data this session may see: the signed-in identity, else this browser session"""
+    user_id = st.session_state.get("user_id")
+    if user_id is None:
+        identity = _signed_in_identity()
+        if identity:
+            user_id = "u" + hashlib.blake2b(identity.encode("utf-8"), digest_size=16).hexdigest()
+        else:
+            user_id = uuid.uuid4().hex
+        st.session_state.user_id = user_id
+    return user_id
+
+
+def user_data(key, default=None):
+    """Live per-user value for the current session"""
+    return get_user_store().get(current_user_id(), key, default)
+
+
+def save_user_data(key=None, value=None):
+    """Persist the current user's data; with a key, replace that value first"""
+    store = get_user_store()
+    if key is None:
+        store.save(current_user_id())
+    else:
+        store.set(current_user_id(), key, value)
@@ -0,0 +1,209 @@
+import os
+import re
+import threading
+from collections.abc import Iterator
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+TEMPLATE_EXTENSION = ".md"
+
+TAG_PATTERN = re.compile(r"(\{\{.*?\}\}|\{%.*?%\})", re.DOTALL)
+
+FILTERS = {
+    "upper": str.upper,
+    "lower": str.lower,
+    "title": str.title,
+    "strip": str.strip
+}
+
+# Render plan opcodes
+LITERAL, FIELD, BRANCH = 0, 1, 2
+
+
+class TemplateError(ValueError):
+    """Raised when a template cannot be parsed or is not found"""
+
+
+def compile_template(source, name="<string>"):
+    """Parse template source into a render plan
+
+    Supported syntax: ``{{ field }}`` and ``{{ field|upper }}`` substitutions,
+    and ``{% if field %} ... {% else %} ... {% endif %}`` blocks, which render
+    their body when the field is non-empty. A newline directly after a block
+    tag is dropped so tags can sit on their own lines.
+    """
+    root = []
+    # Each frame is (ops list being filled, branch op or None)
+    stack = [(root, None)]
+    trim_newline = False
+
+    for piece in TAG_PATTERN.split(source):
+        if not piece:
+            continue
+        ops = stack[-1][0]
+        if piece.startswith("{{"):
+            trim_newline = False
+            expression = piece[2:-2].strip()
+            field, *filters = [part.strip() for part in expression.split("|")]
+            for filter_name in filters:
+                if filter_name not in FILTERS:
+                    raise TemplateError(f"{name}: unknown filter '{filter_name}'")
+            ops.append((FIELD, field, tuple(FILTERS[f] for f in filters)))
+        elif piece.startswith("{%"):
+            trim_newline = True
+            words = piece[2:-2].split()
+            keyword = words[0] if words else ""
+            if keyword == "if" and len(words) == 2:
+                branch = (BRANCH, words[1], [], [])
+                ops.append(branch)
+                stack.append((branch[2], branch))
+            elif keyword == "else" and stack[-1][1] is not None:
+                branch = stack[-1][1]
+                stack[-1] = (branch[3], branch)
+            elif keyword == "endif" and len(stack) > 1:
+                stack.pop()
+            else:
+                raise TemplateError(f"{name}: unexpected tag {piece}")
+        else:
+            if trim_newline and piece.startswith("\n"):
+                piece = piece[1:]
+            trim_newline = False
+            if piece:
+                ops.append((LITERAL, piece))
+
+    if len(stack) > 1:
+        raise TemplateError(f"{name}: unclosed {{% if %}} block")
+    return CompiledTemplate(_freeze(root), name)
+
+
+def _freeze(ops):
+    """Convert nested op lists to tuples once compilation is done"""
+    frozen = []
+    for op in ops:
+        if op[0] == BRANCH:
+            op = (BRANCH, op[1], _freeze(op[2]), _freeze(op[3]))
+        frozen.append(op)
+    return tuple(frozen)
+
+
+def _resolve(context, name, resolved):
+    """A field's text, calling a lazy (callable) value the first time it is needed"""
+    value = resolved.get(name)
+    if value is None:
+        value = context.get(name, "")
+        if callable(value):
+            value = value()
+        if value is None:
+            value = ""
+        elif isinstance(value, Iterator):
+            value = "".join(value)
+        else:
+            value = str(value)
+        resolved[name] = value
+    return value
+
+
+class CompiledTemplate:
+    """A parsed template; rendering walks the plan and joins the pieces once
+
+    A context value may be a zero-argument callable, called only if the
+    template reaches that field (once per render). In ``stream`` it may also
+    return an iterator of text pieces, which are passed on as they arrive.
+    """
+
+    def __init__(self, ops, name="<string>"):
+        self.ops = ops
+        self.name = name
+
+    def render(self, context):
+        out = []
+        self._render_ops(self.ops, context, {}, out.append)
+        return "".join(out)
+
+    def _render_ops(self, ops, context, resolved, write):
+        for op in ops:
+            code = op[0]
+            if code == LITERAL:
+                write(op[1])
+            elif code == FIELD:
+                value = _resolve(context, op[1], resolved)
+                for filter_func in op[2]:
+                    value = filter_func(value)
+                write(value)
+            else:
+                self._render_ops(op[2] if _resolve(context, op[1], resolved) else op[3], context, resolved, write)
+
+    def stream(self, context):
+        """Yield the rendering in document order, resolving each field when it is reached
+
+        Joined, the pieces equal ``render(context)``.
+        """
+        return self._stream_ops(self.ops, context, {})
+
+    def _stream_ops(self, ops, context, resolved):
+        for op in ops:
+            code = op[0]
+            if code == LITERAL:
+                yield op[1]
+            elif code == FIELD:
+                name = op[1]
+                value = resolved.get(name)
+                if value is None and not op[2]:
+                    value = context.get(name, "")
+                    if callable(value):
+                        value = value()
+                    if isinstance(value, Iterator):
+                        pieces = []
+                        for piece in value:
+                            pieces.append(piece)
+                            yield piece
+                        resolved[name] = "".join(pieces)
+                        continue
+                    resolved[name] = value = "" if value is None else str(value)
+                else:
+                    value = _resolve(context, name, resolved)
+                    for filter_func in op[2]:
+                        value = filter_func(value)
+                if value:
+                    yield value
+            else:
+                yield from self._stream_ops(op[2] if _resolve(context, op[1], resolved) else op[3], context, resolved)
+
+
+class TemplateEngine:
+    """Loads layouts from a directory and caches compiled plans by name and mtime"""
+
+    def __init__(self, template_dir=TEMPLATE_DIR):
+        self.template_dir = template_dir
+        self._compiled = {}
+        self._lock = threading.Lock()
+
+    def available(self):
+        """Names of the layouts in the template directory"""
+        return sorted(
+            name[:-len(TEMPLATE_EXTENSION)]
+            for name in os.listdir(self.template_dir)
+            if name.endswith(TEMPLATE_EXTENSION)
+        )
+
+    def get(self, name):
+        """Return (version, compiled template), recompiling only when the file changed"""
+        path = os.path.join(self.template_dir, name + TEMPLATE_EXTENSION)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            raise TemplateError(f"Unknown template '{name}'") from None
+        cached = self._compiled.get(name)
+        if cached is not None and cached[0] == mtime:
+            return cached
+        with open(path, encoding="utf-8") as f:
+            compiled = compile_template(f.read(), name)
+        with self._lock:
+            self._compiled[name] = (mtime, compiled)
+        return mtime, compiled
+
+    def render(self, name, context):
+        return self.get(name)[1].render(context)
+
+
+# Global instance
+template_engine = TemplateEngine()
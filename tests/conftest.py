@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+# Modules live flat at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep anything that opens the default database out of the working tree
+os.environ.setdefault("CAREER_SUITE_DB", os.path.join(tempfile.mkdtemp(prefix="career-suite-tests-"), "test.db"))
@@ -0,0 +1,37 @@
+import json
+
+import batch_score
+
+RESUME = "Python developer with Docker and AWS experience. Email: dev@example.com"
+
+
+def run(tmp_path, lines, capsys, workers=1):
+    source = tmp_path / "resumes.jsonl"
+    source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    output = tmp_path / "scores.jsonl"
+    batch_score.main([str(source), "-o", str(output), "--workers", str(workers)])
+    results = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    return results, capsys.readouterr().err
+
+
+def test_scores_a_good_file_in_input_order(tmp_path, capsys):
+    lines = [json.dumps({"id": f"r{n}", "resume_text": RESUME}) for n in range(3)]
+    results, err = run(tmp_path, lines, capsys)
+    assert [result["id"] for result in results] == ["r0", "r1", "r2"]
+    assert all(0 < result["score"] <= 100 and "error" not in result for result in results)
+    assert "Scored 3 resumes, 0 errors" in err
+
+
+def test_bad_lines_are_reported_and_the_batch_continues(tmp_path, capsys):
+    lines = [
+        json.dumps({"id": "first", "resume_text": RESUME}),
+        '{"id": "broken", "resume_text": ',
+        "[1, 2]",
+        json.dumps({"id": "last", "resume_text": RESUME})
+    ]
+    results, err = run(tmp_path, lines, capsys, workers=2)
+    assert [result["id"] for result in results] == ["first", 1, 2, "last"]
+    assert results[1]["error"].startswith("line 2: invalid JSON")
+    assert results[2]["error"] == "line 3: expected a JSON object"
+    assert "score" in results[0] and "score" in results[3]
+    assert "Scored 2 resumes, 2 errors" in err
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from cover_letter import iter_job_postings
+
+
+def postings(data, file_name):
+    errors = []
+    return list(iter_job_postings(data, file_name, errors)), errors
+
+
+def test_json_array_file():
+    data = json.dumps([
+        {"company": "Acme", "position": "Engineer"},
+        {"company": "Globex", "position": "Analyst", "motivation": "growth"}
+    ]).encode("utf-8")
+    jobs, errors = postings(data, "jobs.json")
+    assert jobs == [
+        {"company": "Acme", "position": "Engineer"},
+        {"company": "Globex", "position": "Analyst", "motivation": "growth"}
+    ]
+    assert errors == []
+
+
+def test_json_file_with_one_posting_per_line():
+    data = b'{"company": "Acme", "position": "Engineer"}\n{"company": "Globex"}\n'
+    jobs, errors = postings(data, "jobs.json")
+    assert jobs == [{"company": "Acme", "position": "Engineer"}, {"company": "Globex"}]
+    assert errors == []
+
+
+def test_non_object_records_are_reported_not_raised():
+    data = json.dumps([{"company": "Acme"}, "Globex", 3, ["x"]]).encode("utf-8")
+    jobs, errors = postings(data, "jobs.json")
+    assert jobs == [{"company": "Acme"}]
+    assert errors == [
+        "record 2: expected an object, got str",
+        "record 3: expected an object, got int",
+        "record 4: expected an object, got list"
+    ]
+
+
+def test_bad_json_lines_are_reported_by_line():
+    data = b'{"company": "Acme"}\n"just a string"\n{not json\n\n{"company": "Globex"}\n'
+    jobs, errors = postings(data, "jobs.jsonl")
+    assert jobs == [{"company": "Acme"}, {"company": "Globex"}]
+    assert errors[0] == "line 2: expected an object, got str"
+    assert errors[1].startswith("line 3: invalid JSON")
+    assert len(errors) == 2
+
+
+def test_unreadable_json_file_raises_value_error():
+    with pytest.raises(ValueError):
+        postings(b"[{\"company\": ", "jobs.json")
+
+
+def test_csv_rows():
+    data = "company,position\r\nAcme,Engineer\r\n,\r\n".encode("utf-8-sig")
+    jobs, errors = postings(data, "jobs.csv")
+    assert jobs == [{"company": "Acme", "position": "Engineer"}]
+    assert errors == []
@@ -0,0 +1,203 @@
+import pytest
+
+from database import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "test.db"))
+    yield manager
+    manager.close()
+
+
+def test_resume_search_only_sees_the_users_own_resumes(db):
+    mine = db.save_resume("Mine", "Python developer with Kubernetes and Go", user_id="alice")
+    theirs = db.save_resume("Theirs", "Go developer running Kubernetes clusters", user_id="bob")
+    assert db.search_resumes("kubernetes AND go", user_id="alice") == [mine["id"]]
+    assert db.search_resumes("kubernetes AND go", user_id="bob") == [theirs["id"]]
+    # Resumes saved after the index was built are scoped too
+    later = db.save_resume("Later", "Kubernetes and Go at scale", user_id="bob")
+    assert db.search_resumes("kubernetes AND go", user_id="alice") == [mine["id"]]
+    assert db.search_resumes("kubernetes AND go", user_id="bob") == [theirs["id"], later["id"]]
+    assert db.get_resume(theirs["id"], user_id="alice") is None
+    assert db.get_resume(theirs["id"], user_id="bob")["name"] == "Theirs"
+
+
+APPLICATIONS = [
+    {"company": "Acme Labs", "position": "Engineer", "status": "Applied", "date_applied": "2024-03-04T09:00:00"},
+    {"company": "Globex", "position": "Engineer", "status": "Onsite", "date_applied": "2024-03-10T23:59:59"},
+    {"company": "Initech", "position": "Developer", "status": "Offer", "date_applied": "2024-03-11T00:00:00"},
+    {"company": "Hooli", "position": "SRE", "status": "Rejected", "date_applied": "2024-03-13T12:30:00"},
+    {"company": "Stark", "position": "SRE", "status": "Phone Screen", "date_applied": "2024-03-20T08:00:00"},
+]
+
+
+def grouped(db, sql, user_id):
+    with db.pool.connection() as conn:
+        return dict(conn.execute(sql, (user_id,)).fetchall())
+
+
+def assert_aggregates_match_applications(db, user_id):
+    assert db.count_applications_by_status(user_id) == grouped(
+        db, "SELECT status, COUNT(*) FROM applications WHERE user_id = ? GROUP BY status", user_id)
+    with db.pool.connection() as conn:
+        weekly = dict(conn.execute("SELECT week, count FROM application_weekly_counts WHERE user_id = ?",
+                                   (user_id,)).fetchall())
+    assert weekly == grouped(
+        db, "SELECT date(date_applied, 'weekday 0', '-6 days') AS week, COUNT(*) FROM applications "
+            "WHERE user_id = ? GROUP BY week", user_id)
+    assert db.count_applications(user_id) == grouped(
+        db, "SELECT 'total', COUNT(*) FROM applications WHERE user_id = ?", user_id)["total"]
+
+
+def test_idf_table_covers_stored_resumes_and_weights_common_terms_down(db):
+    db.save_resume("a", "Python developer with Kubernetes experience", user_id="alice")
+    db.save_resume("b", "Python developer with Excel experience", user_id="bob")
+    table = db.idf_table()
+    assert table.num_docs == 2
+    assert table.idf("python") < table.idf("kubernetes")
+
+    db.save_resume("c", "Kubernetes operator", user_id="carol")
+    assert db.idf_table() is table
+    assert table.num_docs == 3
+    assert table.doc_freq["kubernetes"] == 2
+
+
+def test_rank_resumes_only_ranks_the_users_own_resumes(db):
+    db.save_resume("Frontend", "React and TypeScript developer", user_id="alice")
+    db.save_resume("Theirs", "Kubernetes and Go platform engineer", user_id="bob")
+    job = "Go engineer for our Kubernetes platform"
+    assert db.rank_resumes(job, user_id="bob")[0][0] == db.search_resumes("kubernetes", user_id="bob")[0]
+    assert [resume_id for resume_id, score in db.rank_resumes(job, user_id="alice") if score > 0] == []
+
+    # Resumes saved after the ranker was built are ranked too
+    later = db.save_resume("Platform", "Go developer running Kubernetes", user_id="alice")
+    assert db.rank_resumes(job, user_id="alice")[0][0] == later["id"]
+
+
+def test_job_match_uses_the_idf_table():
+    from relevance import IDFTable
+    from resume_builder import ATSResumeBuilder
+
+    builder = ATSResumeBuilder()
+    resume = "Python developer. Built Kubernetes operators."
+    job = "Python developer for our Kubernetes platform team"
+    corpus = IDFTable.from_corpus(["Python developer", "Python developer team", "Kubernetes operators"])
+    flat = builder.analyze_ats_score(resume, job)["job_match"]
+    weighted = builder.analyze_ats_score(resume, job, idf_table=corpus)["job_match"]
+    assert weighted != flat
+
+
+def test_aggregates_follow_every_write(db):
+    db.add_applications(APPLICATIONS, user_id="alice")
+    db.add_applications(APPLICATIONS[:2], user_id="alice")
+    db.add_application("Wayne", "Engineer", "Applied", user_id="alice")
+    db.add_applications(APPLICATIONS[2:], user_id="bob")
+    assert_aggregates_match_applications(db, "alice")
+    assert_aggregates_match_applications(db, "bob")
+    assert db.count_applications_by_status("carol") == {}
+
+
+def test_unknown_status_is_rejected_without_touching_the_aggregates(db):
+    with pytest.raises(ValueError):
+        db.add_applications(APPLICATIONS + [{"company": "X", "position": "Y", "status": "Ghosted"}])
+    assert db.count_applications() == 0
+    assert db.count_applications_by_status() == {}
+
+
+def test_application_summary(db):
+    from datetime import date
+
+    db.add_applications(APPLICATIONS)
+    summary = db.application_summary(weeks=3, today=date(2024, 3, 21))
+    assert summary["total"] == 5
+    assert summary["by_status"] == {"Applied": 1, "Phone Screen": 1, "Technical Interview": 0, "Onsite": 1,
+                                    "Offer": 1, "Rejected": 1}
+    # Weeks start on Monday; the 10th is a Sunday and the 11th a Monday
+    assert summary["weekly"] == {"2024-03-04": 2, "2024-03-11": 2, "2024-03-18": 1}
+    assert [stage["reached"] for stage in summary["funnel"]] == [5, 3, 2, 2, 1]
+
+
+def test_funnel_conversion():
+    from application_store import funnel
+
+    stages = funnel({"Applied": 5, "Phone Screen": 2, "Offer": 1, "Rejected": 2})
+    assert [stage["stage"] for stage in stages] == ["Applied", "Phone Screen", "Technical Interview", "Onsite",
+                                                    "Offer"]
+    assert [stage["reached"] for stage in stages] == [10, 3, 1, 1, 1]
+    assert [stage["conversion"] for stage in stages] == [None, 0.3, 1 / 3, 1.0, 1.0]
+    assert [stage["conversion"] for stage in funnel({})] == [None] * 5
+
+
+def test_existing_database_is_backfilled(tmp_path):
+    path = str(tmp_path / "old.db")
+    db = DatabaseManager(path)
+    db.add_applications(APPLICATIONS, user_id="alice")
+    db.add_applications(APPLICATIONS[1:], user_id="bob")
+    # A database written before the aggregate tables existed
+    with db.transaction() as conn:
+        conn.execute("DROP TABLE application_status_counts")
+        conn.execute("DROP TABLE application_weekly_counts")
+    db.close()
+
+    reopened = DatabaseManager(path)
+    assert_aggregates_match_applications(reopened, "alice")
+    assert_aggregates_match_applications(reopened, "bob")
+    reopened.rebuild_application_aggregates()
+    assert_aggregates_match_applications(reopened, "alice")
+    reopened.close()
+
+
+def test_importing_modules_does_not_open_the_database(tmp_path):
+    import os
+    import subprocess
+    import sys
+
+    path = tmp_path / "lazy.db"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = (
+        "import database, review_scheduler, benchmarks.synthetic\n"
+        "import os, sys\n"
+        "assert not os.path.exists(sys.argv[1]), 'opened on import'\n"
+        "database.get_db().count_applications()\n"
+        "assert review_scheduler.review_scheduler.database is database.get_db() is database.db\n"
+        "assert os.path.exists(sys.argv[1])\n"
+    )
+    env = dict(os.environ, CAREER_SUITE_DB=str(path))
+    subprocess.run([sys.executable, "-c", code, str(path)], cwd=root, env=env, check=True)
+
+
+def test_application_store_holds_only_the_users_rows_and_follows_writes(db):
+    db.add_applications(APPLICATIONS, user_id="alice")
+    db.add_applications(APPLICATIONS, user_id="bob")
+    store = db.application_store("alice")
+    assert [row.company for row in store] == [app["company"] for app in APPLICATIONS]
+    db.add_application("Wayne", "Engineer", "Offer", user_id="alice")
+    db.add_applications(APPLICATIONS[:1], user_id="bob")
+    assert len(store) == len(APPLICATIONS) + 1
+    assert store[-1].company == "Wayne"
+    assert store.status_counts() == db.count_applications_by_status("alice")
+    assert store[0].as_dict() == db.get_applications("alice")[0]
+
+
+def test_application_stores_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr("config.USER_CACHE_SIZE", 2)
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    for user_id in ("alice", "bob", "carol"):
+        db.add_applications(APPLICATIONS, user_id=user_id)
+        db.application_store(user_id)
+    assert len(db._stores) == 2
+    assert "alice" not in db._stores
+    # A dropped store is reloaded in full
+    assert len(db.application_store("alice")) == len(APPLICATIONS)
+    db.close()
+
+
+def test_dates_applied_are_validated_and_normalized(db):
+    with pytest.raises(ValueError):
+        db.add_applications(APPLICATIONS + [{"company": "X", "position": "Y", "status": "Applied",
+                                             "date_applied": "March 4th"}])
+    assert db.count_applications() == 0
+    db.add_applications([{"company": "X", "position": "Y", "status": "Applied", "date_applied": "2024-03-04"}])
+    assert db.get_applications()[0]["date_applied"] == "2024-03-04T00:00:00"
+    assert db.application_store()[0].date_applied == "2024-03-04T00:00:00"
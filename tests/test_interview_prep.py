@@ -0,0 +1,33 @@
+import json
+
+from interview_prep import InterviewPreparer
+from question_bank import QuestionBank
+
+
+def make_preparer(tmp_path, questions):
+    seed = tmp_path / "seed.json"
+    seed.write_text(json.dumps(questions), encoding="utf-8")
+    return InterviewPreparer(bank=QuestionBank(path=str(tmp_path / "bank.db"), seed_path=str(seed)))
+
+
+def test_skill_targeted_technical_slots_stay_technical(tmp_path):
+    questions = [
+        {"category": "technical", "subcategory": "python", "level": "Beginner", "question": "What is a Python decorator?"},
+        {"category": "technical", "subcategory": "sql", "level": "Beginner", "question": "What does a LEFT JOIN return?"}
+    ] + [
+        {"category": "behavioral", "level": "Beginner", "question": f"Tell me about Python project number {n}."}
+        for n in range(20)
+    ] + [
+        {"category": "situational", "level": "Beginner", "question": f"Your Python service fails in case {n}. What do you do?"}
+        for n in range(20)
+    ]
+    preparer = make_preparer(tmp_path, questions)
+    skills = {"programming_languages": ["Python"]}
+
+    for _ in range(50):
+        session = preparer.conduct_mock_interview(["technical"], num_questions=1, skills=skills)
+        assert [q["question"] for q in session] == ["What is a Python decorator?"]
+
+    # Without a category, any question about the skill can be drawn
+    drawn = {preparer.get_skill_question(skills)["group"] for _ in range(200)}
+    assert drawn == {"technical", "behavioral", "situational"}
@@ -0,0 +1,52 @@
+from keyword_matcher import KeywordMatcher, load_keywords, tokenize
+
+
+def test_tokens_keep_skill_punctuation_but_not_sentence_punctuation():
+    assert tokenize("Wrote C++, C# and Node.js; shipped Python.") == [
+        "wrote", "c++", "c#", "and", "node.js", "shipped", "python"
+    ]
+
+
+def test_matching_ignores_case_and_respects_word_boundaries():
+    matcher = KeywordMatcher(["Java", "API", "Python"])
+    found, missing = matcher.match("Built RAPID prototypes in JavaScript and PYTHON.")
+    assert found == ["Python"]
+    assert missing == ["Java", "API"]
+
+
+def test_overlapping_and_multi_word_keywords_all_match():
+    matcher = KeywordMatcher(["machine learning", "machine", "learning", "deep learning", "learning rate"])
+    found, _ = matcher.match("Tuned the machine learning rate schedule")
+    assert found == ["machine learning", "machine", "learning", "learning rate"]
+
+
+def test_multi_word_keywords_need_contiguous_tokens():
+    matcher = KeywordMatcher(["data engineering"])
+    assert matcher.match("data and engineering")[0] == []
+    assert matcher.match("Data-Engineering lead")[0] == ["data engineering"]
+
+
+def test_stop_words_only_match_inside_keywords_that_contain_them():
+    matcher = KeywordMatcher(["separation of concerns", "go"])
+    assert matcher.match("separation of concerns")[0] == ["separation of concerns"]
+    assert matcher.match("separation concerns")[0] == []
+    # A keyword with no word characters can never match
+    assert KeywordMatcher(["...", "of"]).match_indices("out of scope") == {1}
+
+
+def test_missing_limit_keeps_keyword_order():
+    matcher = KeywordMatcher(["SQL", "Docker", "AWS", "Rust"])
+    assert matcher.match("sql and rust", missing_limit=1) == (["SQL", "Rust"], ["Docker"])
+    assert matcher.match("sql", missing_limit=0) == (["SQL"], [])
+
+
+def test_match_accepts_pre_tokenized_text():
+    matcher = KeywordMatcher(["unit testing"])
+    assert matcher.match(tokens=tokenize("Unit testing.")) == (["unit testing"], [])
+
+
+def test_load_keywords_skips_blank_lines_and_comments(tmp_path):
+    path = tmp_path / "keywords.txt"
+    path.write_text("# skills\nPython\n\n  Go  \n", encoding="utf-8")
+    assert load_keywords(path) == ["Python", "Go"]
+    assert KeywordMatcher.from_file(path).match("go")[0] == ["Go"]
@@ -0,0 +1,100 @@
+import json
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+import metrics
+from cache import LRUCache
+from metrics import Histogram, MetricsRegistry
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics, "registry", registry)
+    registry.histogram("call_seconds", function="db.add").observe(0.003)
+    registry.histogram("call_seconds", function="db.add").observe(0.2)
+    registry.counter("call_errors_total", function="db.add").inc(2)
+    cache = LRUCache(maxsize=4)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("b")
+    registry.register_cache("sections", cache)
+    return registry
+
+
+def test_histogram_quantiles_and_pending_samples():
+    histogram = Histogram(buckets=(1.0, 2.0))
+    for value in (0.5, 1.5, 1.5, 3.0):
+        histogram.observe(value)
+    assert histogram.totals() == ([1, 2, 1], 4, 6.5)
+    assert histogram.quantile(0.5) == pytest.approx(1.5)
+    # Values above the last bound report that bound
+    assert histogram.quantile(1.0) == 2.0
+    assert Histogram().quantile(0.5) == 0.0
+
+
+def test_prometheus_exposition(registry):
+    lines = registry.to_prometheus().splitlines()
+    assert "# TYPE career_suite_call_seconds histogram" in lines
+    assert "# HELP career_suite_call_seconds Latency of instrumented calls" in lines
+    # Buckets are cumulative and end with +Inf, followed by the sum and count
+    assert 'career_suite_call_seconds_bucket{function="db.add",le="0.0025"} 0' in lines
+    assert 'career_suite_call_seconds_bucket{function="db.add",le="0.005"} 1' in lines
+    assert 'career_suite_call_seconds_bucket{function="db.add",le="+Inf"} 2' in lines
+    assert 'career_suite_call_seconds_sum{function="db.add"} 0.203' in lines
+    assert 'career_suite_call_seconds_count{function="db.add"} 2' in lines
+    assert "# TYPE career_suite_call_errors_total counter" in lines
+    assert 'career_suite_call_errors_total{function="db.add"} 2' in lines
+    assert 'career_suite_cache_hits_total{cache="sections"} 1' in lines
+    assert 'career_suite_cache_misses_total{cache="sections"} 1' in lines
+    assert "# TYPE career_suite_cache_hit_rate gauge" in lines
+    # Each metric is described once
+    assert len([line for line in lines if line.startswith("# TYPE")]) == len(
+        {line for line in lines if line.startswith("# TYPE")}
+    )
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter("events_total", kind='say "hi"\\').inc()
+    assert 'career_suite_events_total{kind="say \\"hi\\"\\\\"} 1' in registry.to_prometheus().splitlines()
+
+
+def test_json_snapshot(registry):
+    snapshot = registry.to_json()
+    calls = snapshot["histograms"]["call_seconds"]["db.add"]
+    assert calls["count"] == 2
+    assert calls["sum"] == pytest.approx(0.203)
+    assert calls["buckets"]["+Inf"] == 0
+    assert sum(calls["buckets"].values()) == 2
+    assert snapshot["counters"]["call_errors_total"]["db.add"] == 2
+    assert snapshot["caches"]["sections"]["hits"] == 1
+
+
+def test_http_endpoints(registry):
+    server = metrics.serve(0)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urlopen(base + "/metrics.json") as response:
+            assert response.headers["Content-Type"] == "application/json"
+            body = json.load(response)
+        assert body["counters"]["call_errors_total"]["db.add"] == 2
+        with urlopen(base + "/metrics") as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert 'career_suite_call_seconds_count{function="db.add"} 2' in response.read().decode()
+        with pytest.raises(HTTPError) as error:
+            urlopen(base + "/other")
+        assert error.value.code == 404
+        error.value.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_write_snapshot_picks_the_format_from_the_extension(registry, tmp_path):
+    metrics.write_snapshot(str(tmp_path / "metrics.json"))
+    metrics.write_snapshot(str(tmp_path / "metrics.prom"))
+    assert json.loads((tmp_path / "metrics.json").read_text())["counters"]["call_errors_total"] == {"db.add": 2}
+    assert (tmp_path / "metrics.prom").read_text().startswith("# HELP career_suite_call_seconds")
@@ -0,0 +1,86 @@
+import json
+import os
+import sqlite3
+
+from database import DatabaseManager
+from question_bank import QuestionBank
+
+
+def write_seed(path, texts, mtime=None):
+    questions = [{"category": "technical", "subcategory": "python", "level": "Beginner", "question": text}
+                 for text in texts]
+    path.write_text(json.dumps(questions), encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def texts(bank):
+    return {question["question"]: question["id"] for question in bank.iter_questions()}
+
+
+def test_seed_refresh_keeps_imported_questions_and_seed_ids(tmp_path):
+    seed = tmp_path / "seed.json"
+    path = str(tmp_path / "bank.db")
+    write_seed(seed, ["What is a decorator?", "What is a generator?"])
+    bank = QuestionBank(path=path, seed_path=str(seed))
+    bank.add_questions([{"category": "behavioral", "question": "Tell me about a conflict."}])
+    before = texts(bank)
+
+    # An edited seed, newer than the database: one question reworded, one added
+    write_seed(seed, ["What is a decorator? Give an example.", "What is a generator?", "What is a context manager?"],
+               mtime=os.path.getmtime(path) + 10)
+    after = texts(QuestionBank(path=path, seed_path=str(seed)))
+
+    assert after["Tell me about a conflict."] == before["Tell me about a conflict."]
+    assert after["What is a generator?"] == before["What is a generator?"]
+    # A reworded question is a new question
+    assert "What is a decorator?" not in after
+    assert after["What is a decorator? Give an example."] not in before.values()
+    assert "What is a context manager?" in after
+
+    # A shorter seed drops only the seed rows that left it
+    write_seed(seed, ["What is a generator?"], mtime=os.path.getmtime(path) + 20)
+    assert texts(QuestionBank(path=path, seed_path=str(seed))) == {
+        "What is a generator?": before["What is a generator?"],
+        "Tell me about a conflict.": before["Tell me about a conflict."]
+    }
+
+
+def test_question_inserted_mid_seed_leaves_review_history_on_its_question(tmp_path):
+    seed = tmp_path / "seed.json"
+    path = str(tmp_path / "bank.db")
+    write_seed(seed, ["What is a decorator?", "What is a generator?", "What is a closure?"])
+    bank = QuestionBank(path=path, seed_path=str(seed))
+    ids = texts(bank)
+    db = DatabaseManager(str(tmp_path / "suite.db"))
+    db.save_review(ids["What is a generator?"], "2024-01-02", 3, 2.5, 1, user_id="alice")
+    db.save_review(ids["What is a closure?"], "2024-01-05", 6, 2.6, 2, user_id="alice")
+
+    write_seed(seed, ["What is a decorator?", "What is a metaclass?", "What is a generator?", "What is a closure?"],
+               mtime=os.path.getmtime(path) + 10)
+    bank = QuestionBank(path=path, seed_path=str(seed))
+
+    reviewed = {bank.get(row[0])["question"]: row[1] for row in db.get_reviews("alice")}
+    db.close()
+    assert reviewed == {"What is a generator?": "2024-01-02", "What is a closure?": "2024-01-05"}
+    assert texts(bank)["What is a metaclass?"] not in ids.values()
+
+
+def test_bank_without_source_column_is_migrated(tmp_path):
+    seed = tmp_path / "seed.json"
+    path = str(tmp_path / "bank.db")
+    write_seed(seed, ["What is a decorator?"])
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE questions (id INTEGER PRIMARY KEY, category TEXT NOT NULL, subcategory TEXT, "
+                 "level TEXT, question TEXT NOT NULL, answer TEXT NOT NULL DEFAULT '', "
+                 "tips TEXT NOT NULL DEFAULT '[]')")
+    conn.executemany("INSERT INTO questions (category, question) VALUES (?, ?)",
+                     [("technical", "What is a decorator?"), ("behavioral", "Imported question")])
+    conn.commit()
+    conn.close()
+    os.utime(seed, (os.path.getmtime(path) - 10,) * 2)
+    QuestionBank(path=path, seed_path=str(seed))
+
+    write_seed(seed, ["What is a closure?", "What is a decorator?"], mtime=os.path.getmtime(path) + 10)
+    bank = QuestionBank(path=path, seed_path=str(seed))
+    assert texts(bank) == {"What is a decorator?": 1, "Imported question": 2, "What is a closure?": 3}
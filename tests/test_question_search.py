@@ -0,0 +1,80 @@
+import pytest
+
+from question_search import QuestionSearchIndex, question_text
+
+DOCUMENTS = [
+    "Explain how a Python decorator works",
+    "Describe a time you resolved a conflict with a teammate",
+    "What is a Python generator and when would you use a generator",
+    "How do you design a REST API for a large Python service with caching, queues and retries",
+    "Tell me about a project you led",
+]
+
+
+@pytest.fixture
+def index():
+    index = QuestionSearchIndex()
+    for position, text in enumerate(DOCUMENTS):
+        index.add_document(position, text)
+    return index
+
+
+def positions(results):
+    return [position for position, _ in results]
+
+
+def test_results_are_ranked_by_score(index):
+    results = index.search("python generator", prefix=False)
+    # The only question with both terms ranks first
+    assert positions(results)[0] == 2
+    assert set(positions(results)) == {0, 2, 3}
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_shorter_questions_rank_higher_for_the_same_match(index):
+    # Both mention Python once; the decorator question is much shorter
+    assert positions(index.search("python", prefix=False)) == [0, 2, 3]
+
+
+def test_rare_terms_outweigh_common_ones(index):
+    results = dict(index.search("python conflict", prefix=False))
+    assert results[1] > results[0]
+
+
+def test_k_limits_the_results(index):
+    assert positions(index.search("python", k=2, prefix=False)) == [0, 2]
+
+
+@pytest.mark.parametrize("query", ["", "   ", "the and of", "kubernetes"])
+def test_empty_or_unmatched_queries_return_nothing(index, query):
+    assert index.search(query) == []
+
+
+def test_empty_index_returns_nothing():
+    assert QuestionSearchIndex().search("python") == []
+
+
+def test_last_word_is_expanded_as_a_prefix(index):
+    assert index.query_terms("python gen") == ["python", "generator"]
+    assert positions(index.search("gen"))[0] == 2
+    # A trailing space means the word is complete
+    assert index.search("gen ") == []
+    # Single letters are too short to expand
+    assert index.query_terms("python g") == ["python"]
+
+
+def test_positions_must_be_added_in_order(index):
+    with pytest.raises(ValueError):
+        index.add_document(len(DOCUMENTS) + 1, "skipped a position")
+    index.add_document(len(DOCUMENTS), "Python again")
+    assert len(index) == len(DOCUMENTS) + 1
+
+
+def test_question_text_includes_answer_tips_and_categories():
+    text = question_text({
+        "question": "Why Rust?", "answer": "Memory safety", "tips": ["Mention ownership"],
+        "category": "technical", "group": "languages"
+    })
+    for part in ("Why Rust?", "Memory safety", "Mention ownership", "technical", "languages"):
+        assert part in text
@@ -0,0 +1,44 @@
+import pytest
+
+from relevance import IDFTable, RelevanceEngine, cosine_similarity, tfidf_vector
+
+RESUMES = [
+    (11, "Python backend engineer building Django APIs on PostgreSQL"),
+    (12, "Frontend developer working in React and TypeScript"),
+    (13, "Data engineer running Spark and Python pipelines on Kubernetes"),
+    (14, "Python engineer operating Kubernetes clusters and PostgreSQL databases")
+]
+JOB = "Python engineer for Kubernetes and PostgreSQL infrastructure"
+
+
+def test_top_k_orders_resumes_by_similarity():
+    engine = RelevanceEngine().fit(RESUMES)
+    ranked = engine.top_k(JOB, k=3)
+    assert [resume_id for resume_id, _ in ranked] == [14, 11, 13]
+    scores = [score for _, score in ranked]
+    assert scores == sorted(scores, reverse=True)
+    assert 0 < scores[-1] <= scores[0] <= 1
+
+
+def test_scores_are_the_cosine_similarity_of_tfidf_vectors():
+    engine = RelevanceEngine().fit(RESUMES)
+    idf = engine.idf_table
+    expected = [cosine_similarity(tfidf_vector(text, idf), tfidf_vector(JOB, idf)) for _, text in RESUMES]
+    assert engine.scores(JOB) == pytest.approx(expected, abs=1e-6)
+
+
+def test_incremental_add_matches_fit():
+    idf = IDFTable.from_corpus(text for _, text in RESUMES)
+    fitted = RelevanceEngine(idf).fit(RESUMES)
+    incremental = RelevanceEngine(idf)
+    for resume_id, text in RESUMES:
+        incremental.add(resume_id, text)
+    assert incremental.resume_ids == fitted.resume_ids
+    assert incremental.top_k(JOB, k=4) == fitted.top_k(JOB, k=4)
+    assert incremental.rank_many([JOB, "React developer"], k=2) == fitted.rank_many([JOB, "React developer"], k=2)
+
+
+def test_k_larger_than_the_index_and_empty_index():
+    engine = RelevanceEngine().fit(RESUMES[:2])
+    assert len(engine.top_k(JOB, k=10)) == 2
+    assert RelevanceEngine().top_k(JOB) == []
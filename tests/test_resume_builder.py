@@ -0,0 +1,70 @@
+import pytest
+
+from resume_builder import ATSResumeBuilder
+from smart_ai_engine import ai_engine
+from template import compile_template, template_engine
+
+PERSONAL = {"name": "Ada Lovelace", "title": "Data Engineer", "email": "ada@example.com"}
+EXPERIENCE = [{"company": "Acme", "position": "Engineer", "duration": "2020-2024",
+               "responsibilities": ["Built pipelines", "Cut costs by 30%"]}]
+EDUCATION = [{"degree": "BSc Mathematics", "institution": "UCL", "year": "2019"}]
+SKILLS = {"programming_languages": ["Python", "SQL"], "tools": ["Airflow"]}
+PROJECTS = [{"name": "Lakehouse", "technologies": ["Spark"], "description": "Batch to streaming"}]
+
+
+def resume_args():
+    return PERSONAL, EXPERIENCE, EDUCATION, SKILLS, PROJECTS
+
+
+@pytest.mark.parametrize("layout", template_engine.available())
+def test_stream_joins_to_the_rendered_document(layout):
+    streamed = "".join(ATSResumeBuilder().create_ats_friendly_resume_stream(*resume_args(), layout=layout))
+    assert streamed == ATSResumeBuilder().create_ats_friendly_resume(*resume_args(), layout=layout)
+
+
+def test_first_piece_does_not_wait_for_later_sections():
+    builder = ATSResumeBuilder()
+    rendered = []
+    format_experience = builder._format_experience_section
+    builder._format_experience_section = lambda experience: rendered.append("experience") or format_experience(experience)
+    stream = builder.create_ats_friendly_resume_stream(*resume_args(), layout="classic")
+    head = [next(stream) for _ in range(3)]
+    assert "ADA LOVELACE" in "".join(head)
+    assert rendered == []
+    "".join(stream)
+    assert rendered == ["experience"]
+
+
+def test_time_to_first_piece_is_recorded_for_the_whole_resume():
+    before = len(ai_engine.first_token_seconds)
+    "".join(ATSResumeBuilder().create_ats_friendly_resume_stream(*resume_args()))
+    # One sample for the document; the summary stream inside it is not counted separately
+    assert len(ai_engine.first_token_seconds) == before + 1
+
+
+def test_template_stream_resolves_lazy_fields_once():
+    template = compile_template("{{ a|upper }} {% if b %}[{{ b }}]{% endif %}{{ c }}")
+    calls = []
+
+    def lazy(name, value):
+        def resolve():
+            calls.append(name)
+            return value
+        return resolve
+
+    context = {"a": "x", "b": lazy("b", iter(["p", "q"])), "c": lazy("c", "z")}
+    assert "".join(template.stream(context)) == "X [pq]z"
+    assert calls == ["b", "c"]
+    assert template.render({"a": "x", "b": lazy("b", ""), "c": lazy("c", "z")}) == "X z"
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_layout_without_a_summary_never_generates_one(stream):
+    builder = ATSResumeBuilder()
+    builder._format_summary_section = lambda summary: pytest.fail("summary generated for one_page")
+    builder._stream_summary = lambda key, summary: pytest.fail("summary streamed for one_page")
+    if stream:
+        resume = "".join(builder.create_ats_friendly_resume_stream(*resume_args(), layout="one_page"))
+    else:
+        resume = builder.create_ats_friendly_resume(*resume_args(), layout="one_page")
+    assert "ADA LOVELACE" in resume
@@ -0,0 +1,30 @@
+import sys
+
+from review_scheduler import DAY_SECONDS, ReviewScheduler, UserReviews
+
+NOW = 1_700_000_000
+
+
+def test_due_questions_come_most_overdue_first_and_regrades_supersede():
+    scheduler = ReviewScheduler()
+    for question_id in (30, 10, 20):
+        scheduler.record(question_id, 1, now=NOW + question_id)
+    assert scheduler.due_questions(now=NOW + 2 * DAY_SECONDS) == [10, 20, 30]
+    # Passing twice pushes 10 six days out; its old heap entry must not surface
+    scheduler.record(10, 5, now=NOW + 100)
+    scheduler.record(10, 5, now=NOW + 200)
+    assert scheduler.due_questions(now=NOW + 2 * DAY_SECONDS) == [20, 30]
+    assert scheduler.next_due_time() == NOW + 20 + DAY_SECONDS
+
+
+def test_records_stay_packed():
+    reviews = UserReviews()
+    for question_id in range(20000, 0, -1):
+        reviews.set(question_id, NOW + question_id, 1.0, 2.5, 1)
+    for question_id in range(1, 20001, 2):
+        reviews.set(question_id, NOW + 2 * DAY_SECONDS, 6.0, 2.6, 2)
+    assert list(reviews.question_ids) == list(range(1, 20001))
+    assert reviews.state(3) == (6.0, reviews.ease[2], 2)
+    columns = ("question_ids", "due", "intervals", "ease", "repetitions", "heap")
+    size = sum(sys.getsizeof(getattr(reviews, name)) for name in columns)
+    assert size / len(reviews) < 40
@@ -0,0 +1,47 @@
+import random
+from collections import Counter
+
+import pytest
+
+from sampling import AliasTable
+
+DRAWS = 40000
+
+
+def frequencies(table, draws=DRAWS):
+    counts = Counter(table.sample() for _ in range(draws))
+    return {index: count / draws for index, count in counts.items()}
+
+
+def test_draws_follow_the_weights():
+    weights = [1, 2, 3, 4]
+    shares = frequencies(AliasTable(weights, rng=random.Random(7)))
+    for index, weight in enumerate(weights):
+        assert shares[index] == pytest.approx(weight / sum(weights), abs=0.01)
+
+
+def test_zero_weights_are_never_drawn():
+    shares = frequencies(AliasTable([0, 5, 0, 1, 0], rng=random.Random(3)))
+    assert set(shares) == {1, 3}
+    assert shares[1] == pytest.approx(5 / 6, abs=0.01)
+
+
+def test_same_seed_gives_the_same_draws():
+    weights = [0.5, 0.1, 2.0, 1.4]
+    first = AliasTable(weights, rng=random.Random(42))
+    second = AliasTable(weights, rng=random.Random(42))
+    assert [first.sample() for _ in range(100)] == [second.sample() for _ in range(100)]
+
+
+def test_equal_weights_skip_the_table():
+    table = AliasTable([2, 2, 2], rng=random.Random(1))
+    assert table.probability is None
+    assert set(frequencies(table, 3000)) == {0, 1, 2}
+
+
+@pytest.mark.parametrize("weights", [[], [0, 0, 0]])
+def test_empty_or_zero_weight_pools_cannot_be_sampled(weights):
+    table = AliasTable(weights)
+    assert len(table) == 0
+    with pytest.raises(IndexError):
+        table.sample()
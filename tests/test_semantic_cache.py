@@ -0,0 +1,78 @@
+from semantic_cache import SemanticCache, fact_key
+from smart_ai_engine import PROMPTS, SmartAIEngine
+
+
+class CountingBackend:
+    """Model stand-in that numbers its answers, so a reused response is visible"""
+
+    name = "counting"
+    prompts = PROMPTS
+    reuse_similar = True
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_batch(self, requests):
+        answers = []
+        for request in requests:
+            self.calls += 1
+            answers.append(f"answer {self.calls}")
+        return answers
+
+
+def make_engine(tasks=("summary", "bullet")):
+    return SmartAIEngine(backend=CountingBackend(), semantic_tasks=tasks)
+
+
+SUMMARY = {
+    "title": "Backend Engineer",
+    "years": "5",
+    "domain": "payments",
+    "skills": "Python, Go, PostgreSQL, Kafka, Docker, Kubernetes",
+    "target_company": "Stripe"
+}
+
+
+def test_bullets_differing_only_in_a_number_do_not_share_an_entry():
+    engine = make_engine()
+    first = engine.generate("bullet", text="Optimized the search backend, cutting latency by 40%")
+    second = engine.generate("bullet", text="Optimized the search backend, cutting latency by 45%")
+    assert first != second
+    assert engine.backend.calls == 2
+
+
+def test_summaries_for_different_companies_do_not_share_an_entry():
+    engine = make_engine()
+    first = engine.generate("summary", **SUMMARY)
+    second = engine.generate("summary", **dict(SUMMARY, target_company="Square"))
+    third = engine.generate("summary", **dict(SUMMARY, years="12"))
+    assert len({first, second, third}) == 3
+    assert engine.backend.calls == 3
+
+
+def test_near_duplicate_with_the_same_facts_is_reused():
+    engine = make_engine()
+    first = engine.generate("summary", **SUMMARY)
+    again = engine.generate("summary", **dict(SUMMARY, domain="online payments"))
+    assert again == first
+    assert engine.backend.calls == 1
+
+
+def test_semantic_reuse_is_opt_in():
+    engine = make_engine(tasks=())
+    assert engine.semantic_cache is None
+    engine.generate("bullet", text="Led a team of 5 engineers")
+    engine.generate("bullet", text="Led a team of 5 engineers!")
+    assert engine.backend.calls == 2
+
+
+def test_unrelated_text_misses_despite_shared_facts():
+    cache = SemanticCache(maxsize=8)
+    cache.put("bullet", "Migrated the data warehouse to Snowflake", "cached")
+    assert cache.get("bullet", "Mentored new hires on Snowflake best practices") is None
+
+
+def test_fact_key_ignores_order_but_not_values():
+    assert fact_key("Go and Python at Stripe, 40%") == fact_key("Stripe: Python and Go, 40%")
+    assert fact_key("40% at Stripe") != fact_key("45% at Stripe")
+    assert fact_key("40% at Stripe") != fact_key("40% at Square")
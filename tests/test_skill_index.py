@@ -0,0 +1,90 @@
+import pytest
+
+from skill_index import SkillIndex, decode_postings, encode_postings
+
+RESUMES = {
+    1: "Go developer running Kubernetes in production",
+    2: "PHP and Go backend developer",
+    3: "Python data engineering with Spark; machine learning on Kubernetes",
+    4: "Java engineer, some PHP, learning Kubernetes",
+    5: "Engineering manager for data platforms"
+}
+
+
+@pytest.fixture
+def index():
+    index = SkillIndex(["machine learning"], text_source=RESUMES.get)
+    for doc_id, text in RESUMES.items():
+        index.add_document(doc_id, text)
+    return index
+
+
+def test_and_or_precedence(index):
+    assert index.query("go AND kubernetes") == [1]
+    assert index.query("go kubernetes") == [1]
+    # AND binds tighter than OR
+    assert index.query("java OR go AND php") == [2, 4]
+    assert index.query("(java OR go) AND php") == [2, 4]
+    assert index.query("php OR python AND spark") == [2, 3, 4]
+
+
+def test_operators_are_case_insensitive(index):
+    assert index.query("go and kubernetes") == [1]
+    assert index.query("java or python") == [3, 4]
+    assert index.query("kubernetes and not go") == [3, 4]
+
+
+def test_parentheses(index):
+    assert index.query("kubernetes AND (go OR java)") == [1, 4]
+    assert index.query("(go OR java) AND NOT (php)") == [1]
+    assert index.query("((kubernetes))") == [1, 3, 4]
+
+
+def test_negation(index):
+    assert index.query("kubernetes AND NOT php") == [1, 3]
+    assert index.query("kubernetes -php") == [1, 3]
+    assert index.query("-php") == [1, 3, 5]
+    assert index.query("NOT php") == [1, 3, 5]
+    assert index.query("NOT NOT php") == [2, 4]
+    assert index.query("kubernetes -(go OR java)") == [3]
+
+
+def test_hyphen_inside_a_term_is_not_a_negation():
+    texts = {1: "Owns the CI-CD pipelines", 2: "Writes CD reviews for CI"}
+    index = SkillIndex(text_source=texts.get)
+    for doc_id, text in texts.items():
+        index.add_document(doc_id, text)
+    assert index.query("ci-cd") == [1]
+
+
+def test_phrases(index):
+    # An indexed multi-word skill
+    assert index.query('"machine learning"') == [3]
+    # Any other phrase is matched against the text, in order
+    assert index.query('"data engineering"') == [3]
+    assert index.query('"engineering data"') == []
+    assert index.query('"data engineering" OR manager') == [3, 5]
+    assert index.query('-"data engineering" data') == [5]
+
+
+def test_phrase_without_text_source_is_rejected():
+    index = SkillIndex()
+    index.add_document(1, "data engineering")
+    with pytest.raises(ValueError, match="not an indexed skill"):
+        index.query('"data engineering"')
+
+
+@pytest.mark.parametrize("query", ["go AND", "(go OR java", "go )", "OR go", "go AND OR java", "()", '""', "NOT"])
+def test_malformed_queries_raise_value_error(index, query):
+    with pytest.raises(ValueError):
+        index.query(query)
+
+
+def test_empty_query(index):
+    assert index.query("") == []
+    assert index.query("   ") == []
+
+
+def test_postings_round_trip():
+    postings = [3, 4, 200, 70000, 2 ** 31]
+    assert list(decode_postings(encode_postings(postings))) == postings
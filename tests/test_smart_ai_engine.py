@@ -0,0 +1,87 @@
+from concurrent.futures import Future
+
+import pytest
+
+from smart_ai_engine import PROMPTS, BatchQueue, GenerationRequest, SmartAIEngine
+
+
+class PaddedBackend:
+    """Model stand-in that answers with surrounding whitespace, in batches and streams alike"""
+
+    name = "padded"
+    prompts = PROMPTS
+
+    def generate_batch(self, requests):
+        return [f"\n  Rewrote: {request.fields['text']}  \n" for request in requests]
+
+    def stream(self, request):
+        yield "\n"
+        yield "  Rewrote:"
+        yield f" {request.fields['text']}  "
+        yield "\n"
+
+
+class ShortBackend(PaddedBackend):
+    """Returns one output fewer than it was asked for"""
+
+    def generate_batch(self, requests):
+        return super().generate_batch(requests)[:-1]
+
+
+def test_streamed_and_batched_text_match():
+    streamed = "".join(SmartAIEngine(backend=PaddedBackend()).stream("bullet", text="Cut costs by 10%"))
+    batched = SmartAIEngine(backend=PaddedBackend()).generate("bullet", text="Cut costs by 10%")
+    assert streamed == batched == "Rewrote: Cut costs by 10%"
+
+
+def test_unmatched_requests_fail_instead_of_hanging():
+    backend = ShortBackend()
+    queue = BatchQueue(backend)
+    batch = [(GenerationRequest("bullet", {"text": text}, backend), Future()) for text in ("first", "second")]
+    queue._process(batch)
+    (_, answered), (_, unanswered) = batch
+    assert answered.result(timeout=0) == "Rewrote: first"
+    with pytest.raises(RuntimeError, match="no output"):
+        unanswered.result(timeout=0)
+
+
+def test_failing_on_result_fails_its_request_and_leaves_none_hanging():
+    backend = PaddedBackend()
+
+    def on_result(request, text):
+        if request.fields["text"] == "second":
+            raise RuntimeError("cache is full")
+
+    queue = BatchQueue(backend, on_result=on_result)
+    batch = [(GenerationRequest("bullet", {"text": text}, backend), Future()) for text in ("first", "second", "third")]
+    queue._process(batch)
+    futures = [future for _, future in batch]
+    assert all(future.done() for future in futures)
+    assert futures[0].result(timeout=0) == "Rewrote: first"
+    with pytest.raises(RuntimeError, match="cache is full"):
+        futures[1].result(timeout=0)
+    assert futures[2].result(timeout=0) == "Rewrote: third"
+
+
+def test_unexpected_dispatch_failure_fails_every_unresolved_future():
+    class NotTextBackend(PaddedBackend):
+        def generate_batch(self, requests):
+            return [object() for _ in requests]
+
+    backend = NotTextBackend()
+    batch = [(GenerationRequest("bullet", {"text": text}, backend), Future()) for text in ("first", "second")]
+    BatchQueue(backend)._process(batch)
+    for _, future in batch:
+        with pytest.raises(AttributeError):
+            future.result(timeout=0)
+
+
+def test_engine_callers_get_the_error_when_storing_fails():
+    engine = SmartAIEngine(backend=PaddedBackend())
+
+    def broken_store(request, text):
+        raise MemoryError("no room")
+
+    engine.queue.on_result = broken_store
+    with pytest.raises(MemoryError):
+        engine.generate("bullet", text="Cut costs")
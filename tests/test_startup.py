@@ -0,0 +1,20 @@
+import config
+from page_registry import check_startup_budget, measure_cold_start
+
+
+def test_cold_start_stays_within_budget():
+    ok, report = check_startup_budget()
+    assert ok, report
+
+
+def test_report_names_modules_loaded_eagerly():
+    # streamlit is always loaded, so listing it as deferred must fail the check
+    ok, report = check_startup_budget(deferred=("streamlit",) + config.DEFERRED_MODULES)
+    assert not ok
+    assert "streamlit" in report
+
+
+def test_lazy_pages_are_not_imported_at_startup():
+    modules = measure_cold_start()["modules"]
+    assert "portfolio" not in modules
+    assert "review_scheduler" not in modules
@@ -0,0 +1,57 @@
+from streamlit.testing.v1 import AppTest
+
+from state import SessionStore
+
+
+def test_least_recently_active_user_is_evicted():
+    store = SessionStore(max_users=2)
+    store.set("a", "k", 1)
+    store.set("b", "k", 2)
+    store.get("a", "k")
+    store.set("c", "k", 3)
+    assert len(store) == 2
+    assert store.get("a", "k") == 1
+    # "b" was dropped from memory, so its data starts over
+    assert store.get("b", "k") is None
+
+
+def test_idle_users_expire_and_activity_keeps_them():
+    now = [0.0]
+    store = SessionStore(idle_seconds=10, clock=lambda: now[0])
+    store.set("active", "k", 1)
+    store.set("idle", "k", 2)
+    for _ in range(3):
+        now[0] += 6
+        assert store.get("active", "k") == 1
+    assert store.get("idle", "k") is None
+
+
+def test_evicted_user_is_reloaded_from_disk(tmp_path):
+    store = SessionStore(str(tmp_path), max_users=1)
+    store.set("a", "k", 1)
+    store.save("a")
+    store.set("b", "k", 2)
+    assert store.get("a", "k") == 1
+
+
+def show_user_id():
+    import streamlit as st
+
+    from state import current_user_id
+
+    st.text(current_user_id())
+
+
+def test_sessions_get_their_own_id_whatever_the_url_says():
+    first = AppTest.from_function(show_user_id)
+    second = AppTest.from_function(show_user_id)
+    first.query_params["user"] = "victim"
+    second.query_params["user"] = "victim"
+    first.run()
+    second.run()
+    first_id = first.text[0].value
+    assert first_id != "victim"
+    assert first_id != second.text[0].value
+    # The id is kept across reruns of the same session
+    first.run()
+    assert first.text[0].value == first_id